@@ -1,11 +1,28 @@
-from openai import OpenAI
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+_client = None
+
+
+def get_client():
+    """
+    OpenAI 클라이언트 (최초 사용 시 openai 모듈 로드 및 생성)
+    """
+    global _client
+    if _client is None:
+        from openai import OpenAI
+        _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _client
+
+
+def __getattr__(name):
+    # 기존 `from advisor.with_openai import client` 호환
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 instruction_path = f"{os.getenv('APP_ROOT')}/{os.getenv('INSTRUCTIONS_FILE')}"
 
@@ -47,7 +64,7 @@ def get_instructions(file_path=instruction_path):
 #             return None
 
 #         current_status = get_current_status()
-#         response = client.chat.completions.create(
+#         response = get_client().chat.completions.create(
 #             model="gpt-4-turbo-preview",
 #             messages=[
 #                 {"role": "system", "content": instructions},
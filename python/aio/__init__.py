@@ -0,0 +1 @@
+# 빈 파일로 생성 
\ No newline at end of file
@@ -0,0 +1,143 @@
+import asyncio
+from datetime import datetime
+from typing import List, Optional
+from aio.session import get_exchange
+from collector.chart import MAX_CANDLES_PER_REQUEST
+from collector.store import CandleStore, timeframe_ms
+from collector.orderbook import OrderBook
+
+
+class AsyncUpbitChart:
+  """
+  UpbitChart 의 비동기 버전
+  """
+  def __init__(self, store: Optional[CandleStore] = None):
+    """
+    :param store: 로컬 캔들 저장소 (None인 경우 기본 경로)
+    """
+    self.exchange = get_exchange()
+    self.store = store or CandleStore()
+
+  async def get_ohlcv(self, symbol='BTC/KRW', timeframe='1d', limit=100, use_store=True, fill_gaps=False):
+    """
+    OHLCV 데이터 조회 (로컬 캔들 저장소에 없는 구간만 거래소에서 조회)
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :param timeframe: 시간단위 ('1m', '1h', '1d' 등)
+    :param limit: 조회할 캔들 개수
+    :param use_store: 로컬 캔들 저장소 사용 여부
+    :param fill_gaps: 조회 구간 내 빈 캔들도 다시 조회할지 여부
+    :return: DataFrame
+    """
+    try:
+      if use_store:
+        await self.sync_ohlcv(symbol, timeframe, limit, fill_gaps)
+        ohlcv = self.store.read(symbol, timeframe)[-limit:]
+      else:
+        ohlcv = await self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+      # pandas 는 DataFrame 변환 시에만 로드 (CLI 시작 시간 단축)
+      import pandas as pd
+      df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+      df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+      return df
+    except Exception as e:
+      print(f"OHLCV 데이터 조회 실패: {str(e)}")
+      return None
+
+  async def fetch_ohlcv_range(self, symbol: str, timeframe: str, since: int, until: int) -> List:
+    """
+    기간 내 캔들을 요청 한도(200개) 단위로 나누어 조회
+    :param since: 시작 timestamp (ms)
+    :param until: 종료 timestamp (ms, 미포함)
+    :return: ccxt OHLCV 목록
+    """
+    step = timeframe_ms(timeframe)
+    result = []
+    while since < until:
+      count = min(MAX_CANDLES_PER_REQUEST, max(1, -(-(until - since) // step)))
+      ohlcv = await self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=count)
+      ohlcv = [candle for candle in ohlcv if since <= candle[0] < until]
+      result.extend(ohlcv)
+      # 거래가 없어 캔들이 비어 있는 구간은 건너뜀
+      since = ohlcv[-1][0] + step if ohlcv else since + count * step
+    return result
+
+  async def sync_ohlcv(self, symbol: str, timeframe: str, limit: int, fill_gaps: bool = False) -> int:
+    """
+    로컬 캔들 저장소를 최신 상태로 갱신 (부족한 과거 구간, 최신 구간, 빈 구간은 동시에 조회)
+    :return: 저장소의 캔들 수
+    """
+    step = timeframe_ms(timeframe)
+    now = self.exchange.milliseconds()
+    stored = self.store.read(symbol, timeframe)
+
+    if len(stored) == 0:
+      if limit <= MAX_CANDLES_PER_REQUEST:
+        fetched = await self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+      else:
+        fetched = await self.fetch_ohlcv_range(symbol, timeframe, now - limit * step, now + step)
+      return self.store.write(symbol, timeframe, fetched)
+
+    first, last = int(stored[0, 0]), int(stored[-1, 0])
+    start = now - limit * step
+    # 마지막 캔들은 아직 진행 중일 수 있으므로 다시 조회 (조회 구간보다 오래된 빈 구간은 fill_gaps / backfill 로 채움)
+    ranges = [(max(last, start), now + step)]
+    if len(stored) < limit and first > start:
+      ranges.append((max(first - (limit - len(stored)) * step, start), first))
+    if fill_gaps:
+      ranges.extend(self.store.gaps(symbol, timeframe, start=start))
+    results = await asyncio.gather(*(
+      self.fetch_ohlcv_range(symbol, timeframe, start, end) for start, end in ranges
+    ))
+    fetched = [candle for ohlcv in results for candle in ohlcv]
+    return self.store.write(symbol, timeframe, fetched)
+
+  async def get_orderbook(self, symbol='BTC/KRW'):
+    """
+    호가창 데이터 조회
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :return: Dictionary
+    """
+    try:
+      orderbook = await self.exchange.fetch_order_book(symbol)
+      return {
+        'timestamp': datetime.fromtimestamp(orderbook['timestamp']/1000),
+        'bids': orderbook['bids'],  # [[가격, 수량], ...]
+        'asks': orderbook['asks']   # [[가격, 수량], ...]
+      }
+    except Exception as e:
+      print(f"호가창 데이터 조회 실패: {str(e)}")
+      return None
+
+  async def get_book(self, symbol='BTC/KRW', limit: Optional[int] = None) -> Optional[OrderBook]:
+    """
+    호가창 조회 (깊이/VWAP/슬리피지 계산용 OrderBook)
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :param limit: 호가 개수 (None이면 거래소 기본값)
+    :return: OrderBook
+    """
+    try:
+      return OrderBook.from_ccxt(await self.exchange.fetch_order_book(symbol, limit))
+    except Exception as e:
+      print(f"호가창 데이터 조회 실패: {str(e)}")
+      return None
+
+  async def get_balance(self):
+    """
+    잔고 조회
+    :return: Dictionary
+    """
+    try:
+      balance = await self.exchange.fetch_balance()
+      # 보유 중인 자산만 필터링
+      holdings = {}
+      for currency in balance['total']:
+        if balance['total'][currency] > 0:
+          holdings[currency] = {
+            'free': balance['free'][currency],
+            'used': balance['used'][currency],
+            'total': balance['total'][currency]
+          }
+      return holdings
+    except Exception as e:
+      print(f"잔고 조회 실패: {str(e)}")
+      return None
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Dict, List
+from aio.session import get_exchange
+from aio.snapshot import AsyncTickerCache
+from collector.snapshot import TICKER_TTL
+from collector.history import TickerHistory, HISTORY_SIZE
+from collector.market import analyze_trend, analyze_dominance, signal_candidates, analyze_signals, intraday_stats
+
+
+class AsyncUpbitMarket:
+  """
+  UpbitMarket 의 비동기 버전 (분석 로직은 collector.market 과 공유)
+  """
+  def __init__(self, ticker_ttl: float = TICKER_TTL, history_size: int = HISTORY_SIZE):
+    """
+    :param ticker_ttl: 티커 스냅샷 재사용 시간 (초)
+    :param history_size: 기록할 KRW 마켓 티커 스냅샷 수 (get_intraday_stats 용)
+    """
+    self.exchange = get_exchange()
+    self.history = TickerHistory(history_size)
+    self.tickers = AsyncTickerCache(self.exchange, ttl=ticker_ttl, history=self.history)
+
+  async def get_market_trend(self, timeframe: str = '1d', min_volume_krw: float = 1000000000) -> Dict:
+    """
+    시장 전반적인 트렌드 분석
+    :param timeframe: 기간 (1m, 5m, 15m, 1h, 4h, 1d)
+    :param min_volume_krw: 최소 거래대금 (KRW)
+    :return: 시장 동향 정보
+    """
+    try:
+      krw_tickers = await self.tickers.get_columns('KRW')
+      return analyze_trend(krw_tickers, min_volume_krw)
+    except Exception as e:
+      print(f"시장 동향 분석 중 오류 발생: {str(e)}")
+      return {}
+
+  async def get_market_dominance(self) -> List[Dict]:
+    """
+    시가총액 기준 시장 지배력 계산
+    :return: 코인별 시장 지배력 정보
+    """
+    try:
+      krw_tickers = await self.tickers.get_columns('KRW')
+      return analyze_dominance(krw_tickers)
+    except Exception as e:
+      print(f"시장 지배력 계산 중 오류 발생: {str(e)}")
+      return []
+
+  async def get_trading_signals(self, recommend_count: int = 5, min_volume_krw: float = 1000000000) -> Dict:
+    """
+    현재 시장 상황을 분석하여 매수/매도 추천 코인 선별
+    :param recommend_count: 추천할 코인 개수
+    :param min_volume_krw: 최소 거래대금 (KRW)
+    :return: 매수/매도 추천 정보
+    """
+    try:
+      krw_tickers = await self.tickers.get_quote('KRW')
+      candidates = signal_candidates(krw_tickers, min_volume_krw)
+
+      # RSI 계산을 위한 4시간봉 동시 조회 (요청 제한은 공유 스케줄러에서 처리)
+      ohlcvs = await asyncio.gather(*(
+        self.exchange.fetch_ohlcv(symbol, '4h', limit=14) for symbol in candidates
+      ))
+      ohlcv_by_symbol = dict(zip(candidates, ohlcvs))
+
+      return analyze_signals(krw_tickers, candidates, ohlcv_by_symbol, recommend_count)
+    except Exception as e:
+      print(f"매매 신호 분석 중 오류 발생: {str(e)}")
+      return {}
+
+  async def get_intraday_stats(self, horizon: float = 3600) -> Dict:
+    """
+    KRW 마켓 단기 통계 (추가 OHLCV 요청 없이 티커 스냅샷 기록으로 계산)
+    :param horizon: 구간 (초)
+    """
+    try:
+      await self.tickers.get()
+      return intraday_stats(self.history, horizon)
+    except Exception as e:
+      print(f"단기 통계 계산 중 오류 발생: {str(e)}")
+      return {}
@@ -0,0 +1,103 @@
+import os
+import time
+import asyncio
+import threading
+import ccxt.async_support as ccxt_async
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from dotenv import load_dotenv
+from collector.scheduler import RequestScheduler, classify, get_scheduler, MAX_RETRIES, RETRY_DELAY
+from collector.markets import get_market_cache
+from collector.metrics import get_metrics, REQUEST_SECONDS, REQUEST_ERRORS, REQUEST_RETRIES, RATE_LIMIT_WAIT_SECONDS
+
+# .env 파일 로드
+load_dotenv()
+
+# 토큰 대기 전용 스레드 수 (대기 중인 요청 수만큼 필요하며, 초과분은 순서대로 대기)
+ACQUIRE_WORKERS = 32
+
+_acquire_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+_exchanges: Dict[Tuple[str, str], ccxt_async.upbit] = {}
+
+
+def _executor() -> ThreadPoolExecutor:
+  global _acquire_executor
+  with _lock:
+    if _acquire_executor is None:
+      _acquire_executor = ThreadPoolExecutor(max_workers=ACQUIRE_WORKERS, thread_name_prefix='upbit-acquire')
+    return _acquire_executor
+
+
+class AsyncScheduledUpbit(ccxt_async.upbit):
+  """
+  ccxt.async_support.upbit 에 ScheduledUpbit 과 같은 요청 스케줄링을 적용
+  동기 클라이언트와 같은 RequestScheduler 버킷을 공유하므로 두 방식을 섞어 써도 요청 제한을 넘지 않는다.
+  """
+  def __init__(self, config: Optional[Dict] = None, scheduler: Optional[RequestScheduler] = None):
+    config = dict(config or {})
+    config['enableRateLimit'] = False
+    super().__init__(config)
+    self.scheduler = scheduler or get_scheduler()
+    self.metrics = get_metrics()
+
+  async def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None, config={}):
+    group, priority = classify(api, method, path)
+    endpoint = f"{method} {path}"
+    loop = asyncio.get_running_loop()
+    for attempt in range(MAX_RETRIES + 1):
+      # 버킷 대기는 블로킹이므로 이벤트 루프 밖에서 수행
+      waited = await loop.run_in_executor(_executor(), self.scheduler.acquire, group, priority)
+      self.metrics.observe(RATE_LIMIT_WAIT_SECONDS, waited, group=group)
+      start = time.perf_counter()
+      try:
+        return await super().fetch2(path, api, method, params, headers, body, config)
+      except (ccxt_async.DDoSProtection, ccxt_async.RateLimitExceeded) as e:
+        self.metrics.inc(REQUEST_ERRORS, endpoint=endpoint, error=type(e).__name__)
+        if attempt == MAX_RETRIES:
+          raise
+        self.scheduler.retries[group] += 1
+        self.metrics.inc(REQUEST_RETRIES, group=group)
+        await asyncio.sleep(RETRY_DELAY * (2 ** attempt))
+      except Exception as e:
+        self.metrics.inc(REQUEST_ERRORS, endpoint=endpoint, error=type(e).__name__)
+        raise
+      finally:
+        self.metrics.observe(REQUEST_SECONDS, time.perf_counter() - start, endpoint=endpoint)
+
+
+def get_exchange(api_key: Optional[str] = None, secret: Optional[str] = None) -> ccxt_async.upbit:
+  """
+  프로세스 전역에서 공유하는 비동기 Upbit 클라이언트 조회 (API 키당 1개)
+  aiohttp 세션은 처음 요청한 이벤트 루프에 묶이므로 루프를 종료하기 전에 close_exchanges() 를 호출한다.
+  디스크에 캐시된 마켓 정보가 있으면 생성 시 적용하고, 없으면 첫 요청 시 ccxt 가 한 번만 로드한다.
+  :param api_key: Upbit Access Key (None이면 UPBIT_ACCESS_KEY 환경변수)
+  :param secret: Upbit Secret Key (None이면 UPBIT_SECRET_KEY 환경변수)
+  :return: 공유 AsyncScheduledUpbit 인스턴스
+  """
+  if api_key is None:
+    api_key = os.getenv('UPBIT_ACCESS_KEY')
+  if secret is None:
+    secret = os.getenv('UPBIT_SECRET_KEY')
+  key = (api_key or '', secret or '')
+
+  with _lock:
+    exchange = _exchanges.get(key)
+    if exchange is None:
+      exchange = AsyncScheduledUpbit({
+        'apiKey': api_key,
+        'secret': secret,
+      })
+      get_market_cache().apply(exchange)
+      _exchanges[key] = exchange
+  return exchange
+
+
+async def close_exchanges():
+  """
+  공유 비동기 클라이언트 전체 종료 (aiohttp 세션 정리)
+  """
+  with _lock:
+    exchanges = list(_exchanges.values())
+    _exchanges.clear()
+  await asyncio.gather(*(exchange.close() for exchange in exchanges), return_exceptions=True)
@@ -0,0 +1,93 @@
+import time
+import asyncio
+from typing import Dict, Optional
+from collector.snapshot import TICKER_TTL, TickerColumns
+
+
+class AsyncTickerCache:
+  """
+  TickerCache 의 비동기 버전
+  동시에 여러 코루틴이 요청해도 fetch_tickers 는 한 번만 수행한다 (single-flight).
+  """
+  def __init__(self, exchange, ttl: float = TICKER_TTL, history=None):
+    """
+    :param exchange: ccxt.async_support 거래소 인스턴스
+    :param ttl: 스냅샷 유효 시간 (초)
+    :param history: 새 스냅샷을 기록할 TickerHistory (None이면 기록 안 함)
+    """
+    self.exchange = exchange
+    self.ttl = ttl
+    self.history = history
+    self.tickers: Optional[Dict] = None
+    self.fetched_at = 0.0
+    self._by_quote: Dict[str, Dict] = {}
+    self._columns: Dict[str, TickerColumns] = {}
+    self._pending: Optional[asyncio.Future] = None
+
+  def _fresh(self) -> bool:
+    return self.tickers is not None and time.monotonic() - self.fetched_at < self.ttl
+
+  async def _fetch(self) -> Dict:
+    try:
+      tickers = await self.exchange.fetch_tickers()
+      self.tickers = tickers
+      self.fetched_at = time.monotonic()
+      self._by_quote = {}
+      self._columns = {}
+      if self.history is not None:
+        self.history.record(tickers, self.exchange.milliseconds() / 1000)
+      return tickers
+    finally:
+      self._pending = None
+
+  async def get(self) -> Dict:
+    """
+    전체 티커 스냅샷 조회 (만료 시 재다운로드)
+    :return: {심볼: ticker}
+    """
+    if self._fresh():
+      return self.tickers
+    if self._pending is None:
+      self._pending = asyncio.ensure_future(self._fetch())
+    # 한 코루틴이 취소되어도 진행 중인 다운로드는 유지
+    return await asyncio.shield(self._pending)
+
+  def _filter(self, tickers: Dict, quote: str) -> Dict:
+    # 같은 스냅샷에서 특정 마켓만 추출 (현재 스냅샷이면 결과 재사용)
+    if tickers is self.tickers and quote in self._by_quote:
+      return self._by_quote[quote]
+    suffix = f"/{quote}"
+    filtered = {k: v for k, v in tickers.items() if k.endswith(suffix)}
+    if tickers is self.tickers:
+      self._by_quote[quote] = filtered
+    return filtered
+
+  async def get_quote(self, quote: str = 'KRW') -> Dict:
+    """
+    특정 마켓(예: KRW)의 티커 스냅샷 조회
+    :param quote: 호가 통화
+    :return: {심볼: ticker}
+    """
+    return self._filter(await self.get(), quote)
+
+  async def get_columns(self, quote: str = 'KRW') -> TickerColumns:
+    """
+    특정 마켓의 티커 스냅샷을 열 단위 배열로 조회 (스냅샷당 1회 변환)
+    :param quote: 호가 통화
+    """
+    tickers = await self.get()
+    if tickers is self.tickers and quote in self._columns:
+      return self._columns[quote]
+    columns = TickerColumns.from_tickers(self._filter(tickers, quote))
+    if tickers is self.tickers:
+      self._columns[quote] = columns
+    return columns
+
+  def invalidate(self):
+    """
+    스냅샷 만료 처리 (다음 조회 시 재다운로드)
+    """
+    self.tickers = None
+    self.fetched_at = 0.0
+    self._by_quote = {}
+    self._columns = {}
@@ -0,0 +1,132 @@
+from typing import Optional, Dict
+from aio.session import get_exchange
+from aio.account import AsyncUpbitAccount
+
+
+class AsyncUpbitTrader:
+  """
+  UpbitTrader 의 비동기 버전
+  """
+  def __init__(self):
+    # 공유 비동기 Upbit 클라이언트 (AsyncUpbitAccount 와 동일 인스턴스)
+    self.exchange = get_exchange()
+    self.account = AsyncUpbitAccount()
+
+  async def buy(self, symbol: str, amount: float, price: Optional[float] = None):
+    """
+    매수 주문 (시장가/지정가)
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :param amount: 매수 수량 또는 금액
+    :param price: 매수 희망가격 (None인 경우 시장가 주문)
+    :return: 주문 정보
+    """
+    try:
+      if price is None:
+        return await self.exchange.create_market_buy_order(symbol=symbol, amount=amount)
+      return await self.exchange.create_limit_buy_order(symbol=symbol, amount=amount, price=price)
+    except Exception as e:
+      print(f"매수 주문 실패: {str(e)}")
+      return None
+
+  async def sell(self, symbol: str, amount: float, price: Optional[float] = None):
+    """
+    매도 주문 (시장가/지정가)
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :param amount: 매도할 코인 수량
+    :param price: 매도 희망가격 (None인 경우 시장가 주문)
+    :return: 주문 정보
+    """
+    try:
+      if price is None:
+        return await self.exchange.create_market_sell_order(symbol=symbol, amount=amount)
+      return await self.exchange.create_limit_sell_order(symbol=symbol, amount=amount, price=price)
+    except Exception as e:
+      print(f"매도 주문 실패: {str(e)}")
+      return None
+
+  async def _free_balance(self, currency: str) -> Optional[float]:
+    for balance in await self.account.get_balances():
+      if balance['currency'] == currency:
+        return float(balance['free'])
+    return None
+
+  async def sell_ratio(self, symbol: str, ratio: float, price: Optional[float] = None) -> Dict:
+    """
+    보유 수량 중 일정 비율만큼 매도
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :param ratio: 매도 비율 (0.0 ~ 1.0)
+    :param price: 매도 희망가격 (None인 경우 시장가 주문)
+    :return: 주문 정보
+    """
+    try:
+      if not 0 <= ratio <= 1:
+        raise ValueError("ratio는 0과 1 사이의 값이어야 합니다.")
+
+      currency = symbol.split('/')[0]
+      available_amount = await self._free_balance(currency)
+      if available_amount is None or available_amount == 0:
+        raise ValueError(f"보유한 {currency}가 없습니다.")
+
+      sell_amount = available_amount * ratio
+
+      print(f"매도 비율: {ratio * 100}%")
+      print(f"총 보유량: {available_amount} {currency}")
+      print(f"매도 수량: {sell_amount} {currency}")
+
+      return await self.sell(symbol, sell_amount, price)
+
+    except Exception as e:
+      print(f"비율 매도 실패: {str(e)}")
+      return None
+
+  async def buy_ratio(self, symbol: str, ratio: float, price: Optional[float] = None) -> Dict:
+    """
+    보유 현금(KRW) 중 일정 비율만큼 매수
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :param ratio: 매수 비율 (0.0 ~ 1.0)
+    :param price: 매수 희망가격 (None인 경우 시장가 주문)
+    :return: 주문 정보
+    """
+    try:
+      if not 0 <= ratio <= 1:
+        raise ValueError("ratio는 0과 1 사이의 값이어야 합니다.")
+
+      available_krw = await self._free_balance('KRW')
+      if available_krw is None or available_krw == 0:
+        raise ValueError("보유한 KRW가 없습니다.")
+
+      buy_amount = available_krw * ratio
+
+      print(f"매수 비율: {ratio * 100}%")
+      print(f"사용 가능 KRW: {available_krw:,.0f} KRW")
+      print(f"매수 금액: {buy_amount:,.0f} KRW")
+
+      return await self.buy(symbol, buy_amount, price)
+
+    except Exception as e:
+      print(f"비율 매수 실패: {str(e)}")
+      return None
+
+
+# 사용 예시: 잔고, 호가창, 시장 동향을 한 이벤트 루프에서 동시에 조회
+if __name__ == "__main__":
+  import asyncio
+  from aio.chart import AsyncUpbitChart
+  from aio.market import AsyncUpbitMarket
+  from aio.session import close_exchanges
+
+  async def main():
+    account, chart, market = AsyncUpbitAccount(), AsyncUpbitChart(), AsyncUpbitMarket()
+    try:
+      balances, orderbook, trend = await asyncio.gather(
+        account.get_balances(),
+        chart.get_orderbook('BTC/KRW'),
+        market.get_market_trend()
+      )
+      print(balances)
+      print(orderbook)
+      print(trend.get('market_state'))
+    finally:
+      await close_exchanges()
+
+  asyncio.run(main())
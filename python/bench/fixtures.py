@@ -0,0 +1,214 @@
+import json
+import argparse
+import numpy as np
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from collector.store import COLUMNS, timeframe_ms
+
+FIXTURE_DIR = Path(__file__).parent / 'fixtures'
+DEFAULT_FIXTURE = FIXTURE_DIR / 'upbit.npz'
+
+
+class Fixture:
+  """
+  벤치마크용 거래소 데이터 (티커 스냅샷, 4시간봉, 1분봉 히스토리, 틱 시계열)
+  """
+  def __init__(self,
+               source: str,
+               now: int,
+               tickers: Dict[str, Dict],
+               ohlcv_4h: Dict[str, np.ndarray],
+               history: Dict[str, np.ndarray],
+               ticks: Dict[str, np.ndarray]):
+    """
+    :param source: 'upbit' (실제 기록) / 'synthetic' (생성 데이터)
+    :param now: 기록 시각 (ms)
+    """
+    self.source = source
+    self.now = now
+    self.tickers = tickers
+    self.ohlcv_4h = ohlcv_4h
+    self.history = history
+    self.ticks = ticks
+
+  def describe(self) -> Dict:
+    return {
+      'source': self.source,
+      'markets': len(self.tickers),
+      'krw_markets': sum(1 for symbol in self.tickers if symbol.endswith('/KRW')),
+      'history_candles': {symbol: len(candles) for symbol, candles in self.history.items()},
+      'tick_symbols': len(self.ticks),
+      'ticks_per_symbol': max((len(ticks) for ticks in self.ticks.values()), default=0)
+    }
+
+  def save(self, path: Path = DEFAULT_FIXTURE):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arrays = {'meta': np.array(json.dumps({'source': self.source, 'now': self.now, 'tickers': self.tickers}))}
+    for group in ('ohlcv_4h', 'history', 'ticks'):
+      for symbol, array in getattr(self, group).items():
+        arrays[f"{group}/{symbol}"] = array
+    np.savez_compressed(path, **arrays)
+
+  @classmethod
+  def load(cls, path: Path = DEFAULT_FIXTURE) -> 'Fixture':
+    groups = {'ohlcv_4h': {}, 'history': {}, 'ticks': {}}
+    with np.load(path) as data:
+      meta = json.loads(str(data['meta']))
+      for key in data.files:
+        if '/' in key:
+          group, symbol = key.split('/', 1)
+          groups[group][symbol] = data[key]
+    return cls(meta['source'], meta['now'], meta['tickers'], **groups)
+
+
+def synthesize(krw_markets: int = 220,
+               other_markets: int = 180,
+               history_candles: int = 525600,
+               tick_symbols: int = 50,
+               ticks: int = 20000,
+               seed: int = 0) -> Fixture:
+  """
+  Upbit 전체 마켓 규모의 결정적(seed 고정) 생성 데이터
+  기록된 픽스처가 없을 때 사용하며, 기준값 파일에 source='synthetic' 으로 구분된다.
+  :param history_candles: BTC/KRW 1분봉 개수 (기본 1년)
+  :param tick_symbols: 틱 시계열을 만들 KRW 마켓 수
+  :param ticks: 심볼당 틱 수
+  """
+  rng = np.random.default_rng(seed)
+  step = timeframe_ms('1m')
+  now = 1700000000000 // step * step
+
+  symbols = [f"C{i:03d}/KRW" for i in range(krw_markets)]
+  symbols += [f"C{i:03d}/{'BTC' if i % 2 else 'USDT'}" for i in range(other_markets)]
+  symbols[0] = 'BTC/KRW'
+  symbols[1] = 'ETH/KRW'
+
+  # 가격/거래대금은 로그 정규 분포, 변동률은 대부분 ±5% 이내
+  prices = np.exp(rng.normal(7, 3, len(symbols)))
+  quote_volumes = np.exp(rng.normal(22, 2, len(symbols)))
+  percentages = np.round(rng.normal(0, 3, len(symbols)), 2)
+  tickers = {}
+  for symbol, price, quote_volume, percentage in zip(symbols, prices, quote_volumes, percentages):
+    tickers[symbol] = {
+      'symbol': symbol,
+      'timestamp': now,
+      'last': float(price),
+      'bid': float(price * 0.999),
+      'ask': float(price * 1.001),
+      'percentage': float(percentage),
+      'baseVolume': float(quote_volume / price),
+      'quoteVolume': float(quote_volume)
+    }
+
+  ohlcv_4h = {}
+  step_4h = timeframe_ms('4h')
+  for symbol, price in zip(symbols, prices):
+    closes = price * np.exp(np.cumsum(rng.normal(0, 0.02, 14)))
+    candles = np.empty((14, COLUMNS))
+    candles[:, 0] = now // step_4h * step_4h - np.arange(13, -1, -1) * step_4h
+    candles[:, 1] = np.roll(closes, 1)
+    candles[0, 1] = price
+    candles[:, 2] = np.maximum(candles[:, 1], closes) * 1.01
+    candles[:, 3] = np.minimum(candles[:, 1], closes) * 0.99
+    candles[:, 4] = closes
+    candles[:, 5] = rng.lognormal(10, 1, 14)
+    ohlcv_4h[symbol] = candles
+
+  closes = prices[0] * np.exp(np.cumsum(rng.normal(0, 0.001, history_candles)))
+  history = np.empty((history_candles, COLUMNS))
+  history[:, 0] = now - np.arange(history_candles - 1, -1, -1) * step
+  history[:, 1] = np.concatenate(([closes[0]], closes[:-1]))
+  history[:, 2] = np.maximum(history[:, 1], closes) * 1.0005
+  history[:, 3] = np.minimum(history[:, 1], closes) * 0.9995
+  history[:, 4] = closes
+  history[:, 5] = rng.lognormal(0, 1, history_candles)
+
+  tick_series = {
+    symbol: tickers[symbol]['last'] * np.exp(np.cumsum(rng.normal(0, 0.0005, ticks)))
+    for symbol in symbols[:tick_symbols]
+  }
+  return Fixture('synthetic', now, tickers, ohlcv_4h, {'BTC/KRW': history}, tick_series)
+
+
+def record(exchange=None,
+           history_symbol: str = 'BTC/KRW',
+           history_days: int = 365,
+           tick_symbols: int = 50) -> Fixture:
+  """
+  실제 Upbit 데이터 기록 (네트워크 필요)
+  틱 시계열은 거래대금 상위 KRW 마켓의 최근 1분봉 종가로 만든다.
+  """
+  from collector.session import get_exchange
+  from collector.batch import fetch_ohlcv_many
+  from collector.backfill import iter_backfill
+
+  exchange = exchange or get_exchange()
+  tickers = exchange.fetch_tickers()
+  now = exchange.milliseconds()
+  krw = [symbol for symbol in tickers if symbol.endswith('/KRW')]
+  ohlcv_4h = {
+    symbol: np.asarray(ohlcv, dtype=np.float64).reshape(-1, COLUMNS)
+    for symbol, ohlcv in fetch_ohlcv_many(exchange, krw, '4h', limit=14).items()
+  }
+
+  start = now - history_days * timeframe_ms('1d')
+  pages = [candles for _, candles in iter_backfill([history_symbol], '1m', start, now, exchange=exchange)]
+  history = {history_symbol: np.concatenate(pages) if pages else np.empty((0, COLUMNS))}
+
+  top = sorted(krw, key=lambda symbol: float(tickers[symbol]['quoteVolume'] or 0), reverse=True)[:tick_symbols]
+  recent = fetch_ohlcv_many(exchange, top, '1m', limit=200)
+  ticks = {symbol: np.asarray([candle[4] for candle in ohlcv], dtype=np.float64) for symbol, ohlcv in recent.items()}
+  return Fixture('upbit', now, tickers, ohlcv_4h, history, ticks)
+
+
+def load(path: Optional[Path] = None) -> Fixture:
+  """
+  기록된 픽스처 로드 (없으면 생성 데이터)
+  """
+  path = Path(path or DEFAULT_FIXTURE)
+  if path.exists():
+    return Fixture.load(path)
+  print(f"기록된 픽스처가 없어 생성 데이터를 사용합니다 ({path}). 기록: python -m bench.fixtures --record")
+  return synthesize()
+
+
+class FixtureExchange:
+  """
+  픽스처를 반환하는 네트워크 없는 거래소 (벤치마크용 조회 메소드만 구현)
+  """
+  def __init__(self, fixture: Fixture):
+    self.fixture = fixture
+
+  def milliseconds(self) -> int:
+    return self.fixture.now
+
+  def fetch_tickers(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+    if symbols is None:
+      return self.fixture.tickers
+    return {symbol: self.fixture.tickers[symbol] for symbol in symbols}
+
+  def fetch_ticker(self, symbol: str) -> Dict:
+    return self.fixture.tickers[symbol]
+
+  def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', since: Optional[int] = None, limit: Optional[int] = None) -> List:
+    candles = self.fixture.ohlcv_4h.get(symbol) if timeframe == '4h' else self.fixture.history.get(symbol)
+    if candles is None:
+      return []
+    if since is not None:
+      candles = candles[np.searchsorted(candles[:, 0], since):]
+      return candles[:limit].tolist() if limit else candles.tolist()
+    return candles[-limit:].tolist() if limit else candles.tolist()
+
+
+# 기록: python -m bench.fixtures --record (python 디렉토리에서, 네트워크 필요)
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description='벤치마크 픽스처 기록/생성')
+  parser.add_argument('--record', action='store_true', help='Upbit 에서 실제 데이터 기록')
+  parser.add_argument('--days', type=int, default=365, help='1분봉 히스토리 일수')
+  parser.add_argument('--out', default=str(DEFAULT_FIXTURE))
+  args = parser.parse_args()
+
+  fixture = record(history_days=args.days) if args.record else synthesize()
+  fixture.save(Path(args.out))
+  print(f"저장: {args.out} {fixture.describe()}")
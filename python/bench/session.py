@@ -0,0 +1,74 @@
+import time
+import ccxt
+from collector.session import get_exchange, reset_exchanges
+
+
+# 기존 구조: TrailingStopTrader / DipTrader 는 클라이언트 3개를 각자 생성
+CLIENTS_PER_TRADER = 3
+
+
+def _elapsed_ms(start: float) -> float:
+  return (time.perf_counter() - start) * 1000
+
+
+def bench_before(symbol: str = 'BTC/KRW', clients: int = CLIENTS_PER_TRADER) -> dict:
+  """
+  클래스마다 ccxt.upbit 를 생성하던 기존 방식 측정
+  :param symbol: 첫 요청에 사용할 거래쌍
+  :param clients: 생성할 클라이언트 수
+  :return: 생성 시간 / 첫 요청 지연 (ms)
+  """
+  start = time.perf_counter()
+  exchanges = [ccxt.upbit() for _ in range(clients)]
+  construct_ms = _elapsed_ms(start)
+
+  first_request_ms = []
+  for exchange in exchanges:
+    start = time.perf_counter()
+    exchange.fetch_ticker(symbol)  # 최초 호출 시 load_markets 포함
+    first_request_ms.append(_elapsed_ms(start))
+
+  return {
+    'construct_ms': construct_ms,
+    'first_request_ms': first_request_ms,
+    'total_ms': construct_ms + sum(first_request_ms),
+  }
+
+
+def bench_after(symbol: str = 'BTC/KRW', clients: int = CLIENTS_PER_TRADER) -> dict:
+  """
+  공유 세션 레지스트리 방식 측정
+  :param symbol: 첫 요청에 사용할 거래쌍
+  :param clients: 클라이언트를 조회하는 객체 수
+  :return: 생성 시간 / 첫 요청 지연 (ms)
+  """
+  reset_exchanges()
+  start = time.perf_counter()
+  exchanges = [get_exchange() for _ in range(clients)]
+  construct_ms = _elapsed_ms(start)
+
+  first_request_ms = []
+  for exchange in exchanges:
+    start = time.perf_counter()
+    exchange.fetch_ticker(symbol)
+    first_request_ms.append(_elapsed_ms(start))
+
+  return {
+    'construct_ms': construct_ms,
+    'first_request_ms': first_request_ms,
+    'total_ms': construct_ms + sum(first_request_ms),
+  }
+
+
+def print_result(title: str, result: dict):
+  print(f"\n[{title}]")
+  print(f"생성 시간: {result['construct_ms']:.1f}ms")
+  for i, ms in enumerate(result['first_request_ms']):
+    print(f"클라이언트 {i + 1} 첫 요청: {ms:.1f}ms")
+  print(f"합계: {result['total_ms']:.1f}ms")
+
+
+# 실행: python -m bench.session (python 디렉토리에서)
+if __name__ == "__main__":
+  print_result("기존 (클래스별 ccxt.upbit)", bench_before())
+  print_result("공유 세션 레지스트리", bench_after())
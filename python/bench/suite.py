@@ -0,0 +1,302 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import itertools
+import numpy as np
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from bench.fixtures import Fixture, FixtureExchange, load
+from collector.session import register_exchange, reset_exchanges
+
+BASELINES = Path(__file__).parent / 'baselines.json'
+
+# 기준값 대비 평균 지연 증가 허용 비율
+TOLERANCE = 0.25
+
+
+class ReplayPriceSource:
+  """
+  픽스처 틱 시계열을 순서대로 돌려주는 가격 소스 (대기 없음)
+  틱을 모두 소진하면 0을 반환하여 Stop/손절 조건으로 루프를 끝낸다.
+  """
+  def __init__(self, ticks: Dict[str, np.ndarray]):
+    self.ticks = {symbol: series.tolist() for symbol, series in ticks.items()}
+    self.cursor = dict.fromkeys(self.ticks, 0)
+    self.observed = 0
+
+  def subscribe(self, symbols):
+    pass
+
+  def get_price(self, symbol: str) -> float:
+    series, i = self.ticks[symbol], self.cursor[symbol]
+    self.observed += 1
+    return series[i] if i < len(series) else 0.0
+
+  def get_prices(self, symbols) -> Dict[str, float]:
+    return {symbol: self.get_price(symbol) for symbol in symbols}
+
+  def wait(self, symbol: str, timeout: float):
+    self.cursor[symbol] += 1
+
+  def wait_any(self, timeout: float):
+    for symbol in self.cursor:
+      self.cursor[symbol] += 1
+
+  def close(self):
+    pass
+
+
+class _Orders:
+  def __init__(self):
+    self.completed = {}
+
+  def wait(self, order_id, timeout=None):
+    return self.completed.get(order_id)
+
+  def get(self, order_id):
+    return self.completed.get(order_id)
+
+
+class PaperTrader:
+  """
+  주문을 즉시 체결 처리하는 주문 실행기 (트레이더 루프 측정용, 네트워크 없음)
+  """
+  def __init__(self, exchange):
+    self.exchange = exchange
+    self.account = None
+    self.ledger = None
+    self.orders = _Orders()
+    self._ids = itertools.count(1)
+
+  def _order(self, symbol, side, amount):
+    order = {'id': str(next(self._ids)), 'symbol': symbol, 'side': side, 'amount': amount, 'filled': amount, 'status': 'closed'}
+    self.orders.completed[order['id']] = order
+    return order
+
+  def buy(self, symbol, amount, price=None):
+    return self._order(symbol, 'buy', amount)
+
+  def sell(self, symbol, amount, price=None, reference=None):
+    return self._order(symbol, 'sell', amount)
+
+
+def _stats(samples: List[float], ops_per_sample: int = 1) -> Dict:
+  per_op = np.asarray(samples) / ops_per_sample
+  return {
+    'samples': len(samples),
+    'ops_per_sample': ops_per_sample,
+    'mean_ms': float(per_op.mean() * 1000),
+    'p50_ms': float(np.percentile(per_op, 50) * 1000),
+    'p95_ms': float(np.percentile(per_op, 95) * 1000),
+    'ops_per_sec': float(1 / per_op.mean()) if per_op.mean() > 0 else float('inf')
+  }
+
+
+def _time(func: Callable, repeat: int) -> List[float]:
+  samples = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    func()
+    samples.append(time.perf_counter() - start)
+  return samples
+
+
+# 벤치마크 항목
+
+def bench_market_trend(fixture: Fixture, repeat: int) -> Dict:
+  from collector.market import UpbitMarket
+  market = UpbitMarket(ticker_ttl=0)
+  market.get_market_trend()
+  return _stats(_time(market.get_market_trend, repeat))
+
+
+def bench_market_dominance(fixture: Fixture, repeat: int) -> Dict:
+  from collector.market import UpbitMarket
+  market = UpbitMarket(ticker_ttl=0)
+  market.get_market_dominance()
+  return _stats(_time(market.get_market_dominance, repeat))
+
+
+def bench_trading_signals(fixture: Fixture, repeat: int) -> Dict:
+  from collector.market import UpbitMarket
+  market = UpbitMarket(ticker_ttl=0)
+  market.get_trading_signals()
+  return _stats(_time(market.get_trading_signals, repeat))
+
+
+def bench_get_ohlcv(fixture: Fixture, repeat: int) -> Dict:
+  from collector.chart import UpbitChart
+  from collector.store import CandleStore
+  symbol, candles = next(iter(fixture.history.items()))
+  root = tempfile.mkdtemp(prefix='jnj-bench-')
+  try:
+    store = CandleStore(root)
+    # 마지막 캔들을 제외하고 저장해 두어 매 호출마다 최신 구간 조회 + 병합이 일어나도록 함
+    store.write(symbol, '1m', candles[:-1])
+    chart = UpbitChart(store=store)
+    # 첫 호출의 pandas import 비용은 제외 (cli_startup 항목에서 측정)
+    chart.get_ohlcv(symbol, '1m', limit=1000)
+    return _stats(_time(lambda: chart.get_ohlcv(symbol, '1m', limit=1000), repeat))
+  finally:
+    shutil.rmtree(root, ignore_errors=True)
+
+
+def bench_trailing_stop_loop(fixture: Fixture, repeat: int) -> Dict:
+  from trader.trailing import TrailingStopTrader
+  symbol, ticks = next(iter(fixture.ticks.items()))
+  samples = []
+  for _ in range(max(1, repeat // 10)):
+    prices = ReplayPriceSource({symbol: ticks})
+    trader = TrailingStopTrader(price_source=prices, trader=PaperTrader(None))
+    start = time.perf_counter()
+    # 고점 대비 하락 허용폭이 커서 틱을 모두 소진할 때까지 실행
+    trader.trailing_stop(symbol, trail_percent=99.0, check_interval=0, quantity=1.0)
+    samples.append(time.perf_counter() - start)
+  return _stats(samples, prices.observed)
+
+
+def bench_dip_trailing_loop(fixture: Fixture, repeat: int) -> Dict:
+  from trader.dip import DipTrader
+  symbol, ticks = next(iter(fixture.ticks.items()))
+  samples = []
+  for _ in range(max(1, repeat // 10)):
+    prices = ReplayPriceSource({symbol: ticks})
+    trader = DipTrader(price_source=prices, trader=PaperTrader(None))
+    start = time.perf_counter()
+    trader.trade_trailing(symbol, target_amount=100000, dip_percent=0.5, profit_percent=50, loss_percent=50,
+                          trailing_percent=99.0, check_interval=0)
+    samples.append(time.perf_counter() - start)
+  return _stats(samples, prices.observed)
+
+
+def bench_trailing_engine(fixture: Fixture, repeat: int, orders_per_symbol: int = 20) -> Dict:
+  from trader.engine import TrailingEngine
+  symbols = list(fixture.ticks)
+  samples = []
+  steps = 0
+  for _ in range(max(1, repeat // 10)):
+    prices = ReplayPriceSource(fixture.ticks)
+    engine = TrailingEngine(price_source=prices, trader=PaperTrader(None))
+    for symbol in symbols:
+      for i in range(orders_per_symbol):
+        percent = 0.5 + i * 0.25
+        if i % 2:
+          engine.add_trailing_buy(symbol, percent, 100000)
+        else:
+          engine.add_trailing_stop(symbol, percent, quantity=1.0)
+    steps = min(len(ticks) for ticks in fixture.ticks.values())
+    start = time.perf_counter()
+    for _ in range(steps):
+      engine.tick()
+      prices.wait_any(0)
+    samples.append(time.perf_counter() - start)
+  return _stats(samples, steps)
+
+
+def bench_cli_startup(fixture: Fixture, repeat: int, command: str = 'balances') -> Dict:
+  # 새 인터프리터에서 main.py 서브커맨드 모듈 로드까지의 시간 (네트워크 없음)
+  root = Path(__file__).resolve().parent.parent
+  args = [sys.executable, str(root / 'main.py'), '--dry-run', command]
+  return _stats(_time(lambda: subprocess.run(args, cwd=root, check=True), max(1, repeat // 10)))
+
+
+BENCHMARKS = {
+  'market_trend': bench_market_trend,
+  'market_dominance': bench_market_dominance,
+  'trading_signals': bench_trading_signals,
+  'get_ohlcv': bench_get_ohlcv,
+  'trailing_stop_loop': bench_trailing_stop_loop,
+  'dip_trailing_loop': bench_dip_trailing_loop,
+  'trailing_engine': bench_trailing_engine,
+  'cli_startup': bench_cli_startup,
+}
+
+
+def run(fixture: Fixture, names: Optional[List[str]] = None, repeat: int = 30) -> Dict[str, Dict]:
+  """
+  벤치마크 실행 (트레이더 출력은 버림)
+  :param names: 실행할 항목 (None이면 전체)
+  :param repeat: 항목별 반복 횟수 (루프 항목은 1/10)
+  :return: {항목: 통계}
+  """
+  register_exchange(FixtureExchange(fixture))
+  results = {}
+  try:
+    for name in names or BENCHMARKS:
+      with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        results[name] = BENCHMARKS[name](fixture, repeat)
+  finally:
+    reset_exchanges()
+  return results
+
+
+def environment(fixture: Fixture) -> Dict:
+  return {
+    'python': platform.python_version(),
+    'numpy': np.__version__,
+    'platform': platform.platform(),
+    'processor': platform.processor() or platform.machine(),
+    'cpus': os.cpu_count(),
+    'fixture': fixture.describe()
+  }
+
+
+def compare(results: Dict[str, Dict], baselines: Dict, tolerance: float = TOLERANCE) -> List[str]:
+  """
+  기준값 대비 평균 지연이 허용 비율 이상 늘어난 항목
+  """
+  regressions = []
+  for name, result in results.items():
+    base = baselines.get('results', {}).get(name)
+    if base and result['mean_ms'] > base['mean_ms'] * (1 + tolerance):
+      regressions.append(name)
+  return regressions
+
+
+def print_results(results: Dict[str, Dict], baselines: Optional[Dict] = None):
+  print(f"\n{'항목':<22}{'평균(ms)':>12}{'p50(ms)':>12}{'p95(ms)':>12}{'ops/s':>14}{'기준 대비':>10}")
+  for name, result in results.items():
+    base = (baselines or {}).get('results', {}).get(name)
+    ratio = f"{result['mean_ms'] / base['mean_ms']:.2f}x" if base else '-'
+    print(f"{name:<22}{result['mean_ms']:>12.4f}{result['p50_ms']:>12.4f}{result['p95_ms']:>12.4f}"
+          f"{result['ops_per_sec']:>14,.0f}{ratio:>10}")
+
+
+# 실행: python -m bench.suite [--save] (python 디렉토리에서, 네트워크 불필요)
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description='오프라인 벤치마크')
+  parser.add_argument('--fixture', help='픽스처 경로 (기본: bench/fixtures/upbit.npz, 없으면 생성 데이터)')
+  parser.add_argument('--only', help='실행할 항목 (쉼표 구분)')
+  parser.add_argument('--repeat', type=int, default=30)
+  parser.add_argument('--save', action='store_true', help='결과를 기준값으로 저장')
+  parser.add_argument('--baselines', default=str(BASELINES))
+  parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+  args = parser.parse_args()
+
+  fixture = load(args.fixture)
+  names = args.only.split(',') if args.only else None
+  results = run(fixture, names, args.repeat)
+
+  baselines = None
+  if Path(args.baselines).exists():
+    baselines = json.loads(Path(args.baselines).read_text())
+    if baselines.get('environment', {}).get('fixture', {}).get('source') != fixture.source:
+      print("기준값과 픽스처 종류가 달라 비교하지 않습니다.")
+      baselines = None
+  print_results(results, baselines)
+
+  if args.save:
+    Path(args.baselines).write_text(json.dumps({'environment': environment(fixture), 'results': results}, indent=2) + '\n')
+    print(f"\n기준값 저장: {args.baselines}")
+  elif baselines:
+    regressions = compare(results, baselines, args.tolerance)
+    if regressions:
+      print(f"\n성능 저하 (+{args.tolerance:.0%} 초과): {', '.join(regressions)}")
+      sys.exit(1)
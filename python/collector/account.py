@@ -1,17 +1,9 @@
-import os
-import ccxt
-from dotenv import load_dotenv
 from typing import Optional, Dict, List
-
-# .env 파일 로드
-load_dotenv()
+from collector.session import get_exchange
 
 class UpbitAccount:
   def __init__(self):
-    self.exchange = ccxt.upbit({
-      'apiKey': os.getenv('UPBIT_ACCESS_KEY'),
-      'secret': os.getenv('UPBIT_SECRET_KEY')
-    })
+    self.exchange = get_exchange()
 
   def get_balances(self) -> List[Dict]:
     """
@@ -0,0 +1,185 @@
+import argparse
+import threading
+import numpy as np
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from collector.session import get_exchange
+from collector.scheduler import QUOTATION_RATE
+from collector.store import CandleStore, COLUMNS, timeframe_ms
+
+# Upbit 캔들 조회 1회 최대 개수
+PAGE_SIZE = 200
+
+
+def plan_pages(timeframe: str, start: int, end: int) -> List[int]:
+  """
+  기간을 요청 단위(200 캔들) 페이지로 분할
+  페이지 시작점은 epoch 기준으로 정렬되어 재실행해도 같은 페이지로 나뉜다.
+  :param start: 시작 timestamp (ms)
+  :param end: 종료 timestamp (ms, 미포함)
+  :return: 페이지 시작 timestamp 목록 (오름차순)
+  """
+  span = timeframe_ms(timeframe) * PAGE_SIZE
+  first = start // span * span
+  return list(range(first, end, span))
+
+
+class _Progress:
+  """
+  완료된 페이지 기록 (중단 후 재개용, 캔들 파일 옆 .done 파일)
+  """
+  def __init__(self, store: CandleStore, symbol: str, timeframe: str):
+    self.path = store.path(symbol, timeframe).with_suffix('.done')
+    self.lock = threading.Lock()
+    self.pages: Set[int] = set()
+    if self.path.exists():
+      with open(self.path, 'r') as file:
+        self.pages = {int(line) for line in file if line.strip()}
+
+  def mark(self, page: int):
+    with self.lock:
+      self.pages.add(page)
+      self.path.parent.mkdir(parents=True, exist_ok=True)
+      with open(self.path, 'a') as file:
+        file.write(f"{page}\n")
+
+
+def iter_backfill(symbols: List[str],
+                  timeframe: str,
+                  start: int,
+                  end: int,
+                  store: Optional[CandleStore] = None,
+                  exchange=None,
+                  max_workers: int = QUOTATION_RATE) -> Iterator[Tuple[str, np.ndarray]]:
+  """
+  여러 심볼의 과거 캔들을 페이지 단위로 동시에 조회하여 순서대로 전달
+  심볼별로 시간 순서가 보장되며, store 가 있으면 페이지 전체를 저장한 뒤 기간에 완전히 포함된
+  페이지만 완료로 기록하여 재실행 시 건너뛴다. 기간 경계와 마지막(진행 중) 페이지는 항상 다시 받는다.
+  :param symbols: 거래쌍 목록
+  :param timeframe: 시간단위 ('1m', '1h', '1d' 등)
+  :param start: 시작 timestamp (ms)
+  :param end: 종료 timestamp (ms, 미포함)
+  :param store: 캔들 저장소 (None이면 저장 없이 전달만)
+  :param exchange: ccxt 거래소 인스턴스 (None이면 공유 클라이언트)
+  :param max_workers: 동시 요청 스레드 수 (요청 제한은 ScheduledUpbit 의 quotation 버킷)
+  :return: (심볼, (n, 6) 캔들 배열) 이터레이터
+  """
+  exchange = exchange or get_exchange()
+  step = timeframe_ms(timeframe)
+  span = step * PAGE_SIZE
+  now = exchange.milliseconds()
+
+  progress: Dict[str, _Progress] = {}
+  pages: Dict[str, List[int]] = {}
+  for symbol in symbols:
+    if store is not None:
+      progress[symbol] = _Progress(store, symbol, timeframe)
+    done = progress[symbol].pages if symbol in progress else set()
+    pages[symbol] = [page for page in plan_pages(timeframe, start, end) if page not in done]
+
+  def fetch(symbol: str, page: int) -> np.ndarray:
+    ohlcv = exchange.fetch_ohlcv(symbol, timeframe, since=page, limit=PAGE_SIZE)
+    candles = np.asarray(ohlcv, dtype=np.float64).reshape(-1, COLUMNS)
+    return candles[(candles[:, 0] >= page) & (candles[:, 0] < page + span)]
+
+  # 심볼을 번갈아 가며 오래된 페이지부터 요청
+  def tasks():
+    for i in range(max((len(p) for p in pages.values()), default=0)):
+      for symbol in symbols:
+        if i < len(pages[symbol]):
+          yield symbol, i
+
+  # 완료 순서와 무관하게 심볼별로 페이지 순서대로 내보내기 위한 버퍼
+  pending: Dict[str, Dict[int, np.ndarray]] = {symbol: {} for symbol in symbols}
+  next_index = {symbol: 0 for symbol in symbols}
+
+  def flush(symbol: str):
+    while next_index[symbol] in pending[symbol]:
+      i = next_index[symbol]
+      candles = pending[symbol].pop(i)
+      page = pages[symbol][i]
+      # 페이지 전체를 저장하고, 기간 [start, end) 에 완전히 포함된 페이지만 완료로 기록
+      if store is not None:
+        store.write(symbol, timeframe, candles)
+        if start <= page and page + span <= min(end, now):
+          progress[symbol].mark(page)
+      next_index[symbol] += 1
+      yield symbol, candles[(candles[:, 0] >= start) & (candles[:, 0] < end)]
+
+  queue = tasks()
+  in_flight = {}
+  with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    while True:
+      # 처리 중인 요청 수를 제한하여 메모리 사용량 유지
+      while len(in_flight) < max_workers * 4:
+        task = next(queue, None)
+        if task is None:
+          break
+        symbol, i = task
+        in_flight[executor.submit(fetch, symbol, pages[symbol][i])] = task
+      if not in_flight:
+        break
+      done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+      for future in done:
+        symbol, i = in_flight.pop(future)
+        pending[symbol][i] = future.result()
+        yield from flush(symbol)
+
+
+def backfill(symbols: List[str],
+             timeframe: str,
+             start: int,
+             end: int,
+             store: Optional[CandleStore] = None,
+             max_workers: int = QUOTATION_RATE) -> Dict[str, int]:
+  """
+  과거 캔들을 조회하여 캔들 저장소에 저장
+  :return: {심볼: 새로 받은 캔들 수}
+  """
+  store = store or CandleStore()
+  counts = {symbol: 0 for symbol in symbols}
+  for symbol, candles in iter_backfill(symbols, timeframe, start, end, store, max_workers=max_workers):
+    counts[symbol] += len(candles)
+  return counts
+
+
+def top_krw_symbols(count: int) -> List[str]:
+  """
+  24시간 거래대금 상위 KRW 마켓 조회
+  """
+  tickers = get_exchange().fetch_tickers()
+  krw = [ticker for symbol, ticker in tickers.items() if symbol.endswith('/KRW')]
+  krw.sort(key=lambda ticker: float(ticker['quoteVolume'] or 0), reverse=True)
+  return [ticker['symbol'] for ticker in krw[:count]]
+
+
+def _parse_date(value: str) -> int:
+  return int(datetime.strptime(value, '%Y-%m-%d').timestamp() * 1000)
+
+
+# 실행 예시: python -m collector.backfill --top 50 --timeframe 1m --days 365
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description='Upbit 과거 캔들 백필')
+  parser.add_argument('--symbols', help='거래쌍 목록 (쉼표 구분, 예: BTC/KRW,ETH/KRW)')
+  parser.add_argument('--top', type=int, default=50, help='거래대금 상위 KRW 마켓 수 (--symbols 미지정 시)')
+  parser.add_argument('--timeframe', default='1m')
+  parser.add_argument('--days', type=int, default=365, help='오늘부터 과거 일수 (--start 미지정 시)')
+  parser.add_argument('--start', help='시작일 (YYYY-MM-DD)')
+  parser.add_argument('--end', help='종료일 (YYYY-MM-DD, 미포함)')
+  parser.add_argument('--workers', type=int, default=QUOTATION_RATE)
+  parser.add_argument('--store', help='캔들 저장소 경로')
+  args = parser.parse_args()
+
+  symbols = args.symbols.split(',') if args.symbols else top_krw_symbols(args.top)
+  end = _parse_date(args.end) if args.end else int(datetime.now().timestamp() * 1000)
+  start = _parse_date(args.start) if args.start else int((datetime.now() - timedelta(days=args.days)).timestamp() * 1000)
+
+  store = CandleStore(args.store)
+  total = 0
+  started = datetime.now()
+  for symbol, candles in iter_backfill(symbols, args.timeframe, start, end, store, max_workers=args.workers):
+    total += len(candles)
+    if len(candles):
+      print(f"{symbol}: {datetime.fromtimestamp(candles[-1, 0] / 1000)} 까지 저장 (누적 {total:,}개)")
+  print(f"\n완료: {len(symbols)}개 심볼, {total:,}개 캔들, {datetime.now() - started}")
@@ -0,0 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from collector.scheduler import QUOTATION_RATE
+
+
+def fetch_ohlcv_many(exchange,
+                     symbols: List[str],
+                     timeframe: str = '1d',
+                     limit: Optional[int] = None,
+                     max_workers: int = QUOTATION_RATE) -> Dict[str, List]:
+  """
+  여러 심볼의 OHLCV 를 동시에 조회
+  요청 제한은 공유 클라이언트(ScheduledUpbit)의 quotation 버킷에서 처리된다.
+  :param exchange: ccxt 거래소 인스턴스
+  :param symbols: 거래쌍 목록 (예: ['BTC/KRW', 'ETH/KRW'])
+  :param timeframe: 시간단위 ('1m', '1h', '4h', '1d' 등)
+  :param limit: 조회할 캔들 개수
+  :param max_workers: 동시 요청 스레드 수
+  :return: {심볼: ohlcv} (symbols 순서 유지)
+  """
+  def fetch(symbol):
+    return exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+
+  if not symbols:
+    return {}
+
+  with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as executor:
+    futures = [executor.submit(fetch, symbol) for symbol in symbols]
+    # 순차 조회와 동일하게 실패한 요청의 예외는 그대로 전달
+    return {symbol: future.result() for symbol, future in zip(symbols, futures)}
@@ -1,28 +1,38 @@
-import ccxt
-import pandas as pd
 from datetime import datetime
-import os
-from dotenv import load_dotenv
+from typing import List, Optional
+from collector.session import get_exchange
+from collector.store import CandleStore, timeframe_ms
+from collector.orderbook import OrderBook
 
-load_dotenv()
+# Upbit 캔들 조회 1회 최대 개수
+MAX_CANDLES_PER_REQUEST = 200
 
 class UpbitChart:
-  def __init__(self):
-    self.exchange = ccxt.upbit({
-      'apiKey': os.getenv('UPBIT_ACCESS_KEY'),
-      'secret': os.getenv('UPBIT_SECRET_KEY')
-    })
+  def __init__(self, store: Optional[CandleStore] = None):
+    """
+    :param store: 로컬 캔들 저장소 (None인 경우 기본 경로)
+    """
+    self.exchange = get_exchange()
+    self.store = store or CandleStore()
 
-  def get_ohlcv(self, symbol='BTC/KRW', timeframe='1d', limit=100):
+  def get_ohlcv(self, symbol='BTC/KRW', timeframe='1d', limit=100, use_store=True, fill_gaps=False):
     """
-    OHLCV 데이터 조회
+    OHLCV 데이터 조회 (로컬 캔들 저장소에 없는 구간만 거래소에서 조회)
     :param symbol: 거래쌍 (예: 'BTC/KRW')
     :param timeframe: 시간단위 ('1m', '1h', '1d' 등)
     :param limit: 조회할 캔들 개수
+    :param use_store: 로컬 캔들 저장소 사용 여부
+    :param fill_gaps: 조회 구간 내 빈 캔들도 다시 조회할지 여부
     :return: DataFrame
     """
     try:
-      ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+      if use_store:
+        self.sync_ohlcv(symbol, timeframe, limit, fill_gaps)
+        ohlcv = self.store.read(symbol, timeframe)[-limit:]
+      else:
+        ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+      # pandas 는 DataFrame 변환 시에만 로드 (CLI 시작 시간 단축)
+      import pandas as pd
       df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
       df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
       return df
@@ -30,6 +40,52 @@ class UpbitChart:
       print(f"OHLCV 데이터 조회 실패: {str(e)}")
       return None
 
+  def fetch_ohlcv_range(self, symbol: str, timeframe: str, since: int, until: int) -> List:
+    """
+    기간 내 캔들을 요청 한도(200개) 단위로 나누어 조회
+    :param since: 시작 timestamp (ms)
+    :param until: 종료 timestamp (ms, 미포함)
+    :return: ccxt OHLCV 목록
+    """
+    step = timeframe_ms(timeframe)
+    result = []
+    while since < until:
+      count = min(MAX_CANDLES_PER_REQUEST, max(1, -(-(until - since) // step)))
+      ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=count)
+      ohlcv = [candle for candle in ohlcv if since <= candle[0] < until]
+      result.extend(ohlcv)
+      # 거래가 없어 캔들이 비어 있는 구간은 건너뜀
+      since = ohlcv[-1][0] + step if ohlcv else since + count * step
+    return result
+
+  def sync_ohlcv(self, symbol: str, timeframe: str, limit: int, fill_gaps: bool = False) -> int:
+    """
+    로컬 캔들 저장소를 최신 상태로 갱신 (부족한 과거 구간, 최신 구간, 빈 구간만 조회)
+    :return: 저장소의 캔들 수
+    """
+    step = timeframe_ms(timeframe)
+    now = self.exchange.milliseconds()
+    stored = self.store.read(symbol, timeframe)
+
+    if len(stored) == 0:
+      if limit <= MAX_CANDLES_PER_REQUEST:
+        fetched = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+      else:
+        fetched = self.fetch_ohlcv_range(symbol, timeframe, now - limit * step, now + step)
+      return self.store.write(symbol, timeframe, fetched)
+
+    first, last = int(stored[0, 0]), int(stored[-1, 0])
+    start = now - limit * step
+    fetched = []
+    # 마지막 캔들은 아직 진행 중일 수 있으므로 다시 조회 (조회 구간보다 오래된 빈 구간은 fill_gaps / backfill 로 채움)
+    fetched += self.fetch_ohlcv_range(symbol, timeframe, max(last, start), now + step)
+    if len(stored) < limit and first > start:
+      fetched += self.fetch_ohlcv_range(symbol, timeframe, max(first - (limit - len(stored)) * step, start), first)
+    if fill_gaps:
+      for gap_start, gap_end in self.store.gaps(symbol, timeframe, start=start):
+        fetched += self.fetch_ohlcv_range(symbol, timeframe, gap_start, gap_end)
+    return self.store.write(symbol, timeframe, fetched)
+
   def get_orderbook(self, symbol='BTC/KRW'):
     """
     호가창 데이터 조회
@@ -47,6 +103,19 @@ class UpbitChart:
       print(f"호가창 데이터 조회 실패: {str(e)}")
       return None
 
+  def get_book(self, symbol='BTC/KRW', limit: Optional[int] = None) -> Optional[OrderBook]:
+    """
+    호가창 조회 (깊이/VWAP/슬리피지 계산용 OrderBook)
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :param limit: 호가 개수 (None이면 거래소 기본값)
+    :return: OrderBook
+    """
+    try:
+      return OrderBook.from_ccxt(self.exchange.fetch_order_book(symbol, limit))
+    except Exception as e:
+      print(f"호가창 데이터 조회 실패: {str(e)}")
+      return None
+
   def get_balance(self):
     """
     잔고 조회
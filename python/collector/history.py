@@ -0,0 +1,141 @@
+import threading
+import numpy as np
+from typing import Dict, List, Optional
+
+# 보관할 티커 스냅샷 수 (심볼당, 초과 시 가장 오래된 스냅샷부터 덮어씀)
+HISTORY_SIZE = 2048
+
+# 심볼 행 초기 할당 수 (신규 상장 등으로 부족하면 2배씩 확장)
+INITIAL_ROWS = 256
+
+
+def _none(value: float) -> Optional[float]:
+  return None if np.isnan(value) else float(value)
+
+
+class TickerHistory:
+  """
+  티커 스냅샷 기록용 고정 크기 링 버퍼 (심볼 x 스냅샷 NumPy 배열, 미리 할당)
+  fetch_tickers 스냅샷마다 현재가, 24시간 거래대금, 당일 누적 거래대금을 한 열씩 기록하고,
+  전체 마켓의 구간 수익률/거래대금/실현 변동성을 추가 요청 없이 계산한다.
+  """
+  def __init__(self, capacity: int = HISTORY_SIZE, quote: Optional[str] = 'KRW'):
+    """
+    :param capacity: 보관할 스냅샷 수
+    :param quote: 기록할 마켓 (None이면 전체)
+    """
+    self.capacity = capacity
+    self.suffix = f"/{quote}" if quote else ''
+    self.symbols: List[str] = []
+    self.rows: Dict[str, int] = {}
+    self.times = np.full(capacity, np.nan)
+    self.prices = np.full((INITIAL_ROWS, capacity), np.nan)
+    self.volumes = np.full((INITIAL_ROWS, capacity), np.nan)
+    self.accumulated = np.full((INITIAL_ROWS, capacity), np.nan)
+    self.head = 0
+    self.count = 0
+    self._keys: Optional[List[str]] = None
+    self._symbols: List[str] = []
+    self._indexes: Optional[np.ndarray] = None
+    self._lock = threading.Lock()
+
+  def __len__(self) -> int:
+    return self.count
+
+  def _row_indexes(self, symbols: List[str]) -> np.ndarray:
+    for symbol in symbols:
+      if symbol not in self.rows:
+        self.rows[symbol] = len(self.symbols)
+        self.symbols.append(symbol)
+    if len(self.symbols) > len(self.prices):
+      size = len(self.prices)
+      while size < len(self.symbols):
+        size *= 2
+      for name in ('prices', 'volumes', 'accumulated'):
+        grown = np.full((size, self.capacity), np.nan)
+        grown[:len(getattr(self, name))] = getattr(self, name)
+        setattr(self, name, grown)
+    return np.fromiter((self.rows[symbol] for symbol in symbols), dtype=np.intp, count=len(symbols))
+
+  def record(self, tickers: Dict[str, Dict], timestamp: float):
+    """
+    티커 스냅샷 기록 (이전 기록보다 늦은 시각만)
+    :param tickers: {심볼: ticker} (fetch_tickers 결과)
+    :param timestamp: 스냅샷 시각 (epoch 초)
+    """
+    with self._lock:
+      if self.count and timestamp <= self.times[(self.head - 1) % self.capacity]:
+        return
+      # 심볼 구성이 이전 스냅샷과 같으면 행 번호 재사용
+      keys = list(tickers)
+      if keys != self._keys:
+        symbols = [symbol for symbol in keys if symbol.endswith(self.suffix)]
+        self._keys, self._symbols, self._indexes = keys, symbols, self._row_indexes(symbols)
+      values = np.array([
+        (ticker['last'], ticker['quoteVolume'], (ticker.get('info') or {}).get('acc_trade_price'))
+        for ticker in map(tickers.__getitem__, self._symbols)
+      ], dtype=np.float64).reshape(-1, 3)
+      rows = self._indexes
+      slot = self.head
+      for array, column in ((self.prices, 0), (self.volumes, 1), (self.accumulated, 2)):
+        array[:, slot] = np.nan
+        array[rows, slot] = values[:, column]
+      self.times[slot] = timestamp
+      self.head = (slot + 1) % self.capacity
+      self.count = min(self.count + 1, self.capacity)
+
+  def _window(self, horizon: float) -> np.ndarray:
+    # 오래된 순서의 슬롯 중 (최신 - horizon) 시점 직전 스냅샷부터 최신까지
+    order = (self.head - self.count + np.arange(self.count)) % self.capacity
+    times = self.times[order]
+    start = max(int(np.searchsorted(times, times[-1] - horizon, 'right')) - 1, 0)
+    return order[start:]
+
+  def stats(self, horizon: float) -> Dict:
+    """
+    최근 horizon 초 구간의 심볼별 통계 (기록이 horizon 보다 짧으면 기록된 구간 기준)
+    :param horizon: 구간 (초)
+    :return: {'covered': 실제 구간(초), 'snapshots': 스냅샷 수, 'coins': {심볼: 통계}}
+             통계: price, return(%), volume(구간 거래대금, KRW), volume_change(24시간 거래대금 증감, %),
+                   volatility(스냅샷 간 로그 수익률 기준 실현 변동성, %), samples
+    """
+    with self._lock:
+      if not self.count:
+        return {'covered': 0.0, 'snapshots': 0, 'coins': {}}
+      window = self._window(horizon)
+      n = len(self.symbols)
+      times = self.times[window]
+      prices = self.prices[:n, window]
+      volumes = self.volumes[:n, window]
+      accumulated = self.accumulated[:n, window]
+      symbols = list(self.symbols)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+      last = prices[:, -1]
+      returns = (last / prices[:, 0] - 1) * 100
+      volume_change = (volumes[:, -1] / volumes[:, 0] - 1) * 100
+      log_returns = np.diff(np.log(prices), axis=1)
+      valid = ~np.isnan(log_returns)
+      samples = valid.sum(axis=1)
+      volatility = np.where(samples > 0, np.sqrt(np.nansum(log_returns ** 2, axis=1)) * 100, np.nan)
+      # 당일 누적 거래대금 증가분 합계 (Upbit 일 초기화 시점에는 초기화 후 누적값 사용)
+      deltas = np.diff(accumulated, axis=1)
+      deltas = np.where(deltas < 0, accumulated[:, 1:], deltas)
+      traded = np.where(np.isnan(deltas).all(axis=1), np.nan, np.nansum(deltas, axis=1))
+
+    return {
+      'covered': float(times[-1] - times[0]),
+      'snapshots': len(window),
+      'coins': {
+        symbol: {
+          'price': _none(last[i]),
+          'return': _none(returns[i]),
+          'volume': _none(traded[i]),
+          'volume_change': _none(volume_change[i]),
+          'volatility': _none(volatility[i]),
+          'samples': int(samples[i])
+        }
+        for i, symbol in enumerate(symbols)
+        if not np.isnan(last[i])
+      }
+    }
@@ -0,0 +1,280 @@
+import math
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from collector.indicators import HIGH, LOW, CLOSE
+
+# 틱을 묶을 기본 봉 길이 (초)
+BAR_SECONDS = 60.0
+
+# Bollinger 누적 합 재계산 주기 (부동소수 오차 누적 방지, 갱신 횟수 기준)
+RESUM_INTERVAL = 1024
+
+
+class Incremental:
+  """
+  가격 갱신마다 O(1) 시간/메모리로 값을 갱신하는 지표의 공통 기반
+  상태는 __slots__ 에만 보관하며, state() / from_state() 로 저장 후 그대로 복원할 수 있다.
+  """
+  __slots__ = ()
+  # state() 에서 제외할 슬롯 (함수 등 직렬화 대상이 아닌 값)
+  _transient: Tuple[str, ...] = ()
+
+  def state(self) -> Dict:
+    """
+    현재 상태 (JSON 직렬화 가능한 dict)
+    """
+    return {
+      name: list(value) if isinstance(value, list) else value
+      for name in self.__slots__ if name not in self._transient
+      for value in (getattr(self, name),)
+    }
+
+  @classmethod
+  def from_state(cls, state: Dict, **transient):
+    """
+    state() 결과로 복원
+    :param transient: 상태에 포함되지 않는 슬롯 값 (예: TickBars 의 clock)
+    """
+    indicator = cls.__new__(cls)
+    for name, value in dict(state, **transient).items():
+      setattr(indicator, name, list(value) if isinstance(value, list) else value)
+    return indicator
+
+  def __repr__(self) -> str:
+    return f"{type(self).__name__}({self.state()})"
+
+
+class EMA(Incremental):
+  """
+  지수 이동 평균 (첫 period 개는 단순 평균으로 시작)
+  """
+  __slots__ = ('period', 'alpha', 'count', 'total', 'value')
+
+  def __init__(self, period: int):
+    self.period = period
+    self.alpha = 2 / (period + 1)
+    self.count = 0
+    self.total = 0.0
+    self.value: Optional[float] = None
+
+  @property
+  def ready(self) -> bool:
+    return self.count >= self.period
+
+  def update(self, value: float) -> Optional[float]:
+    """
+    :return: EMA (값이 period 개 미만이면 None)
+    """
+    self.count += 1
+    if self.count < self.period:
+      self.total += value
+    elif self.count == self.period:
+      self.value = (self.total + value) / self.period
+    else:
+      self.value += self.alpha * (value - self.value)
+    return self.value
+
+
+class WilderRSI(Incremental):
+  """
+  Wilder 평활 RSI (collector.indicators.rsi_wilder 와 같은 값)
+  """
+  __slots__ = ('period', 'prev', 'count', 'avg_gain', 'avg_loss')
+
+  def __init__(self, period: int = 14):
+    self.period = period
+    self.prev: Optional[float] = None
+    self.count = 0
+    self.avg_gain = 0.0
+    self.avg_loss = 0.0
+
+  @property
+  def ready(self) -> bool:
+    return self.count >= self.period
+
+  @property
+  def value(self) -> Optional[float]:
+    """
+    RSI (변동 수가 period 미만이면 None)
+    """
+    if not self.ready:
+      return None
+    if self.avg_loss == 0:
+      return 100.0
+    return 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+
+  def update(self, close: float) -> Optional[float]:
+    if self.prev is not None:
+      change = close - self.prev
+      gain, loss = max(change, 0.0), max(-change, 0.0)
+      self.count += 1
+      if self.count <= self.period:
+        self.avg_gain += gain / self.period
+        self.avg_loss += loss / self.period
+      else:
+        self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+        self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+    self.prev = close
+    return self.value
+
+  def seed(self, closes: Sequence[float]) -> 'WilderRSI':
+    """
+    과거 종가로 초기화 (시작 시 한 번 조회한 캔들 등)
+    """
+    for close in closes:
+      self.update(float(close))
+    return self
+
+
+class ATR(Incremental):
+  """
+  Wilder 평활 ATR (Average True Range, 첫 period 개는 단순 평균으로 시작)
+  """
+  __slots__ = ('period', 'prev_close', 'count', 'total', 'value')
+
+  def __init__(self, period: int = 14):
+    self.period = period
+    self.prev_close: Optional[float] = None
+    self.count = 0
+    self.total = 0.0
+    self.value: Optional[float] = None
+
+  @property
+  def ready(self) -> bool:
+    return self.count >= self.period
+
+  def update(self, high: float, low: float, close: float) -> Optional[float]:
+    """
+    :return: ATR (봉이 period 개 미만이면 None)
+    """
+    if self.prev_close is None:
+      true_range = high - low
+    else:
+      true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+    self.prev_close = close
+    self.count += 1
+    if self.count < self.period:
+      self.total += true_range
+    elif self.count == self.period:
+      self.value = (self.total + true_range) / self.period
+    else:
+      self.value = (self.value * (self.period - 1) + true_range) / self.period
+    return self.value
+
+  def seed(self, ohlcv: Sequence[Sequence[float]]) -> 'ATR':
+    """
+    과거 캔들 (ccxt OHLCV) 로 초기화 (시작 시 한 번 조회한 캔들 등)
+    """
+    for candle in ohlcv:
+      self.update(float(candle[HIGH]), float(candle[LOW]), float(candle[CLOSE]))
+    return self
+
+
+class Bollinger(Incremental):
+  """
+  Bollinger 밴드 (최근 period 개 값의 평균 ± width * 표준편차, 모표준편차)
+  고정 크기 원형 버퍼와 누적 합/제곱합으로 갱신한다.
+  """
+  __slots__ = ('period', 'width', 'window', 'index', 'count', 'total', 'total_sq', 'updates')
+
+  def __init__(self, period: int = 20, width: float = 2.0):
+    self.period = period
+    self.width = width
+    self.window: List[float] = [0.0] * period
+    self.index = 0
+    self.count = 0
+    self.total = 0.0
+    self.total_sq = 0.0
+    self.updates = 0
+
+  @property
+  def ready(self) -> bool:
+    return self.count >= self.period
+
+  @property
+  def middle(self) -> Optional[float]:
+    return self.total / self.period if self.ready else None
+
+  @property
+  def std(self) -> Optional[float]:
+    if not self.ready:
+      return None
+    mean = self.total / self.period
+    return math.sqrt(max(self.total_sq / self.period - mean * mean, 0.0))
+
+  @property
+  def upper(self) -> Optional[float]:
+    return self.middle + self.width * self.std if self.ready else None
+
+  @property
+  def lower(self) -> Optional[float]:
+    return self.middle - self.width * self.std if self.ready else None
+
+  def percent_b(self, value: float) -> Optional[float]:
+    """
+    밴드 내 위치 (하단 0, 상단 1, 밴드 폭이 0이면 None)
+    """
+    if not self.ready or self.std == 0:
+      return None
+    return (value - self.lower) / (self.upper - self.lower)
+
+  def update(self, value: float) -> Optional[Tuple[float, float, float]]:
+    """
+    :return: (하단, 중간, 상단) (값이 period 개 미만이면 None)
+    """
+    old = self.window[self.index]
+    self.window[self.index] = value
+    self.index = (self.index + 1) % self.period
+    if self.count < self.period:
+      self.count += 1
+      old = 0.0
+    self.total += value - old
+    self.total_sq += value * value - old * old
+    self.updates += 1
+    if self.updates % RESUM_INTERVAL == 0:
+      window = self.window[:self.count]
+      self.total = math.fsum(window)
+      self.total_sq = math.fsum(v * v for v in window)
+    if not self.ready:
+      return None
+    return self.lower, self.middle, self.upper
+
+
+class TickBars(Incremental):
+  """
+  틱 가격을 bar_seconds 길이의 봉으로 묶음 (봉 단위 지표에 틱 가격을 공급할 때 사용)
+  """
+  __slots__ = ('seconds', 'start', 'high', 'low', 'close', 'clock')
+  _transient = ('clock',)
+
+  def __init__(self, seconds: float = BAR_SECONDS, clock: Callable[[], float] = time.time):
+    """
+    :param seconds: 봉 길이 (초)
+    :param clock: 현재 시각 함수 (시뮬레이터에서는 VirtualClock.time)
+    """
+    self.seconds = seconds
+    self.start: Optional[float] = None
+    self.high = self.low = self.close = 0.0
+    self.clock = clock
+
+  @classmethod
+  def from_state(cls, state: Dict, clock: Callable[[], float] = time.time, **transient):
+    return super().from_state(state, clock=clock, **transient)
+
+  def update(self, price: float) -> Optional[Tuple[float, float, float]]:
+    """
+    :return: 이번 틱으로 마감된 봉의 (고가, 저가, 종가), 봉이 진행 중이면 None
+    """
+    now = self.clock()
+    bar = None
+    if self.start is not None and now - self.start >= self.seconds:
+      bar = (self.high, self.low, self.close)
+      self.start = None
+    if self.start is None:
+      self.start = now - (now % self.seconds) if self.seconds else now
+      self.high = self.low = price
+    else:
+      self.high = max(self.high, price)
+      self.low = min(self.low, price)
+    self.close = price
+    return bar
@@ -0,0 +1,108 @@
+import numpy as np
+from typing import List, Sequence
+
+# ccxt OHLCV 컬럼 순서
+TIMESTAMP, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+
+
+def ohlcv_matrix(ohlcv_list: Sequence[List], column: int = CLOSE) -> np.ndarray:
+  """
+  심볼별 OHLCV 목록을 심볼 x 캔들 행렬로 변환
+  캔들 개수가 다른 심볼은 왼쪽을 NaN 으로 채워 마지막 캔들을 맞춘다.
+  :param ohlcv_list: 심볼별 ccxt OHLCV 목록
+  :param column: 추출할 컬럼 (CLOSE, VOLUME 등)
+  :return: (심볼 수, 최대 캔들 수) float64 행렬
+  """
+  lengths = {len(ohlcv) for ohlcv in ohlcv_list}
+  if len(lengths) == 1:
+    return np.asarray(ohlcv_list, dtype=np.float64).reshape(len(ohlcv_list), -1, 6)[:, :, column]
+
+  matrix = np.full((len(ohlcv_list), max(lengths, default=0)), np.nan)
+  for row, ohlcv in zip(matrix, ohlcv_list):
+    if ohlcv:
+      row[-len(ohlcv):] = np.asarray(ohlcv, dtype=np.float64)[:, column]
+  return matrix
+
+
+def _gains_losses(closes: np.ndarray):
+  changes = np.diff(closes, axis=1)
+  gains = np.where(changes > 0, changes, 0.0)
+  losses = np.where(changes < 0, -changes, 0.0)
+  # 패딩 구간(NaN)은 평균에서 제외
+  missing = np.isnan(changes)
+  gains[missing] = np.nan
+  losses[missing] = np.nan
+  return gains, losses
+
+
+def _rsi(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+  with np.errstate(divide='ignore', invalid='ignore'):
+    rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+  # 하락이 없으면 100
+  return np.where(avg_loss == 0, 100.0, rsi)
+
+
+def rsi_simple(closes: np.ndarray) -> np.ndarray:
+  """
+  단순 평균 RSI (주어진 전체 캔들 구간의 평균 상승/하락폭)
+  :param closes: 심볼 x 캔들 종가 행렬
+  :return: 심볼별 RSI (캔들이 2개 미만이면 NaN)
+  """
+  gains, losses = _gains_losses(closes)
+  with np.errstate(invalid='ignore'):
+    count = np.sum(~np.isnan(gains), axis=1)
+    avg_gain = np.nansum(gains, axis=1) / count
+    avg_loss = np.nansum(losses, axis=1) / count
+  return np.where(count > 0, _rsi(avg_gain, avg_loss), np.nan)
+
+
+def rsi_wilder(closes: np.ndarray, period: int = 14) -> np.ndarray:
+  """
+  Wilder 평활 RSI (첫 period 구간 단순 평균 이후 1/period 지수 평활)
+  :param closes: 심볼 x 캔들 종가 행렬
+  :param period: RSI 기간
+  :return: 심볼별 마지막 캔들 기준 RSI (변동 수가 period 미만이면 NaN)
+  """
+  gains, losses = _gains_losses(closes)
+  symbols = closes.shape[0]
+  count = np.zeros(symbols, dtype=np.int64)
+  avg_gain = np.zeros(symbols)
+  avg_loss = np.zeros(symbols)
+
+  # 캔들 축으로만 순회하고 심볼 축은 한 번에 계산
+  for gain, loss in zip(gains.T, losses.T):
+    valid = ~np.isnan(gain)
+    count += valid
+    seeding = valid & (count <= period)
+    smoothing = valid & (count > period)
+    avg_gain = np.where(seeding, avg_gain + np.where(seeding, gain, 0.0) / period, avg_gain)
+    avg_loss = np.where(seeding, avg_loss + np.where(seeding, loss, 0.0) / period, avg_loss)
+    avg_gain = np.where(smoothing, (avg_gain * (period - 1) + gain) / period, avg_gain)
+    avg_loss = np.where(smoothing, (avg_loss * (period - 1) + loss) / period, avg_loss)
+
+  return np.where(count >= period, _rsi(avg_gain, avg_loss), np.nan)
+
+
+def volume_change(current: np.ndarray, base: np.ndarray) -> np.ndarray:
+  """
+  거래량 증감률 (%)
+  :param current: 현재 거래량
+  :param base: 비교 기준 거래량
+  :return: 증감률 (기준 거래량이 0 이하이면 0)
+  """
+  current = np.asarray(current, dtype=np.float64)
+  base = np.asarray(base, dtype=np.float64)
+  with np.errstate(divide='ignore', invalid='ignore'):
+    change = (current - base) / base * 100
+  return np.where(base > 0, change, 0.0)
+
+
+def returns(closes: np.ndarray, periods: int = 1) -> np.ndarray:
+  """
+  기간 수익률 (%)
+  :param closes: 심볼 x 캔들 종가 행렬
+  :param periods: 비교할 캔들 간격
+  :return: 심볼 x (캔들 - periods) 수익률 행렬
+  """
+  with np.errstate(divide='ignore', invalid='ignore'):
+    return (closes[:, periods:] / closes[:, :-periods] - 1) * 100
@@ -0,0 +1,313 @@
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from collector.session import get_exchange
+from settings.constants import UPBIT_BUY_FEE, UPBIT_SELL_FEE
+
+# 거래소 잔고와 비교하는 기본 주기 (초)
+RECONCILE_INTERVAL = 30.0
+
+# 이 값보다 작은 차이는 드리프트로 보지 않음
+DRIFT_TOLERANCE = 1e-8
+
+# 종료된 주문 상태 (잔여 예약 금액 해제)
+FINAL_STATUSES = ('closed', 'canceled', 'cancelled', 'expired', 'rejected')
+
+# 조회 중 주문이 반영되어 다시 조회하는 최대 횟수 (초과 시 조회 이후 반영분을 더해 적용)
+REFRESH_ATTEMPTS = 3
+
+# 중복 반영 방지용으로 기억하는 종료 주문 수 (오래된 것부터 삭제)
+FINISHED_SIZE = 10000
+
+
+class BalanceLedger:
+  """
+  로컬 잔고 원장
+  주문 결과와 체결을 즉시 반영하여 매매 판단 시 fetch_balance 요청 없이 잔고를 조회하고,
+  백그라운드에서 주기적으로 거래소 잔고와 비교(드리프트 기록) 후 거래소 값으로 맞춘다.
+  """
+  def __init__(self,
+               exchange=None,
+               reconcile_interval: float = RECONCILE_INTERVAL,
+               tolerance: float = DRIFT_TOLERANCE,
+               on_drift: Optional[Callable[[Dict], None]] = None):
+    """
+    :param exchange: ccxt 거래소 인스턴스 (None이면 공유 클라이언트)
+    :param reconcile_interval: 거래소 잔고 비교 주기 (초)
+    :param tolerance: 드리프트로 판단할 최소 차이
+    :param on_drift: 드리프트 발견 시 호출 ({통화: {'free': (로컬, 거래소), 'total': (로컬, 거래소)}})
+    """
+    self.exchange = exchange or get_exchange()
+    self.reconcile_interval = reconcile_interval
+    self.tolerance = tolerance
+    self.on_drift = on_drift
+    self.balances: Dict[str, Dict[str, float]] = {}
+    self.loaded = False
+    self.reconciled_at: Optional[datetime] = None
+    self.last_drift: Dict = {}
+    self.drift_count = 0
+    # 주문 ID별 반영 내역 (예약 잔량, 반영된 체결 수량/금액/수수료)
+    self._orders: Dict[str, Dict] = {}
+    self._finished = set()
+    self._finished_order = deque()
+    # 진행 중인 잔고 조회별 조회 시작 이후 반영된 변화량 {통화: [free, used]}
+    self._journals: List[Dict[str, List[float]]] = []
+    self._version = 0
+    self._lock = threading.RLock()
+    self._stop = threading.Event()
+    self._thread: Optional[threading.Thread] = None
+
+  # 거래소 잔고 동기화
+
+  def refresh(self) -> Dict:
+    """
+    거래소 잔고 조회 후 로컬 원장과 비교하여 교체
+    조회 중 주문이 반영되면 조회 결과에 해당 주문이 없을 수 있으므로 다시 조회하고 (최대 REFRESH_ATTEMPTS 회),
+    계속 반영되면 조회 시작 이후 반영된 변화량을 조회 결과에 더해 적용한다 (매매가 계속되어도 동기화 유지).
+    :return: 드리프트 내역
+    """
+    for attempt in range(REFRESH_ATTEMPTS):
+      journal: Dict[str, List[float]] = {}
+      with self._lock:
+        version = self._version
+        self._journals.append(journal)
+      try:
+        balance = self.exchange.fetch_balance()
+      finally:
+        with self._lock:
+          self._journals.remove(journal)
+      remote = {
+        currency: {
+          'free': float(balance['free'].get(currency) or 0),
+          'used': float(balance['used'].get(currency) or 0),
+          'total': float(total or 0)
+        }
+        for currency, total in balance['total'].items()
+      }
+      with self._lock:
+        if self._version != version:
+          if attempt < REFRESH_ATTEMPTS - 1:
+            continue
+          for currency, (free, used) in journal.items():
+            actual = remote.setdefault(currency, {'free': 0.0, 'used': 0.0, 'total': 0.0})
+            actual['free'] += free
+            actual['used'] += used
+            actual['total'] += free + used
+        drift = self._diff(remote) if self.loaded else {}
+        self.balances = remote
+        self.loaded = True
+        self.reconciled_at = datetime.now()
+        self._version += 1
+        if drift:
+          self.last_drift = drift
+          self.drift_count += 1
+        break
+
+    if drift:
+      print(f"잔고 드리프트 발견: {drift}")
+      if self.on_drift:
+        self.on_drift(drift)
+    return drift
+
+  def _diff(self, remote: Dict) -> Dict:
+    drift = {}
+    for currency in set(remote) | set(self.balances):
+      local = self.balances.get(currency, {})
+      actual = remote.get(currency, {})
+      for key in ('free', 'total'):
+        ours, theirs = local.get(key, 0.0), actual.get(key, 0.0)
+        if abs(ours - theirs) > self.tolerance:
+          drift.setdefault(currency, {})[key] = (ours, theirs)
+    return drift
+
+  def _reconcile_loop(self):
+    while not self._stop.wait(self.reconcile_interval):
+      try:
+        self.refresh()
+      except Exception as e:
+        print(f"잔고 동기화 실패: {str(e)}")
+
+  def start(self):
+    """
+    백그라운드 잔고 동기화 시작
+    """
+    if self._thread is None or not self._thread.is_alive():
+      self._stop.clear()
+      self._thread = threading.Thread(target=self._reconcile_loop, name='balance-ledger', daemon=True)
+      self._thread.start()
+
+  def stop(self):
+    """
+    백그라운드 잔고 동기화 종료
+    """
+    self._stop.set()
+    if self._thread is not None:
+      self._thread.join(timeout=5)
+
+  # 조회
+
+  def ensure_loaded(self):
+    """
+    최초 1회 거래소 잔고 로드 (주문 전에 호출해야 첫 동기화 결과에 주문이 중복 반영되지 않는다)
+    """
+    if not self.loaded:
+      self.refresh()
+
+  def get(self, currency: str) -> Optional[Dict[str, float]]:
+    """
+    통화 잔고 조회 (보유하지 않은 통화면 None)
+    :param currency: 통화 (예: 'KRW', 'BTC')
+    :return: {'free', 'used', 'total'}
+    """
+    self.ensure_loaded()
+    with self._lock:
+      balance = self.balances.get(currency)
+      return dict(balance) if balance is not None else None
+
+  def free(self, currency: str) -> float:
+    """
+    주문 가능 수량 조회
+    :param currency: 통화 (예: 'KRW', 'BTC')
+    """
+    balance = self.get(currency)
+    return balance['free'] if balance else 0.0
+
+  def get_balances(self) -> List[Dict]:
+    """
+    전체 보유 자산 조회 (UpbitAccount.get_balances 와 같은 형식)
+    :return: 보유 자산 목록
+    """
+    self.ensure_loaded()
+    with self._lock:
+      return [
+        {'currency': currency, **balance}
+        for currency, balance in self.balances.items()
+        if balance['total'] > 0
+      ]
+
+  # 주문 반영
+
+  def _add(self, currency: str, free: float = 0.0, used: float = 0.0):
+    balance = self.balances.setdefault(currency, {'free': 0.0, 'used': 0.0, 'total': 0.0})
+    balance['free'] += free
+    balance['used'] += used
+    balance['total'] += free + used
+    for journal in self._journals:
+      delta = journal.setdefault(currency, [0.0, 0.0])
+      delta[0] += free
+      delta[1] += used
+
+  def _finish(self, order_id: str):
+    # 종료 주문 기록 (최근 FINISHED_SIZE 개만 유지)
+    self._finished.add(order_id)
+    self._finished_order.append(order_id)
+    if len(self._finished_order) > FINISHED_SIZE:
+      self._finished.discard(self._finished_order.popleft())
+
+  def adopt_order(self, order: Dict):
+    """
+    거래소 잔고에 이미 반영된 미체결 주문 등록 (원장 로드 전에 생성된 주문 등, 잔고는 변경하지 않음)
+    이후 해당 주문의 체결/취소 결과를 apply_order 로 반영하면 차이만 적용되어 남은 예약분이 해제된다.
+    :param order: ccxt 주문 정보
+    """
+    if not order or not order.get('id') or not order.get('symbol'):
+      return
+    buy = order.get('side') == 'buy'
+    with self._lock:
+      if order['id'] in self._finished or order['id'] in self._orders:
+        return
+      filled = float(order.get('filled') or 0)
+      cost = float(order.get('cost') or filled * float(order.get('average') or 0))
+      fee = order.get('fee') or {}
+      fee_cost = float(fee['cost']) if fee.get('cost') is not None else cost * (UPBIT_BUY_FEE if buy else UPBIT_SELL_FEE)
+      remaining = order.get('remaining')
+      if remaining is None:
+        remaining = max(float(order.get('amount') or 0) - filled, 0.0)
+      price = order.get('price')
+      if buy:
+        # 지정가: 남은 수량 x 가격, 시장가(금액 지정): 주문 금액 중 미체결분 (수수료 포함)
+        reserve = (price * remaining if price and order.get('amount') else max((price or 0.0) - cost, 0.0)) * (1 + UPBIT_BUY_FEE)
+      else:
+        reserve = float(remaining)
+      self._orders[order['id']] = {'reserved': reserve, 'filled': filled, 'cost': cost, 'fee': fee_cost}
+
+  def apply_order(self, order: Dict):
+    """
+    주문 결과(생성/조회/체결 이벤트) 반영
+    같은 주문을 여러 번 반영해도 이전 반영분과의 차이만 적용한다.
+    :param order: ccxt 주문 정보
+    """
+    if not order or not order.get('id') or not order.get('symbol'):
+      return
+    # 주문 반영 전 기준 잔고가 있어야 이후 동기화 시 반영분이 덮어써지지 않는다
+    self.ensure_loaded()
+    order_id = order['id']
+    base, quote = order['symbol'].split('/')
+    buy = order.get('side') == 'buy'
+
+    with self._lock:
+      if order_id in self._finished:
+        return
+      record = self._orders.get(order_id)
+      if record is None:
+        # 신규 주문: 주문 금액(매수, 수수료 포함) 또는 수량(매도)을 예약
+        price, amount = order.get('price'), order.get('amount')
+        if buy:
+          reserve = (price * amount if price and amount else order.get('cost') or price or 0.0) * (1 + UPBIT_BUY_FEE)
+          self._add(quote, free=-reserve, used=reserve)
+        else:
+          reserve = amount or 0.0
+          self._add(base, free=-reserve, used=reserve)
+        record = self._orders[order_id] = {'reserved': reserve, 'filled': 0.0, 'cost': 0.0, 'fee': 0.0}
+
+      filled = float(order.get('filled') or 0)
+      cost = float(order.get('cost') or filled * float(order.get('average') or 0))
+      fee = order.get('fee') or {}
+      if fee.get('cost') is not None:
+        fee_cost = float(fee['cost'])
+      else:
+        fee_cost = cost * (UPBIT_BUY_FEE if buy else UPBIT_SELL_FEE)
+
+      d_filled = filled - record['filled']
+      d_cost = cost - record['cost']
+      d_fee = fee_cost - record['fee']
+      if d_filled or d_cost or d_fee:
+        # 체결분은 예약분에서 먼저 차감하고, 예약을 넘는 부분은 주문 가능 잔고에서 차감
+        spend = d_cost + d_fee if buy else d_filled
+        reserved = min(spend, record['reserved'])
+        record['reserved'] -= reserved
+        self._add(quote if buy else base, free=-(spend - reserved), used=-reserved)
+        if buy:
+          self._add(base, free=d_filled)
+        else:
+          self._add(quote, free=d_cost - d_fee)
+        record.update(filled=filled, cost=cost, fee=fee_cost)
+
+      if order.get('status') in FINAL_STATUSES:
+        # 남은 예약분 해제 (시장가 매수 잔액, 취소된 지정가 주문 등)
+        currency = quote if buy else base
+        leftover = max(record['reserved'], 0.0)
+        self._add(currency, free=leftover, used=-leftover)
+        del self._orders[order_id]
+        self._finish(order_id)
+      self._version += 1
+
+
+_ledgers: Dict[int, BalanceLedger] = {}
+_ledgers_lock = threading.Lock()
+
+
+def get_ledger(exchange=None) -> BalanceLedger:
+  """
+  거래소 클라이언트별 공유 잔고 원장 (최초 조회 시 백그라운드 동기화 시작)
+  :param exchange: ccxt 거래소 인스턴스 (None이면 공유 클라이언트)
+  :return: BalanceLedger
+  """
+  exchange = exchange or get_exchange()
+  with _ledgers_lock:
+    ledger = _ledgers.get(id(exchange))
+    if ledger is None:
+      ledger = _ledgers[id(exchange)] = BalanceLedger(exchange)
+      ledger.start()
+    return ledger
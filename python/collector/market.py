@@ -1,18 +1,208 @@
-import os
-import ccxt
-from dotenv import load_dotenv
+import numpy as np
 from typing import Dict, List, Tuple
 from datetime import datetime, timedelta
+from collector.session import get_exchange
+from collector.batch import fetch_ohlcv_many
+from collector.snapshot import TickerCache, TickerColumns, TICKER_TTL
+from collector.history import TickerHistory, HISTORY_SIZE
+from collector.indicators import CLOSE, VOLUME, ohlcv_matrix, rsi_simple, volume_change
 
-# .env 파일 로드
-load_dotenv()
+def _columns(krw_tickers) -> TickerColumns:
+  return krw_tickers if isinstance(krw_tickers, TickerColumns) else TickerColumns.from_tickers(krw_tickers)
 
-class UpbitMarket:
-  def __init__(self):
-    self.exchange = ccxt.upbit({
-      'apiKey': os.getenv('UPBIT_ACCESS_KEY'),
-      'secret': os.getenv('UPBIT_SECRET_KEY')
+
+def _rank(values: np.ndarray, k: int, descending: bool = True) -> np.ndarray:
+  """
+  상위 k개 인덱스 (전체 정렬 없이 argpartition 으로 후보만 고른 뒤 후보만 정렬)
+  같은 값은 sorted(..., reverse=descending) 와 같은 순서가 되도록 원래 순서로 정렬한다.
+  :param values: 정렬 기준 값
+  :param k: 개수
+  :param descending: True 면 큰 값부터, False 면 작은 값부터 (같은 값은 나중 항목부터)
+  """
+  keys = -values if descending else values
+  if k < len(keys):
+    # k 번째 값과 같은 항목은 모두 후보에 포함 (동률 순서 보존)
+    kth = keys[np.argpartition(keys, k - 1)[k - 1]]
+    candidates = np.flatnonzero(keys <= kth)
+  else:
+    candidates = np.arange(len(keys))
+  ties = candidates if descending else -candidates
+  return candidates[np.lexsort((ties, keys[candidates]))][:k]
+
+
+def analyze_trend(krw_tickers, min_volume_krw: float) -> Dict:
+  """
+  티커 스냅샷으로 시장 동향 계산 (동기/비동기 UpbitMarket 공용)
+  :param krw_tickers: KRW 마켓 티커 {심볼: ticker} 또는 TickerColumns
+  :param min_volume_krw: 최소 거래대금 (KRW)
+  :return: 시장 동향 정보
+  """
+  columns = _columns(krw_tickers)
+  
+  # 최소 거래대금 필터링
+  selected = np.flatnonzero(~(columns.quote_volume < min_volume_krw))
+  changes = columns.change[selected]
+  volumes = columns.quote_volume[selected]
+  
+  # 상승/하락/보합 카운트 (0.5% 이상 상승/하락)
+  up_count = int(np.count_nonzero(changes > 0.5))
+  down_count = int(np.count_nonzero(changes < -0.5))
+  stable_count = len(selected) - up_count - down_count
+  
+  def coins(indexes: np.ndarray, first: str) -> List[Dict]:
+    result = []
+    for i in indexes:
+      coin = {'symbol': columns.symbols[selected[i]]}
+      if first == 'volume':
+        coin.update(volume=float(volumes[i]), change=float(changes[i]))
+      else:
+        coin.update(change=float(changes[i]), volume=float(volumes[i]))
+      coin['price'] = columns.price(selected[i])
+      result.append(coin)
+    return result
+  
+  # 시장 상태 판단
+  total_coins = up_count + down_count + stable_count
+  market_state = "상승" if up_count > down_count else "하락" if down_count > up_count else "보합"
+  
+  return {
+    'market_state': market_state,
+    'statistics': {
+      'total_coins': total_coins,
+      'up_coins': up_count,
+      'down_coins': down_count,
+      'stable_coins': stable_count,
+      'up_ratio': round(up_count / total_coins * 100, 2),
+      'down_ratio': round(down_count / total_coins * 100, 2),
+      'stable_ratio': round(stable_count / total_coins * 100, 2)
+    },
+    # 거래대금/변동률 상위 5개만 부분 선택
+    'volume_top5': coins(_rank(volumes, 5), 'volume'),
+    'change_top5': coins(_rank(changes, 5), 'change'),
+    'change_bottom5': coins(_rank(changes, 5, descending=False), 'change'),
+    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+  }
+
+
+def analyze_dominance(krw_tickers) -> List[Dict]:
+  """
+  티커 스냅샷으로 시가총액 점유율 상위 10개 계산
+  :param krw_tickers: KRW 마켓 티커 {심볼: ticker} 또는 TickerColumns
+  :return: 코인별 시장 지배력 정보
+  """
+  columns = _columns(krw_tickers)
+  
+  # 시가총액 계산 (현재가 * 거래량)
+  market_caps = np.where(np.isnan(columns.last), 0.0, columns.last) * columns.base_volume
+  selected = np.flatnonzero(market_caps > 0)
+  market_caps = market_caps[selected]
+  if not len(market_caps):
+    return []
+  # 순차 합계 (cumsum) 로 기존 누적 방식과 같은 값 유지
+  total_market_cap = np.cumsum(market_caps)[-1]
+  dominance = market_caps / total_market_cap * 100
+  
+  # 상위 10개 후보만 반올림 후 정렬 (반올림 값이 같으면 원래 순서)
+  # 반올림은 단조 증가이므로 10번째 값의 반올림 이상인 항목만 후보가 된다
+  kth = round(float(dominance[_rank(dominance, 10)[-1]]), 2)
+  candidates = np.flatnonzero(dominance >= kth - 0.01)
+  rounded = [round(float(dominance[i]), 2) for i in candidates]
+  order = sorted(range(len(candidates)), key=lambda j: rounded[j], reverse=True)[:10]
+  
+  return [
+    {
+      'symbol': columns.symbols[selected[candidates[j]]],
+      'market_cap': float(market_caps[candidates[j]]),
+      'dominance': rounded[j]
+    }
+    for j in order
+  ]
+
+
+def signal_candidates(krw_tickers: Dict, min_volume_krw: float) -> List[str]:
+  """
+  매매 신호 분석 대상 심볼 선별
+  """
+  # 최소 거래대금 이상인 코인만 분석 대상
+  return [
+    symbol for symbol, ticker in krw_tickers.items()
+    if float(ticker['quoteVolume'] or 0) >= min_volume_krw
+  ]
+
+
+def analyze_signals(krw_tickers: Dict, candidates: List[str], ohlcv_by_symbol: Dict[str, List], recommend_count: int) -> Dict:
+  """
+  티커 스냅샷과 4시간봉으로 매수/매도 추천 코인 선별
+  :param krw_tickers: KRW 마켓 티커 {심볼: ticker}
+  :param candidates: signal_candidates 결과
+  :param ohlcv_by_symbol: {심볼: 4시간봉 OHLCV}
+  :param recommend_count: 추천할 코인 개수
+  :return: 매수/매도 추천 정보
+  """
+  # 캔들이 2개 미만이면 RSI/거래량 비교 불가
+  symbols = [symbol for symbol in candidates if len(ohlcv_by_symbol[symbol]) >= 2]
+  ohlcv_list = [ohlcv_by_symbol[symbol] for symbol in symbols]
+  
+  # 전체 심볼을 심볼 x 캔들 행렬로 한 번에 계산
+  closes = ohlcv_matrix(ohlcv_list, CLOSE)
+  volumes = np.array([float(krw_tickers[symbol]['quoteVolume'] or 0) for symbol in symbols])
+  prev_volumes = np.array([float(ohlcv[-2][VOLUME]) for ohlcv in ohlcv_list])
+  
+  rsi = rsi_simple(closes)
+  # 거래량 증감률 계산 (24시간 전 대비)
+  volume_changes = volume_change(volumes, prev_volumes)
+  
+  # 분석을 위한 코인 데이터 수집
+  coin_data = []
+  for i, symbol in enumerate(symbols):
+    ticker = krw_tickers[symbol]
+    coin_data.append({
+      'symbol': symbol,
+      'price': float(ticker['last'] or 0),
+      'volume': float(volumes[i]),
+      'change_24h': float(ticker['percentage'] or 0),
+      'volume_change': float(volume_changes[i]),
+      'rsi': float(rsi[i])
     })
+  
+  # 매수 추천: RSI 낮고, 거래량 증가, 하락폭 큰 코인
+  buy_signals = sorted(
+    [coin for coin in coin_data if coin['rsi'] < 40 and coin['volume_change'] > 50],
+    key=lambda x: (-x['volume_change'], x['change_24h'])
+  )[:recommend_count]
+  
+  # 매도 추천: RSI 높고, 거래량 증가, 상승폭 큰 코인
+  sell_signals = sorted(
+    [coin for coin in coin_data if coin['rsi'] > 70 and coin['volume_change'] > 50],
+    key=lambda x: (-x['change_24h'], -x['volume_change'])
+  )[:recommend_count]
+  
+  return {
+    'buy_signals': buy_signals,
+    'sell_signals': sell_signals,
+    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+  }
+
+
+def intraday_stats(history: TickerHistory, horizon: float) -> Dict:
+  """
+  티커 기록으로 구간 통계 계산 (동기/비동기 UpbitMarket 공용)
+  """
+  stats = history.stats(horizon)
+  stats['horizon'] = horizon
+  stats['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+  return stats
+
+
+class UpbitMarket:
+  def __init__(self, ticker_ttl: float = TICKER_TTL, history_size: int = HISTORY_SIZE):
+    """
+    :param ticker_ttl: 티커 스냅샷 재사용 시간 (초)
+    :param history_size: 기록할 KRW 마켓 티커 스냅샷 수 (get_intraday_stats 용)
+    """
+    self.exchange = get_exchange()
+    self.history = TickerHistory(history_size)
+    self.tickers = TickerCache(self.exchange, ttl=ticker_ttl, history=self.history)
 
   def get_market_trend(self, timeframe: str = '1d', min_volume_krw: float = 1000000000) -> Dict:
     """
@@ -22,79 +212,10 @@ class UpbitMarket:
     :return: 시장 동향 정보
     """
     try:
-      # KRW 마켓의 모든 티커 조회
-      tickers = self.exchange.fetch_tickers()
-      krw_tickers = {k: v for k, v in tickers.items() if k.endswith('/KRW')}
-      
-      # 상승/하락/보합 카운트
-      up_count = 0
-      down_count = 0
-      stable_count = 0
-      
-      # 거래량 상위 코인 저장
-      volume_ranking = []
-      
-      # 가격 변동률 상/하위 코인 저장
-      change_ranking = []
-      
-      for symbol, ticker in krw_tickers.items():
-        # 최소 거래대금 필터링
-        if float(ticker['quoteVolume'] or 0) < min_volume_krw:
-          continue
-          
-        change_percent = float(ticker['percentage'] or 0)
-        volume_krw = float(ticker['quoteVolume'] or 0)
-        
-        # 상승/하락/보합 카운트
-        if change_percent > 0.5:  # 0.5% 이상 상승
-          up_count += 1
-        elif change_percent < -0.5:  # 0.5% 이상 하락
-          down_count += 1
-        else:
-          stable_count += 1
-          
-        # 거래량 랭킹을 위해 저장
-        volume_ranking.append({
-          'symbol': symbol,
-          'volume': volume_krw,
-          'change': change_percent,
-          'price': ticker['last']
-        })
-        
-        # 가격 변동률 랭킹을 위해 저장
-        change_ranking.append({
-          'symbol': symbol,
-          'change': change_percent,
-          'volume': volume_krw,
-          'price': ticker['last']
-        })
-      
-      # 거래량 기준 정렬
-      volume_ranking.sort(key=lambda x: x['volume'], reverse=True)
-      
-      # 가격 변동률 기준 정렬
-      change_ranking.sort(key=lambda x: x['change'], reverse=True)
+      # KRW 마켓의 모든 티커 조회 (스냅샷 캐시 공유, 열 단위 배열)
+      krw_tickers = self.tickers.get_columns('KRW')
       
-      # 시장 상태 판단
-      total_coins = up_count + down_count + stable_count
-      market_state = "상승" if up_count > down_count else "하락" if down_count > up_count else "보합"
-      
-      return {
-        'market_state': market_state,
-        'statistics': {
-          'total_coins': total_coins,
-          'up_coins': up_count,
-          'down_coins': down_count,
-          'stable_coins': stable_count,
-          'up_ratio': round(up_count / total_coins * 100, 2),
-          'down_ratio': round(down_count / total_coins * 100, 2),
-          'stable_ratio': round(stable_count / total_coins * 100, 2)
-        },
-        'volume_top5': volume_ranking[:5],
-        'change_top5': change_ranking[:5],
-        'change_bottom5': change_ranking[-5:][::-1],
-        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-      }
+      return analyze_trend(krw_tickers, min_volume_krw)
       
     except Exception as e:
       print(f"시장 동향 분석 중 오류 발생: {str(e)}")
@@ -106,32 +227,9 @@ class UpbitMarket:
     :return: 코인별 시장 지배력 정보
     """
     try:
-      tickers = self.exchange.fetch_tickers()
-      krw_tickers = {k: v for k, v in tickers.items() if k.endswith('/KRW')}
-      
-      # 시가총액 계산 (현재가 * 거래량)
-      market_caps = []
-      total_market_cap = 0
-      
-      for symbol, ticker in krw_tickers.items():
-        market_cap = float(ticker['last'] or 0) * float(ticker['baseVolume'] or 0)
-        if market_cap > 0:
-          market_caps.append({
-            'symbol': symbol,
-            'market_cap': market_cap
-          })
-          total_market_cap += market_cap
+      krw_tickers = self.tickers.get_columns('KRW')
       
-      # 시장 지배력 계산 및 정렬
-      dominance = []
-      for coin in market_caps:
-        dominance.append({
-          'symbol': coin['symbol'],
-          'market_cap': coin['market_cap'],
-          'dominance': round(coin['market_cap'] / total_market_cap * 100, 2)
-        })
-      
-      return sorted(dominance, key=lambda x: x['dominance'], reverse=True)[:10]
+      return analyze_dominance(krw_tickers)
       
     except Exception as e:
       print(f"시장 지배력 계산 중 오류 발생: {str(e)}")
@@ -178,80 +276,35 @@ class UpbitMarket:
     :return: 매수/매도 추천 정보
     """
     try:
-      tickers = self.exchange.fetch_tickers()
-      krw_tickers = {k: v for k, v in tickers.items() if k.endswith('/KRW')}
-      
-      # 분석을 위한 코인 데이터 수집
-      coin_data = []
-      for symbol, ticker in krw_tickers.items():
-        volume = float(ticker['quoteVolume'] or 0)
-        if volume < min_volume_krw:
-          continue
-          
-        # 기본 정보 수집
-        change_24h = float(ticker['percentage'] or 0)
-        last_price = float(ticker['last'] or 0)
-        
-        # RSI 계산을 위한 OHLCV 데이터 조회 (4시간 기준)
-        ohlcv = self.exchange.fetch_ohlcv(symbol, '4h', limit=14)
-        if not ohlcv:
-          continue
-          
-        # RSI 계산
-        gains = []
-        losses = []
-        for i in range(1, len(ohlcv)):
-          change = ohlcv[i][4] - ohlcv[i-1][4]  # 종가 기준
-          if change >= 0:
-            gains.append(change)
-            losses.append(0)
-          else:
-            gains.append(0)
-            losses.append(abs(change))
-            
-        avg_gain = sum(gains) / len(gains)
-        avg_loss = sum(losses) / len(losses)
-        
-        if avg_loss == 0:
-          rsi = 100
-        else:
-          rs = avg_gain / avg_loss
-          rsi = 100 - (100 / (1 + rs))
-        
-        # 거래량 증감률 계산 (24시간 전 대비)
-        volume_change = ((volume - float(ohlcv[-2][5])) / float(ohlcv[-2][5])) * 100 if float(ohlcv[-2][5]) > 0 else 0
-        
-        coin_data.append({
-          'symbol': symbol,
-          'price': last_price,
-          'volume': volume,
-          'change_24h': change_24h,
-          'volume_change': volume_change,
-          'rsi': rsi
-        })
+      krw_tickers = self.tickers.get_quote('KRW')
       
-      # 매수 추천: RSI 낮고, 거래량 증가, 하락폭 큰 코인
-      buy_signals = sorted(
-        [coin for coin in coin_data if coin['rsi'] < 40 and coin['volume_change'] > 50],
-        key=lambda x: (-x['volume_change'], x['change_24h'])
-      )[:recommend_count]
+      candidates = signal_candidates(krw_tickers, min_volume_krw)
       
-      # 매도 추천: RSI 높고, 거래량 증가, 상승폭 큰 코인
-      sell_signals = sorted(
-        [coin for coin in coin_data if coin['rsi'] > 70 and coin['volume_change'] > 50],
-        key=lambda x: (-x['change_24h'], -x['volume_change'])
-      )[:recommend_count]
+      # RSI 계산을 위한 OHLCV 데이터 동시 조회 (4시간 기준)
+      ohlcv_by_symbol = fetch_ohlcv_many(self.exchange, candidates, '4h', limit=14)
       
-      return {
-        'buy_signals': buy_signals,
-        'sell_signals': sell_signals,
-        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-      }
+      return analyze_signals(krw_tickers, candidates, ohlcv_by_symbol, recommend_count)
       
     except Exception as e:
       print(f"매매 신호 분석 중 오류 발생: {str(e)}")
       return {}
 
+  def get_intraday_stats(self, horizon: float = 3600) -> Dict:
+    """
+    KRW 마켓 단기 통계 (추가 OHLCV 요청 없이 티커 스냅샷 기록으로 계산)
+    기록은 이 인스턴스가 조회한 스냅샷으로 쌓이므로, 주기적으로 조회할수록 구간이 길고 촘촘해진다.
+    :param horizon: 구간 (초)
+    :return: {'horizon', 'covered', 'snapshots', 'coins': {심볼: {price, return, volume, volume_change, volatility, samples}}, 'timestamp'}
+    """
+    try:
+      # 최신 스냅샷 기록
+      self.tickers.get()
+      return intraday_stats(self.history, horizon)
+      
+    except Exception as e:
+      print(f"단기 통계 계산 중 오류 발생: {str(e)}")
+      return {}
+
   def print_trading_signals(self, recommend_count: int = 5):
     """
     매수/매도 추천 코인 출력
@@ -0,0 +1,174 @@
+import os
+import json
+import time
+import threading
+import weakref
+import ccxt
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 캐시 파일 형식 버전 (형식이 바뀌면 올려서 이전 캐시를 무시)
+CACHE_VERSION = 2
+
+# 마켓 정보 유효 시간 (초, 만료 후에도 갱신 전까지는 기존 정보를 사용)
+MARKETS_TTL = float(os.getenv('MARKET_CACHE_TTL', 6 * 3600))
+
+# 갱신 실패 시 재시도 간격 (초)
+RETRY_INTERVAL = 60.0
+
+DEFAULT_PATH = os.getenv('MARKET_CACHE_PATH', str(Path.home() / '.jnj-coin' / 'markets.json'))
+
+# 마켓 조회 시 유의 종목 등 상세 정보 포함
+MARKET_PARAMS = {'isDetails': 'true'}
+
+
+class MarketCache:
+  """
+  ccxt 마켓 정보(심볼, 정밀도, 주문 제한, 유의 종목)를 디스크에 보관하는 캐시
+  클라이언트 생성 시 캐시를 set_markets 로 적용하여 시작 시 마켓 목록 다운로드를 생략하고,
+  TTL 이 지나면 백그라운드 스레드에서 갱신 후 적용된 모든 클라이언트에 다시 적용한다.
+  """
+  def __init__(self, path: Optional[str] = None, ttl: float = MARKETS_TTL):
+    """
+    :param path: 캐시 파일 경로 (None이면 MARKET_CACHE_PATH 환경변수 또는 ~/.jnj-coin/markets.json)
+    :param ttl: 마켓 정보 유효 시간 (초)
+    """
+    self.path = Path(path or DEFAULT_PATH)
+    self.ttl = ttl
+    self.markets: Optional[List[Dict]] = None
+    self.fetched_at = 0.0
+    self._clients = weakref.WeakSet()
+    self._lock = threading.Lock()
+    self._stop = threading.Event()
+    self._thread: Optional[threading.Thread] = None
+
+  def _stamp(self) -> Dict:
+    return {'version': CACHE_VERSION, 'ccxt': ccxt.__version__}
+
+  def _read(self) -> Optional[Dict]:
+    # 파일이 없거나 손상되었거나 버전(캐시 형식, ccxt)이 다르면 None
+    try:
+      data = json.loads(self.path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+      return None
+    if not isinstance(data, dict) or not data.get('markets'):
+      return None
+    if any(data.get(key) != value for key, value in self._stamp().items()):
+      return None
+    return data
+
+  def load(self) -> Optional[List[Dict]]:
+    """
+    캐시된 마켓 정보 (최초 1회 디스크에서 읽음)
+    :return: fetch_markets 결과 목록 (캐시가 없으면 None)
+    """
+    with self._lock:
+      if self.markets is None:
+        data = self._read()
+        if data is not None:
+          self.markets = data['markets']
+          self.fetched_at = float(data['fetched_at'])
+      return self.markets
+
+  def save(self, markets: List[Dict], fetched_at: float):
+    """
+    디스크에 저장 (임시 파일에 쓴 뒤 교체하여 다른 프로세스가 읽는 중에도 안전)
+    """
+    self.path.parent.mkdir(parents=True, exist_ok=True)
+    temp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+    temp.write_text(json.dumps(dict(self._stamp(), fetched_at=fetched_at, markets=markets)), encoding='utf-8')
+    os.replace(temp, self.path)
+
+  def stale(self) -> bool:
+    return time.time() - self.fetched_at >= self.ttl
+
+  def _set(self, markets: List[Dict], fetched_at: float):
+    with self._lock:
+      self.markets = markets
+      self.fetched_at = fetched_at
+      clients = list(self._clients)
+    for client in clients:
+      client.set_markets(markets)
+
+  def apply(self, exchange) -> bool:
+    """
+    캐시된 마켓 정보를 클라이언트에 적용 (네트워크 없음), 이후 갱신 시에도 함께 적용
+    :param exchange: ccxt 거래소 인스턴스 (동기/비동기)
+    :return: 적용 여부 (캐시가 없으면 False)
+    """
+    markets = self.load()
+    with self._lock:
+      self._clients.add(exchange)
+    if markets is None:
+      return False
+    exchange.set_markets(markets)
+    return True
+
+  def fetch(self, exchange) -> List[Dict]:
+    """
+    거래소에서 마켓 정보를 조회하여 저장하고, 적용된 모든 클라이언트에 반영
+    :param exchange: 조회에 사용할 동기 ccxt 거래소 인스턴스
+    """
+    markets = exchange.fetch_markets(MARKET_PARAMS)
+    fetched_at = time.time()
+    self._set(markets, fetched_at)
+    try:
+      self.save(markets, fetched_at)
+    except OSError as e:
+      print(f"마켓 정보 캐시 저장 실패: {str(e)}")
+    return markets
+
+  def attach(self, exchange):
+    """
+    클라이언트에 마켓 정보 적용 (캐시가 없으면 조회 후 저장) 및 백그라운드 갱신 시작
+    """
+    if not self.apply(exchange):
+      self.fetch(exchange)
+    self.start()
+
+  def start(self):
+    """
+    백그라운드 갱신 스레드 시작 (이미 실행 중이면 무시)
+    """
+    with self._lock:
+      if self._thread is not None and self._thread.is_alive():
+        return
+      self._stop.clear()
+      self._thread = threading.Thread(target=self._run, name='market-refresh', daemon=True)
+      self._thread.start()
+
+  def stop(self):
+    self._stop.set()
+
+  def _run(self):
+    exchange = None
+    while not self._stop.wait(max(0.0, self.fetched_at + self.ttl - time.time())):
+      # 다른 프로세스가 먼저 갱신했으면 디스크의 정보를 사용
+      data = self._read()
+      if data is not None and float(data['fetched_at']) > self.fetched_at and time.time() - float(data['fetched_at']) < self.ttl:
+        self._set(data['markets'], float(data['fetched_at']))
+        continue
+      try:
+        if exchange is None:
+          from collector.session import create_exchange
+          exchange = create_exchange()
+        self.fetch(exchange)
+      except Exception as e:
+        print(f"마켓 정보 갱신 실패: {str(e)}")
+        if self._stop.wait(RETRY_INTERVAL):
+          return
+
+
+_cache: Optional[MarketCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_market_cache() -> MarketCache:
+  """
+  프로세스 전역 마켓 정보 캐시
+  """
+  global _cache
+  with _cache_lock:
+    if _cache is None:
+      _cache = MarketCache()
+    return _cache
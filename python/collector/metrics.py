@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Sequence, Tuple
+
+# 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 지표 HTTP 서버 기본 주소 (기본은 로컬만, 외부 노출은 METRICS_HOST=0.0.0.0 등으로 명시)
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+
+# 지표 이름
+REQUEST_SECONDS = 'upbit_request_seconds'
+REQUEST_ERRORS = 'upbit_request_errors_total'
+REQUEST_RETRIES = 'upbit_request_retries_total'
+RATE_LIMIT_WAIT_SECONDS = 'upbit_rate_limit_wait_seconds'
+TICK_TO_SUBMIT_SECONDS = 'trader_tick_to_submit_seconds'
+SUBMIT_TO_ACK_SECONDS = 'trader_submit_to_ack_seconds'
+TICK_TO_ACK_SECONDS = 'trader_tick_to_ack_seconds'
+
+HELP = {
+  REQUEST_SECONDS: 'Upbit REST 요청 지연 시간 (엔드포인트별)',
+  REQUEST_ERRORS: 'Upbit REST 요청 오류 수 (엔드포인트/오류 종류별)',
+  REQUEST_RETRIES: '429 응답 후 재시도 수 (요청 그룹별)',
+  RATE_LIMIT_WAIT_SECONDS: '요청 제한 버킷 대기 시간 (요청 그룹별)',
+  TICK_TO_SUBMIT_SECONDS: '가격 확인부터 주문 요청까지 (전략별)',
+  SUBMIT_TO_ACK_SECONDS: '주문 요청부터 거래소 응답까지 (전략별)',
+  TICK_TO_ACK_SECONDS: '가격 확인부터 거래소 응답까지 (전략별)',
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict) -> Labels:
+  return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+  pairs = list(labels) + ([extra] if extra else [])
+  if not pairs:
+    return ''
+  escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+  return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+class Histogram:
+  """
+  고정 구간 누적 히스토그램 (관측 1회당 이진 탐색 1번)
+  """
+  __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+  def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+    self.buckets = tuple(buckets)
+    self.counts = [0] * (len(self.buckets) + 1)
+    self.sum = 0.0
+    self.count = 0
+
+  def observe(self, value: float):
+    self.counts[bisect.bisect_left(self.buckets, value)] += 1
+    self.sum += value
+    self.count += 1
+
+  def cumulative(self):
+    total = 0
+    for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+      total += count
+      yield bound, total
+
+  def quantile(self, q: float) -> Optional[float]:
+    """
+    구간 상한 기준 근사 분위수
+    """
+    if not self.count:
+      return None
+    rank = q * self.count
+    for bound, total in self.cumulative():
+      if total >= rank:
+        return bound
+    return float('inf')
+
+
+class MetricsRegistry:
+  """
+  프로세스 내 지표 저장소 (히스토그램, 카운터)
+  잠금 1개로 보호하며, 조회/내보내기 시에만 복사본을 만든다.
+  """
+  def __init__(self):
+    self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+    self.counters: Dict[str, Dict[Labels, float]] = {}
+    self._lock = threading.Lock()
+
+  def observe(self, name: str, value: float, **labels):
+    """
+    히스토그램에 값 기록
+    """
+    key = _labels(labels)
+    with self._lock:
+      series = self.histograms.setdefault(name, {})
+      histogram = series.get(key)
+      if histogram is None:
+        histogram = series[key] = Histogram()
+      histogram.observe(value)
+
+  def inc(self, name: str, amount: float = 1, **labels):
+    """
+    카운터 증가
+    """
+    key = _labels(labels)
+    with self._lock:
+      series = self.counters.setdefault(name, {})
+      series[key] = series.get(key, 0) + amount
+
+  @contextmanager
+  def timer(self, name: str, **labels):
+    """
+    블록 실행 시간을 히스토그램에 기록
+    """
+    start = time.perf_counter()
+    try:
+      yield
+    finally:
+      self.observe(name, time.perf_counter() - start, **labels)
+
+  def merge(self, snapshot: Dict):
+    """
+    다른 프로세스의 지표 스냅샷(snapshot()) 합산
+    :param snapshot: MetricsRegistry.snapshot() 결과
+    """
+    with self._lock:
+      for name, items in snapshot.get('histograms', {}).items():
+        series = self.histograms.setdefault(name, {})
+        for item in items:
+          bounds = sorted((float(bound), total) for bound, total in item['buckets'].items())
+          key = _labels(item['labels'])
+          histogram = series.get(key)
+          if histogram is None:
+            histogram = series[key] = Histogram([bound for bound, _ in bounds[:-1]])
+          previous = 0
+          for i, (_, total) in enumerate(bounds):
+            histogram.counts[i] += total - previous
+            previous = total
+          histogram.sum += item['sum']
+          histogram.count += item['count']
+      for name, items in snapshot.get('counters', {}).items():
+        series = self.counters.setdefault(name, {})
+        for item in items:
+          key = _labels(item['labels'])
+          series[key] = series.get(key, 0) + item['value']
+
+  def reset(self):
+    with self._lock:
+      self.histograms.clear()
+      self.counters.clear()
+
+  def snapshot(self) -> Dict:
+    """
+    JSON 으로 저장 가능한 지표 스냅샷
+    """
+    with self._lock:
+      histograms = {
+        name: [
+          {
+            'labels': dict(labels),
+            'count': histogram.count,
+            'sum': histogram.sum,
+            'p50': histogram.quantile(0.5),
+            'p90': histogram.quantile(0.9),
+            'p99': histogram.quantile(0.99),
+            'buckets': {str(bound): total for bound, total in histogram.cumulative()}
+          }
+          for labels, histogram in series.items()
+        ]
+        for name, series in self.histograms.items()
+      }
+      counters = {
+        name: [{'labels': dict(labels), 'value': value} for labels, value in series.items()]
+        for name, series in self.counters.items()
+      }
+    return {'timestamp': time.time(), 'histograms': histograms, 'counters': counters}
+
+  def to_json(self) -> str:
+    return json.dumps(self.snapshot(), ensure_ascii=False)
+
+  def to_prometheus(self) -> str:
+    """
+    Prometheus 텍스트 형식 (exposition format 0.0.4)
+    """
+    lines = []
+    with self._lock:
+      for name, series in sorted(self.histograms.items()):
+        lines.append(f"# HELP {name} {HELP.get(name, name)}")
+        lines.append(f"# TYPE {name} histogram")
+        for labels, histogram in series.items():
+          for bound, total in histogram.cumulative():
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {total}")
+          lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+          lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+      for name, series in sorted(self.counters.items()):
+        lines.append(f"# HELP {name} {HELP.get(name, name)}")
+        lines.append(f"# TYPE {name} counter")
+        for labels, value in series.items():
+          lines.append(f"{name}{_format_labels(labels)} {value}")
+    return '\n'.join(lines) + '\n'
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+  """
+  프로세스 전역 지표 저장소
+  """
+  return _registry
+
+
+@contextmanager
+def order_latency(strategy: str, observed_at: Optional[float] = None, registry: Optional[MetricsRegistry] = None):
+  """
+  가격 확인 → 주문 요청 → 거래소 응답 지연 기록 (주문 호출을 감싸서 사용)
+  :param strategy: 전략 이름 (지표 라벨)
+  :param observed_at: 주문 판단에 사용한 가격을 받은 시각 (time.perf_counter)
+  """
+  registry = registry or _registry
+  submitted = time.perf_counter()
+  try:
+    yield
+  finally:
+    acked = time.perf_counter()
+    registry.observe(SUBMIT_TO_ACK_SECONDS, acked - submitted, strategy=strategy)
+    if observed_at is not None:
+      registry.observe(TICK_TO_SUBMIT_SECONDS, submitted - observed_at, strategy=strategy)
+      registry.observe(TICK_TO_ACK_SECONDS, acked - observed_at, strategy=strategy)
+
+
+def start_http_server(port: int = 9108, host: Optional[str] = None, registry: Optional[MetricsRegistry] = None) -> ThreadingHTTPServer:
+  """
+  지표 조회 HTTP 서버 시작 (/metrics: Prometheus 텍스트, /metrics.json: JSON 스냅샷)
+  지표에는 전략/주문 정보가 포함되므로 인증 없는 외부 노출은 host 를 지정한 경우에만 한다.
+  :param host: 바인드 주소 (None이면 METRICS_HOST, 기본 127.0.0.1)
+  :return: 서버 (종료 시 shutdown())
+  """
+  registry = registry or _registry
+
+  class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+      if self.path.startswith('/metrics.json'):
+        body, content_type = registry.to_json(), 'application/json; charset=utf-8'
+      elif self.path.startswith('/metrics'):
+        body, content_type = registry.to_prometheus(), 'text/plain; version=0.0.4; charset=utf-8'
+      else:
+        self.send_error(404)
+        return
+      data = body.encode('utf-8')
+      self.send_response(200)
+      self.send_header('Content-Type', content_type)
+      self.send_header('Content-Length', str(len(data)))
+      self.end_headers()
+      self.wfile.write(data)
+
+    def log_message(self, format, *args):
+      pass
+
+  server = ThreadingHTTPServer((host or METRICS_HOST, port), Handler)
+  threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+  return server
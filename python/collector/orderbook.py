@@ -0,0 +1,244 @@
+import numpy as np
+from typing import Dict, Iterable, Optional, Sequence
+
+# 주문 방향: 매수는 매도호가(asks)를, 매도는 매수호가(bids)를 소진한다
+BUY = 'buy'
+SELL = 'sell'
+
+
+def _levels(levels: Optional[Iterable[Sequence[float]]]) -> np.ndarray:
+  array = np.asarray([level[:2] for level in levels or ()], dtype=np.float64)
+  return array.reshape(-1, 2)
+
+
+class OrderBook:
+  """
+  NumPy 배열 기반 호가창
+  bids 는 가격 내림차순, asks 는 가격 오름차순으로 유지하며, 누적 수량/금액은 변경 시에만 다시 계산한다.
+  """
+  def __init__(self,
+               symbol: str,
+               bids: Optional[Iterable[Sequence[float]]] = None,
+               asks: Optional[Iterable[Sequence[float]]] = None,
+               timestamp: Optional[int] = None):
+    """
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :param bids: 매수호가 [[가격, 수량], ...]
+    :param asks: 매도호가 [[가격, 수량], ...]
+    :param timestamp: 호가 시각 (ms)
+    """
+    self.symbol = symbol
+    self.timestamp = timestamp
+    self._sides: Dict[str, np.ndarray] = {}
+    self._cumulative: Dict[str, tuple] = {}
+    self.update(bids or (), asks or (), timestamp)
+
+  @classmethod
+  def from_ccxt(cls, orderbook: Dict) -> 'OrderBook':
+    """
+    ccxt fetch_order_book 결과로 생성
+    """
+    return cls(orderbook.get('symbol'), orderbook['bids'], orderbook['asks'], orderbook.get('timestamp'))
+
+  # 호가 갱신
+
+  def _set(self, side: str, levels: np.ndarray):
+    levels = levels[levels[:, 1] > 0]
+    keys = -levels[:, 0] if side == 'bids' else levels[:, 0]
+    self._sides[side] = levels[np.argsort(keys, kind='stable')]
+    self._cumulative.pop(side, None)
+
+  def update(self,
+             bids: Iterable[Sequence[float]],
+             asks: Iterable[Sequence[float]],
+             timestamp: Optional[int] = None):
+    """
+    스냅샷으로 전체 호가 교체
+    :param bids: 매수호가 [[가격, 수량], ...]
+    :param asks: 매도호가 [[가격, 수량], ...]
+    :param timestamp: 호가 시각 (ms)
+    """
+    self._set('bids', _levels(bids))
+    self._set('asks', _levels(asks))
+    self.timestamp = timestamp
+
+  def apply(self, side: str, price: float, amount: float):
+    """
+    단일 호가 변경 반영 (수량이 0이면 해당 가격 삭제)
+    :param side: 'bids' / 'asks'
+    :param price: 호가
+    :param amount: 변경 후 잔량
+    """
+    levels = self._sides[side]
+    prices = -levels[:, 0] if side == 'bids' else levels[:, 0]
+    key = -price if side == 'bids' else price
+    i = int(np.searchsorted(prices, key))
+    exists = i < len(levels) and prices[i] == key
+    if amount <= 0:
+      if exists:
+        self._sides[side] = np.delete(levels, i, axis=0)
+    elif exists:
+      levels[i, 1] = amount
+    else:
+      self._sides[side] = np.insert(levels, i, (price, amount), axis=0)
+    self._cumulative.pop(side, None)
+
+  def apply_deltas(self,
+                   bids: Iterable[Sequence[float]] = (),
+                   asks: Iterable[Sequence[float]] = (),
+                   timestamp: Optional[int] = None):
+    """
+    여러 호가 변경 반영 [[가격, 변경 후 잔량], ...]
+    """
+    for price, amount in _levels(bids):
+      self.apply('bids', price, amount)
+    for price, amount in _levels(asks):
+      self.apply('asks', price, amount)
+    if timestamp is not None:
+      self.timestamp = timestamp
+
+  def update_from_upbit(self, message: Dict):
+    """
+    Upbit WebSocket/REST orderbook 메시지(orderbook_units)로 전체 호가 교체
+    """
+    units = message['orderbook_units']
+    self.update(
+      [(unit['bid_price'], unit['bid_size']) for unit in units],
+      [(unit['ask_price'], unit['ask_size']) for unit in units],
+      message.get('timestamp')
+    )
+
+  # 조회
+
+  @property
+  def bids(self) -> np.ndarray:
+    return self._sides['bids']
+
+  @property
+  def asks(self) -> np.ndarray:
+    return self._sides['asks']
+
+  @property
+  def best_bid(self) -> Optional[float]:
+    return float(self.bids[0, 0]) if len(self.bids) else None
+
+  @property
+  def best_ask(self) -> Optional[float]:
+    return float(self.asks[0, 0]) if len(self.asks) else None
+
+  @property
+  def mid(self) -> Optional[float]:
+    if self.best_bid is None or self.best_ask is None:
+      return None
+    return (self.best_bid + self.best_ask) / 2
+
+  def spread(self) -> Dict:
+    """
+    최우선 호가 스프레드
+    :return: 매수/매도 최우선 호가, 스프레드(원), 스프레드(% , 중간가 기준)
+    """
+    bid, ask, mid = self.best_bid, self.best_ask, self.mid
+    spread = None if mid is None else ask - bid
+    return {
+      'bid': bid,
+      'ask': ask,
+      'spread': spread,
+      'spread_percent': None if mid is None else spread / mid * 100
+    }
+
+  def _cum(self, side: str):
+    cumulative = self._cumulative.get(side)
+    if cumulative is None:
+      levels = self._sides[side]
+      cumulative = (np.cumsum(levels[:, 1]), np.cumsum(levels[:, 0] * levels[:, 1]))
+      self._cumulative[side] = cumulative
+    return cumulative
+
+  def depth(self, side: str, levels: Optional[int] = None) -> np.ndarray:
+    """
+    누적 호가 잔량
+    :param side: 'bids' / 'asks'
+    :param levels: 상위 호가 개수 (None이면 전체)
+    :return: (n, 3) 배열 [가격, 누적 수량, 누적 금액]
+    """
+    quantity, notional = self._cum(side)
+    prices = self._sides[side][:, 0]
+    return np.column_stack((prices, quantity, notional))[:levels]
+
+  def depth_within(self, side: str, percent: float) -> Dict:
+    """
+    최우선 호가에서 일정 비율 이내의 누적 잔량
+    :param side: 'bids' / 'asks'
+    :param percent: 최우선 호가 대비 범위 (%)
+    :return: 누적 수량, 누적 금액, 호가 수
+    """
+    levels = self._sides[side]
+    if len(levels) == 0:
+      return {'amount': 0.0, 'cost': 0.0, 'levels': 0}
+    best = levels[0, 0]
+    if side == 'bids':
+      count = int(np.searchsorted(-levels[:, 0], -best * (1 - percent / 100), side='right'))
+    else:
+      count = int(np.searchsorted(levels[:, 0], best * (1 + percent / 100), side='right'))
+    quantity, notional = self._cum(side)
+    return {'amount': float(quantity[count - 1]), 'cost': float(notional[count - 1]), 'levels': count}
+
+  def vwap(self, side: str, amount: Optional[float] = None, cost: Optional[float] = None) -> Dict:
+    """
+    시장가 주문 체결 예상 (수량 또는 금액 기준)
+    :param side: 'buy' (매도호가 소진) / 'sell' (매수호가 소진)
+    :param amount: 코인 수량
+    :param cost: KRW 금액 (amount 가 None인 경우)
+    :return: 평균 체결가, 체결 수량, 체결 금액, 소진 호가 수, 전량 체결 여부, 슬리피지(%)
+    """
+    if (amount is None) == (cost is None):
+      raise ValueError("amount 와 cost 중 하나만 지정해야 합니다.")
+    book_side = 'asks' if side == BUY else 'bids'
+    levels = self._sides[book_side]
+    if len(levels) == 0:
+      return {'price': None, 'amount': 0.0, 'cost': 0.0, 'levels': 0, 'complete': False, 'slippage': None}
+
+    prices = levels[:, 0]
+    quantity, notional = self._cum(book_side)
+    target, cumulative = (amount, quantity) if amount is not None else (cost, notional)
+    # 목표를 채우는 첫 호가 위치
+    i = int(np.searchsorted(cumulative, target))
+    if i >= len(levels):
+      filled, spent, count, complete = quantity[-1], notional[-1], len(levels), False
+    else:
+      before_amount = quantity[i - 1] if i else 0.0
+      before_cost = notional[i - 1] if i else 0.0
+      if amount is not None:
+        filled, spent = amount, before_cost + (amount - before_amount) * prices[i]
+      else:
+        filled, spent = before_amount + (cost - before_cost) / prices[i], cost
+      count, complete = i + 1, True
+
+    price = spent / filled if filled else None
+    best = prices[0]
+    slippage = None if price is None else (price - best) / best * 100 * (1 if side == BUY else -1)
+    return {
+      'price': None if price is None else float(price),
+      'amount': float(filled),
+      'cost': float(spent),
+      'levels': count,
+      'complete': complete,
+      'slippage': None if slippage is None else float(slippage)
+    }
+
+  def slippage(self, side: str, amount: Optional[float] = None, cost: Optional[float] = None) -> Optional[float]:
+    """
+    시장가 주문의 최우선 호가 대비 예상 슬리피지 (%)
+    """
+    return self.vwap(side, amount, cost)['slippage']
+
+  def to_dict(self) -> Dict:
+    """
+    기존 get_orderbook 형식 ([[가격, 수량], ...]) 으로 변환
+    """
+    return {
+      'symbol': self.symbol,
+      'timestamp': self.timestamp,
+      'bids': self.bids.tolist(),
+      'asks': self.asks.tolist()
+    }
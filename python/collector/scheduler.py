@@ -0,0 +1,274 @@
+import time
+import heapq
+import itertools
+import threading
+import ccxt
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+from collector.metrics import get_metrics, REQUEST_SECONDS, REQUEST_ERRORS, REQUEST_RETRIES, RATE_LIMIT_WAIT_SECONDS
+
+# Upbit 요청 그룹별 제한 (초당 요청 수)
+# https://docs.upbit.com/kr/reference/rate-limits
+QUOTATION = 'quotation'  # 시세 조회 (IP 단위)
+EXCHANGE = 'exchange'    # 주문 외 계정 요청 (잔고, 주문 조회, 주문 취소 등)
+ORDER = 'order'          # 주문 생성
+
+QUOTATION_RATE = 10
+EXCHANGE_RATE = 30
+ORDER_RATE = 8
+
+GROUP_LIMITS = {
+  QUOTATION: (QUOTATION_RATE, QUOTATION_RATE),
+  EXCHANGE: (EXCHANGE_RATE, EXCHANGE_RATE),
+  ORDER: (ORDER_RATE, ORDER_RATE),
+}
+
+# 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_ORDER = 0      # 주문 생성/취소
+PRIORITY_ACCOUNT = 1    # 잔고/주문 조회
+PRIORITY_DATA = 2       # 시세/분석용 조회
+
+# 429 응답 시 재시도
+MAX_RETRIES = 3
+RETRY_DELAY = 0.5
+
+
+class TokenBucket:
+  """
+  우선순위 대기열을 가진 스레드 안전 토큰 버킷
+  토큰이 부족하면 우선순위가 높은(숫자가 작은) 요청부터, 같은 우선순위는 도착 순으로 처리한다.
+  """
+  def __init__(self, rate: float, burst: int):
+    """
+    :param rate: 초당 충전되는 토큰 수
+    :param burst: 최대 누적 토큰 수
+    """
+    self.rate = rate
+    self.burst = burst
+    self.tokens = float(burst)
+    self.updated = time.monotonic()
+    self._cond = threading.Condition()
+    self._waiters = []
+    self._seq = itertools.count()
+    # 우선순위별 [요청 수, 총 대기 시간, 최대 대기 시간]
+    self._waits: Dict[int, list] = {}
+
+  def _refill(self, now: float):
+    self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+    self.updated = now
+
+  def acquire(self, priority: int = PRIORITY_DATA, tokens: float = 1) -> float:
+    """
+    토큰을 얻을 때까지 대기
+    :param priority: 우선순위 (PRIORITY_ORDER, PRIORITY_ACCOUNT, PRIORITY_DATA)
+    :param tokens: 필요한 토큰 수
+    :return: 대기 시간 (초)
+    """
+    start = time.monotonic()
+    with self._cond:
+      entry = (priority, next(self._seq))
+      heapq.heappush(self._waiters, entry)
+      try:
+        while True:
+          now = time.monotonic()
+          self._refill(now)
+          if self._waiters[0] == entry and self.tokens >= tokens:
+            self.tokens -= tokens
+            break
+          timeout = None
+          if self._waiters[0] == entry:
+            timeout = (tokens - self.tokens) / self.rate
+          self._cond.wait(timeout)
+      finally:
+        if self._waiters[0] == entry:
+          heapq.heappop(self._waiters)
+        else:
+          self._waiters.remove(entry)
+          heapq.heapify(self._waiters)
+        self._cond.notify_all()
+
+    waited = time.monotonic() - start
+    with self._cond:
+      stats = self._waits.setdefault(priority, [0, 0.0, 0.0])
+      stats[0] += 1
+      stats[1] += waited
+      stats[2] = max(stats[2], waited)
+    return waited
+
+  def set_limit(self, rate: float, burst: int):
+    """
+    충전 속도와 최대 누적 변경 (대기 중인 요청에도 즉시 적용)
+    """
+    with self._cond:
+      self._refill(time.monotonic())
+      self.rate = rate
+      self.burst = burst
+      self.tokens = min(self.tokens, burst)
+      self._cond.notify_all()
+
+  def metrics(self) -> Dict:
+    """
+    대기열 길이와 우선순위별 대기 시간 통계
+    """
+    with self._cond:
+      depth: Dict[int, int] = {}
+      for priority, _ in self._waiters:
+        depth[priority] = depth.get(priority, 0) + 1
+      return {
+        'tokens': round(self.tokens, 3),
+        'queue_depth': len(self._waiters),
+        'queue_depth_by_priority': depth,
+        'wait': {
+          priority: {
+            'count': count,
+            'avg_ms': total / count * 1000 if count else 0.0,
+            'max_ms': longest * 1000
+          }
+          for priority, (count, total, longest) in self._waits.items()
+        }
+      }
+
+
+class RequestScheduler:
+  """
+  Upbit 요청 그룹(quotation/exchange/order)별 토큰 버킷과 우선순위 대기열
+  """
+  def __init__(self, limits: Optional[Dict[str, Tuple[float, int]]] = None):
+    """
+    :param limits: {그룹: (초당 요청 수, 최대 누적)} (None이면 GROUP_LIMITS)
+    """
+    self.buckets = {group: TokenBucket(rate, burst) for group, (rate, burst) in (limits or GROUP_LIMITS).items()}
+    self.retries: Dict[str, int] = {group: 0 for group in self.buckets}
+    self._local = threading.local()
+
+  def limits(self) -> Dict[str, Tuple[float, int]]:
+    """
+    현재 그룹별 제한 {그룹: (초당 요청 수, 최대 누적)}
+    """
+    return {group: (bucket.rate, bucket.burst) for group, bucket in self.buckets.items()}
+
+  def set_limits(self, limits: Dict[str, Tuple[float, int]]):
+    """
+    그룹별 제한 변경 (이미 생성된 클라이언트에도 적용)
+    """
+    for group, (rate, burst) in limits.items():
+      self.buckets[group].set_limit(rate, burst)
+
+  @contextmanager
+  def priority(self, priority: int):
+    """
+    현재 스레드의 요청 우선순위 지정 (예: 트레이더의 시세 조회를 분석보다 먼저 처리)
+    """
+    previous = getattr(self._local, 'priority', None)
+    self._local.priority = priority
+    try:
+      yield
+    finally:
+      self._local.priority = previous
+
+  def acquire(self, group: str, priority: int) -> float:
+    """
+    그룹 토큰 획득 (스레드에 지정된 우선순위가 더 높으면 그 값을 사용)
+    :return: 대기 시간 (초)
+    """
+    override = getattr(self._local, 'priority', None)
+    if override is not None:
+      priority = min(priority, override)
+    return self.buckets[group].acquire(priority)
+
+  def metrics(self) -> Dict:
+    """
+    그룹별 대기열 길이, 대기 시간, 재시도 횟수
+    """
+    return {
+      group: dict(bucket.metrics(), retries=self.retries[group])
+      for group, bucket in self.buckets.items()
+    }
+
+
+def classify(api, method: str, path: str) -> Tuple[str, int]:
+  """
+  ccxt 요청을 Upbit 요청 그룹과 우선순위로 분류
+  :param api: ccxt api 종류 ('public' / 'private')
+  :param method: HTTP 메소드
+  :param path: 엔드포인트 경로
+  :return: (그룹, 우선순위)
+  """
+  if api == 'public':
+    return QUOTATION, PRIORITY_DATA
+  if method == 'POST' and path.startswith('orders'):
+    return ORDER, PRIORITY_ORDER
+  if method == 'DELETE' and path.startswith('order'):
+    return EXCHANGE, PRIORITY_ORDER
+  return EXCHANGE, PRIORITY_ACCOUNT
+
+
+_scheduler: Optional[RequestScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RequestScheduler:
+  """
+  프로세스 전역 요청 스케줄러
+  """
+  global _scheduler
+  with _scheduler_lock:
+    if _scheduler is None:
+      _scheduler = RequestScheduler()
+    return _scheduler
+
+
+def share_limits(processes: int, limits: Optional[Dict[str, Tuple[float, int]]] = None) -> Dict[str, Tuple[float, int]]:
+  """
+  여러 프로세스가 같은 IP/계정으로 요청할 때 프로세스별 제한 (전체 제한을 균등 분할)
+  :param processes: 프로세스 수
+  :param limits: 전체 제한 (None이면 GROUP_LIMITS)
+  """
+  return {
+    group: (rate / processes, max(1, burst // processes))
+    for group, (rate, burst) in (limits or GROUP_LIMITS).items()
+  }
+
+
+def set_scheduler(scheduler: RequestScheduler):
+  """
+  프로세스 전역 요청 스케줄러 교체 (이후 생성되는 클라이언트부터 적용)
+  """
+  global _scheduler
+  with _scheduler_lock:
+    _scheduler = scheduler
+
+
+class ScheduledUpbit(ccxt.upbit):
+  """
+  모든 REST 요청을 RequestScheduler 를 거쳐 보내는 ccxt.upbit
+  ccxt 자체 rate limit(인스턴스 단위 순차 대기)은 끄고 그룹별 버킷으로 대체한다.
+  """
+  def __init__(self, config: Optional[Dict] = None, scheduler: Optional[RequestScheduler] = None):
+    config = dict(config or {})
+    config['enableRateLimit'] = False
+    super().__init__(config)
+    self.scheduler = scheduler or get_scheduler()
+    self.metrics = get_metrics()
+
+  def fetch2(self, path, api='public', method='GET', params={}, headers=None, body=None, config={}):
+    group, priority = classify(api, method, path)
+    endpoint = f"{method} {path}"
+    for attempt in range(MAX_RETRIES + 1):
+      self.metrics.observe(RATE_LIMIT_WAIT_SECONDS, self.scheduler.acquire(group, priority), group=group)
+      start = time.perf_counter()
+      try:
+        return super().fetch2(path, api, method, params, headers, body, config)
+      except (ccxt.DDoSProtection, ccxt.RateLimitExceeded) as e:
+        self.metrics.inc(REQUEST_ERRORS, endpoint=endpoint, error=type(e).__name__)
+        # 429: 잠시 대기 후 재시도
+        if attempt == MAX_RETRIES:
+          raise
+        self.scheduler.retries[group] += 1
+        self.metrics.inc(REQUEST_RETRIES, group=group)
+        time.sleep(RETRY_DELAY * (2 ** attempt))
+      except Exception as e:
+        self.metrics.inc(REQUEST_ERRORS, endpoint=endpoint, error=type(e).__name__)
+        raise
+      finally:
+        self.metrics.observe(REQUEST_SECONDS, time.perf_counter() - start, endpoint=endpoint)
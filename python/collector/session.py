@@ -0,0 +1,100 @@
+import os
+import threading
+import ccxt
+from dotenv import load_dotenv
+from collector.scheduler import ScheduledUpbit
+from collector.markets import get_market_cache
+from requests.adapters import HTTPAdapter
+from typing import Dict, Optional, Tuple
+
+# .env 파일 로드
+load_dotenv()
+
+# 동시 요청(심볼별 OHLCV 조회 등)에 대비한 커넥션 풀 크기
+POOL_SIZE = 32
+
+_lock = threading.Lock()
+_exchanges: Dict[Tuple[str, str], ccxt.upbit] = {}
+_key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+
+def create_exchange(api_key: Optional[str] = None, secret: Optional[str] = None) -> ccxt.upbit:
+  """
+  keep-alive 커넥션 풀을 가진 Upbit 클라이언트 생성 (마켓 정보는 로드하지 않음)
+  요청 제한은 공유 RequestScheduler 의 그룹별 버킷으로 처리한다.
+  :param api_key: Upbit Access Key
+  :param secret: Upbit Secret Key
+  :return: ccxt.upbit 인스턴스
+  """
+  exchange = ScheduledUpbit({
+    'apiKey': api_key,
+    'secret': secret,
+  })
+  # requests.Session 은 기본적으로 keep-alive 이지만 풀 크기가 10 이므로 확장
+  adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+  exchange.session.mount('https://', adapter)
+  exchange.session.headers.update({'Connection': 'keep-alive'})
+  return exchange
+
+
+def get_exchange(api_key: Optional[str] = None, secret: Optional[str] = None) -> ccxt.upbit:
+  """
+  프로세스 전역에서 공유하는 Upbit 클라이언트 조회 (API 키당 1개)
+  최초 생성 시 디스크에 캐시된 마켓 정보를 적용하고, 캐시가 없을 때만 거래소에서 조회한다.
+  :param api_key: Upbit Access Key (None이면 UPBIT_ACCESS_KEY 환경변수)
+  :param secret: Upbit Secret Key (None이면 UPBIT_SECRET_KEY 환경변수)
+  :return: 공유 ccxt.upbit 인스턴스
+  """
+  if api_key is None:
+    api_key = os.getenv('UPBIT_ACCESS_KEY')
+  if secret is None:
+    secret = os.getenv('UPBIT_SECRET_KEY')
+  key = (api_key or '', secret or '')
+
+  exchange = _exchanges.get(key)
+  if exchange is not None:
+    return exchange
+
+  with _lock:
+    key_lock = _key_locks.setdefault(key, threading.Lock())
+
+  # 같은 키로 동시에 요청해도 클라이언트 생성과 마켓 로드는 한 번만 수행
+  with key_lock:
+    exchange = _exchanges.get(key)
+    if exchange is None:
+      exchange = create_exchange(api_key, secret)
+      try:
+        get_market_cache().attach(exchange)
+      except Exception as e:
+        print(f"마켓 정보 로드 실패: {str(e)}")
+      _exchanges[key] = exchange
+  return exchange
+
+
+def register_exchange(exchange, api_key: Optional[str] = None, secret: Optional[str] = None):
+  """
+  공유 클라이언트 교체 (벤치마크/시뮬레이터용 가짜 거래소 주입)
+  이후 생성되는 UpbitMarket, UpbitChart, UpbitTrader 등은 이 인스턴스를 사용한다.
+  :param exchange: ccxt.upbit 와 같은 메소드를 가진 거래소 인스턴스
+  :param api_key: 대상 API 키 (None이면 UPBIT_ACCESS_KEY 환경변수)
+  :param secret: 대상 Secret 키 (None이면 UPBIT_SECRET_KEY 환경변수)
+  """
+  if api_key is None:
+    api_key = os.getenv('UPBIT_ACCESS_KEY')
+  if secret is None:
+    secret = os.getenv('UPBIT_SECRET_KEY')
+  with _lock:
+    _exchanges[(api_key or '', secret or '')] = exchange
+
+
+def reset_exchanges():
+  """
+  공유 클라이언트 전체 제거 (벤치마크/재인증 용도)
+  """
+  with _lock:
+    for exchange in _exchanges.values():
+      session = getattr(exchange, 'session', None)
+      if session is not None:
+        session.close()
+    _exchanges.clear()
+    _key_locks.clear()
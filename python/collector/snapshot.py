@@ -0,0 +1,160 @@
+import time
+import threading
+import numpy as np
+from typing import Dict, List, Optional
+
+# 기본 티커 스냅샷 유효 시간 (초)
+TICKER_TTL = 3.0
+
+
+class TickerColumns:
+  """
+  티커 스냅샷의 열 단위 배열 (시장 분석을 심볼별 dict 순회 없이 벡터 연산으로 계산)
+  값이 None 인 항목은 0 으로 저장한다 (분석 함수의 `float(value or 0)` 과 동일). 단, last 는 NaN 으로 남겨 원래 값을 복원한다.
+  """
+  __slots__ = ('symbols', 'last', 'change', 'quote_volume', 'base_volume')
+
+  def __init__(self, symbols: List[str], last: np.ndarray, change: np.ndarray, quote_volume: np.ndarray, base_volume: np.ndarray):
+    self.symbols = symbols
+    self.last = last
+    self.change = change
+    self.quote_volume = quote_volume
+    self.base_volume = base_volume
+
+  @classmethod
+  def from_tickers(cls, tickers: Dict[str, Dict]) -> 'TickerColumns':
+    """
+    :param tickers: {심볼: ticker} (fetch_tickers 결과)
+    """
+    values = np.array(
+      [(t['last'], t['percentage'], t['quoteVolume'], t['baseVolume']) for t in tickers.values()],
+      dtype=np.float64
+    ).reshape(-1, 4)
+    last = values[:, 0]
+    rest = np.where(np.isnan(values[:, 1:]), 0.0, values[:, 1:])
+    return cls(list(tickers), last, rest[:, 0], rest[:, 1], rest[:, 2])
+
+  def __len__(self) -> int:
+    return len(self.symbols)
+
+  def price(self, i: int) -> Optional[float]:
+    """
+    i 번째 심볼의 현재가 (None 이었으면 None)
+    """
+    value = self.last[i]
+    return None if np.isnan(value) else float(value)
+
+
+class TickerCache:
+  """
+  fetch_tickers 결과를 TTL 동안 공유하는 스냅샷 캐시
+  동시에 여러 스레드가 요청해도 다운로드는 한 번만 수행한다 (single-flight).
+  """
+  def __init__(self, exchange, ttl: float = TICKER_TTL, history=None):
+    """
+    :param exchange: ccxt 거래소 인스턴스
+    :param ttl: 스냅샷 유효 시간 (초)
+    :param history: 새 스냅샷을 기록할 TickerHistory (None이면 기록 안 함)
+    """
+    self.exchange = exchange
+    self.ttl = ttl
+    self.history = history
+    self.tickers: Optional[Dict] = None
+    self.fetched_at = 0.0
+    self._by_quote: Dict[str, Dict] = {}
+    self._columns: Dict[str, TickerColumns] = {}
+    self._fetching = False
+    self._error: Optional[Exception] = None
+    self._result: Optional[Dict] = None
+    self._generation = 0
+    self._cond = threading.Condition()
+
+  def _fresh(self) -> bool:
+    return self.tickers is not None and time.monotonic() - self.fetched_at < self.ttl
+
+  def get(self) -> Dict:
+    """
+    전체 티커 스냅샷 조회 (만료 시 재다운로드)
+    :return: {심볼: ticker}
+    """
+    with self._cond:
+      if self._fresh():
+        return self.tickers
+      if self._fetching:
+        # 진행 중인 다운로드 결과를 기다림
+        generation = self._generation
+        while self._fetching and generation == self._generation:
+          self._cond.wait()
+        if self._error is not None:
+          raise self._error
+        return self._result
+      self._fetching = True
+
+    tickers, error = None, None
+    try:
+      tickers = self.exchange.fetch_tickers()
+    except Exception as e:
+      error = e
+
+    with self._cond:
+      self._fetching = False
+      self._generation += 1
+      self._error = error
+      self._result = tickers
+      if error is None:
+        self.tickers = tickers
+        self.fetched_at = time.monotonic()
+        self._by_quote = {}
+        self._columns = {}
+      self._cond.notify_all()
+
+    if error is not None:
+      raise error
+    if self.history is not None:
+      self.history.record(tickers, self.exchange.milliseconds() / 1000)
+    return tickers
+
+  def _filter(self, tickers: Dict, quote: str) -> Dict:
+    # 같은 스냅샷에서 특정 마켓만 추출 (현재 스냅샷이면 결과 재사용)
+    with self._cond:
+      if tickers is self.tickers and quote in self._by_quote:
+        return self._by_quote[quote]
+    suffix = f"/{quote}"
+    filtered = {k: v for k, v in tickers.items() if k.endswith(suffix)}
+    with self._cond:
+      if tickers is self.tickers:
+        self._by_quote[quote] = filtered
+    return filtered
+
+  def get_quote(self, quote: str = 'KRW') -> Dict:
+    """
+    특정 마켓(예: KRW)의 티커 스냅샷 조회
+    :param quote: 호가 통화
+    :return: {심볼: ticker}
+    """
+    return self._filter(self.get(), quote)
+
+  def get_columns(self, quote: str = 'KRW') -> TickerColumns:
+    """
+    특정 마켓의 티커 스냅샷을 열 단위 배열로 조회 (스냅샷당 1회 변환)
+    :param quote: 호가 통화
+    """
+    tickers = self.get()
+    with self._cond:
+      if tickers is self.tickers and quote in self._columns:
+        return self._columns[quote]
+    columns = TickerColumns.from_tickers(self._filter(tickers, quote))
+    with self._cond:
+      if tickers is self.tickers:
+        self._columns[quote] = columns
+    return columns
+
+  def invalidate(self):
+    """
+    스냅샷 만료 처리 (다음 조회 시 재다운로드)
+    """
+    with self._cond:
+      self.tickers = None
+      self.fetched_at = 0.0
+      self._by_quote = {}
+      self._columns = {}
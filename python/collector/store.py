@@ -0,0 +1,132 @@
+import os
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# 캔들 1개 = [timestamp, open, high, low, close, volume] float64
+COLUMNS = 6
+ROW_BYTES = COLUMNS * 8
+
+DEFAULT_ROOT = os.getenv('CANDLE_STORE_DIR', str(Path.home() / '.jnj-coin' / 'candles'))
+
+_UNIT_MS = {'s': 1000, 'm': 60000, 'h': 3600000, 'd': 86400000, 'w': 604800000, 'M': 2592000000}
+
+
+def timeframe_ms(timeframe: str) -> int:
+  """
+  시간단위 문자열을 밀리초로 변환 ('4h' -> 14400000)
+  """
+  return int(timeframe[:-1]) * _UNIT_MS[timeframe[-1]]
+
+
+class CandleStore:
+  """
+  심볼/시간단위별 캔들을 memory-mapped float64 파일로 보관하는 로컬 저장소
+  파일은 timestamp 오름차순, 중복 없이 유지되며 읽기는 복사 없이 memmap 을 반환한다.
+  """
+  def __init__(self, root: Optional[str] = None):
+    """
+    :param root: 저장 디렉토리 (None이면 CANDLE_STORE_DIR 환경변수 또는 ~/.jnj-coin/candles)
+    """
+    self.root = Path(root or DEFAULT_ROOT)
+    self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+    self._locks_guard = threading.Lock()
+
+  def path(self, symbol: str, timeframe: str) -> Path:
+    return self.root / symbol.replace('/', '-') / f"{timeframe}.f8"
+
+  def _lock(self, symbol: str, timeframe: str) -> threading.Lock:
+    with self._locks_guard:
+      return self._locks.setdefault((symbol, timeframe), threading.Lock())
+
+  def read(self, symbol: str, timeframe: str) -> np.ndarray:
+    """
+    저장된 캔들 전체 조회 (복사 없는 읽기 전용 memmap)
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :param timeframe: 시간단위 ('1m', '1h', '1d' 등)
+    :return: (캔들 수, 6) 배열
+    """
+    path = self.path(symbol, timeframe)
+    if not path.exists():
+      return np.empty((0, COLUMNS))
+    rows = path.stat().st_size // ROW_BYTES
+    if rows == 0:
+      return np.empty((0, COLUMNS))
+    return np.memmap(path, dtype=np.float64, mode='r', shape=(rows, COLUMNS))
+
+  def read_range(self, symbol: str, timeframe: str, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+    """
+    기간 내 캔들 조회 (start <= timestamp < end, 복사 없는 슬라이스)
+    :param start: 시작 timestamp (ms)
+    :param end: 종료 timestamp (ms)
+    """
+    candles = self.read(symbol, timeframe)
+    timestamps = candles[:, 0]
+    lo = 0 if start is None else np.searchsorted(timestamps, start, side='left')
+    hi = len(candles) if end is None else np.searchsorted(timestamps, end, side='left')
+    return candles[lo:hi]
+
+  def last_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
+    candles = self.read(symbol, timeframe)
+    return int(candles[-1, 0]) if len(candles) else None
+
+  def write(self, symbol: str, timeframe: str, candles) -> int:
+    """
+    캔들 저장 (같은 timestamp 는 새 값으로 덮어씀)
+    뒤쪽에 이어지는 캔들은 파일 끝에 추가하고, 겹치거나 앞쪽이면 병합 후 교체한다.
+    :param candles: ccxt OHLCV 목록 또는 (n, 6) 배열
+    :return: 저장 후 캔들 수
+    """
+    new = np.asarray(candles, dtype=np.float64).reshape(-1, COLUMNS)
+    path = self.path(symbol, timeframe)
+    with self._lock(symbol, timeframe):
+      if len(new) == 0:
+        return len(self.read(symbol, timeframe))
+      new = _dedupe(new)
+      existing = self.read(symbol, timeframe)
+      path.parent.mkdir(parents=True, exist_ok=True)
+
+      if len(existing) == 0 or new[0, 0] > existing[-1, 0]:
+        with open(path, 'ab') as file:
+          file.write(new.tobytes())
+        return len(existing) + len(new)
+
+      start = int(np.searchsorted(existing[:, 0], new[0, 0]))
+      if start > 0:
+        # 뒤쪽 일부만 겹치면 겹치는 위치부터 다시 씀 (진행 중인 최신 캔들 갱신 시 전체 파일 재작성 방지)
+        # 병합 결과는 기존 뒤쪽보다 짧아지지 않으므로 파일을 줄일 필요가 없다.
+        tail = _dedupe(np.concatenate([existing[start:], new]))
+        del existing
+        with open(path, 'r+b') as file:
+          file.seek(start * ROW_BYTES)
+          file.write(tail.tobytes())
+        return start + len(tail)
+
+      merged = _dedupe(np.concatenate([existing, new]))
+      tmp = path.with_suffix('.tmp')
+      with open(tmp, 'wb') as file:
+        file.write(merged.tobytes())
+      os.replace(tmp, path)
+      return len(merged)
+
+  def gaps(self, symbol: str, timeframe: str, start: Optional[int] = None, end: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    저장된 캔들 사이의 빈 구간 조회
+    :return: [(빈 구간 시작 ms, 빈 구간 끝 ms), ...] (끝은 다음 캔들 timestamp)
+    """
+    step = timeframe_ms(timeframe)
+    timestamps = self.read_range(symbol, timeframe, start, end)[:, 0]
+    if len(timestamps) < 2:
+      return []
+    diffs = np.diff(timestamps)
+    idx = np.nonzero(diffs > step)[0]
+    return [(int(timestamps[i]) + step, int(timestamps[i + 1])) for i in idx]
+
+
+def _dedupe(candles: np.ndarray) -> np.ndarray:
+  # timestamp 기준 정렬 후 중복은 마지막(최신) 값을 유지
+  order = np.argsort(candles[:, 0], kind='stable')
+  candles = candles[order]
+  keep = np.append(candles[1:, 0] != candles[:-1, 0], True)
+  return candles[keep]
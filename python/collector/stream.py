@@ -0,0 +1,287 @@
+import json
+import time
+import uuid
+import asyncio
+import threading
+import websockets
+from contextlib import nullcontext
+from typing import Dict, Iterable, List, Optional
+from collector.scheduler import PRIORITY_ACCOUNT
+from collector.orderbook import OrderBook
+
+UPBIT_WS_URL = 'wss://api.upbit.com/websocket/v1'
+
+# 연결이 끊긴 동안 마지막 가격을 계속 사용할 수 있는 최대 시간 (초)
+MAX_PRICE_AGE = 10.0
+
+
+class StalePriceError(TimeoutError):
+  """
+  스트림 연결이 끊긴 채 마지막 가격이 너무 오래되었을 때 발생 (멈춘 가격으로 매매하지 않도록)
+  """
+
+
+def to_market_code(symbol: str) -> str:
+  """
+  ccxt 심볼을 Upbit 마켓 코드로 변환 ('BTC/KRW' -> 'KRW-BTC')
+  """
+  base, quote = symbol.split('/')
+  return f"{quote}-{base}"
+
+
+def from_market_code(code: str) -> str:
+  """
+  Upbit 마켓 코드를 ccxt 심볼로 변환 ('KRW-BTC' -> 'BTC/KRW')
+  """
+  quote, base = code.split('-')
+  return f"{base}/{quote}"
+
+
+class PollingPriceSource:
+  """
+  fetch_ticker 폴링 기반 가격 소스 (기존 방식)
+  """
+  def __init__(self, exchange, sleep=time.sleep):
+    """
+    :param exchange: ccxt 거래소 인스턴스
+    :param sleep: 대기 함수 (가상 시계 등으로 교체 가능)
+    """
+    self.exchange = exchange
+    self.sleep = sleep
+
+  def subscribe(self, symbols: Iterable[str]):
+    pass
+
+  def _priority(self):
+    # 매매 루프의 시세 조회는 분석용 조회보다 먼저 처리
+    scheduler = getattr(self.exchange, 'scheduler', None)
+    return scheduler.priority(PRIORITY_ACCOUNT) if scheduler else nullcontext()
+
+  def get_price(self, symbol: str) -> float:
+    """
+    현재가 조회
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :return: 최근 체결가
+    """
+    with self._priority():
+      return self.exchange.fetch_ticker(symbol)['last']
+
+  def get_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+    """
+    여러 거래쌍의 현재가를 한 번의 요청으로 조회
+    :param symbols: 거래쌍 목록
+    :return: {심볼: 최근 체결가}
+    """
+    with self._priority():
+      tickers = self.exchange.fetch_tickers(list(symbols))
+    return {symbol: ticker['last'] for symbol, ticker in tickers.items()}
+
+  def wait(self, symbol: str, timeout: float):
+    """
+    다음 가격 확인까지 대기
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :param timeout: 최대 대기 시간 (초)
+    """
+    self.sleep(timeout)
+
+  def wait_any(self, timeout: float):
+    """
+    다음 가격 확인까지 대기 (전체 거래쌍)
+    :param timeout: 최대 대기 시간 (초)
+    """
+    self.sleep(timeout)
+
+  def close(self):
+    pass
+
+
+class UpbitPriceStream:
+  """
+  Upbit WebSocket(ticker/trade) 기반 실시간 가격 소스
+  백그라운드 스레드에서 수신하며 연결이 끊기면 재연결 후 구독을 다시 요청한다.
+  """
+  def __init__(self,
+               symbols: Iterable[str] = (),
+               url: str = UPBIT_WS_URL,
+               types: Iterable[str] = ('ticker', 'trade'),
+               first_price_timeout: float = 5.0,
+               reconnect_delay: float = 1.0,
+               max_reconnect_delay: float = 30.0,
+               max_price_age: float = MAX_PRICE_AGE):
+    """
+    :param symbols: 초기 구독 거래쌍 목록
+    :param url: WebSocket 주소 (로컬 재생 서버로 교체 가능)
+    :param types: 구독할 메시지 종류 ('ticker', 'trade', 'orderbook')
+    :param first_price_timeout: 첫 가격 수신 대기 시간 (초)
+    :param reconnect_delay: 최초 재연결 대기 시간 (초)
+    :param max_reconnect_delay: 최대 재연결 대기 시간 (초)
+    :param max_price_age: 연결이 끊긴 동안 마지막 가격/호가를 사용할 수 있는 최대 시간 (초)
+    """
+    self.url = url
+    self.types = list(types)
+    self.first_price_timeout = first_price_timeout
+    self.reconnect_delay = reconnect_delay
+    self.max_reconnect_delay = max_reconnect_delay
+    self.max_price_age = max_price_age
+
+    self.symbols: List[str] = []
+    self.prices: Dict[str, float] = {}
+    self.timestamps: Dict[str, int] = {}
+    self.books: Dict[str, OrderBook] = {}
+    self.connects = 0
+    # 거래쌍별 마지막 수신 시각 (time.monotonic, 가격/호가)
+    self._received: Dict[str, float] = {}
+    self._book_received: Dict[str, float] = {}
+    self._seq: Dict[str, int] = {}
+    self._total = 0
+    self._cond = threading.Condition()
+    self._closed = False
+    self._ws = None
+    self._loop = asyncio.new_event_loop()
+    self._thread = threading.Thread(target=self._run, name='upbit-price-stream', daemon=True)
+
+    self.subscribe(symbols)
+    self._thread.start()
+
+  def _run(self):
+    asyncio.set_event_loop(self._loop)
+    self._loop.run_until_complete(self._listen())
+
+  def _subscription(self) -> str:
+    codes = [to_market_code(symbol) for symbol in self.symbols]
+    request = [{'ticket': str(uuid.uuid4())}]
+    request += [{'type': type_, 'codes': codes} for type_ in self.types]
+    return json.dumps(request)
+
+  async def _send_subscription(self):
+    if self._ws is not None and self.symbols:
+      await self._ws.send(self._subscription())
+
+  async def _listen(self):
+    delay = self.reconnect_delay
+    while not self._closed:
+      try:
+        async with websockets.connect(self.url, ping_interval=30) as ws:
+          self._ws = ws
+          self.connects += 1
+          delay = self.reconnect_delay
+          await self._send_subscription()
+          async for message in ws:
+            self._on_message(message)
+      except Exception as e:
+        if not self._closed:
+          print(f"가격 스트림 연결 끊김: {str(e)}")
+      finally:
+        self._ws = None
+      if self._closed:
+        break
+      # 지수 백오프 후 재연결 (재연결 시 전체 구독 재요청)
+      await asyncio.sleep(delay)
+      delay = min(delay * 2, self.max_reconnect_delay)
+
+  def _on_message(self, message):
+    data = json.loads(message)
+    if 'code' in data and 'orderbook_units' in data:
+      # Upbit 호가 메시지는 전체 스냅샷이므로 새 객체로 교체 (읽는 쪽은 잠금 불필요)
+      book = OrderBook(from_market_code(data['code']))
+      book.update_from_upbit(data)
+      with self._cond:
+        self.books[book.symbol] = book
+        self._book_received[book.symbol] = time.monotonic()
+      return
+    if 'code' not in data or 'trade_price' not in data:
+      return
+    symbol = from_market_code(data['code'])
+    with self._cond:
+      self.prices[symbol] = float(data['trade_price'])
+      self.timestamps[symbol] = data.get('timestamp') or data.get('trade_timestamp')
+      self._received[symbol] = time.monotonic()
+      self._seq[symbol] = self._seq.get(symbol, 0) + 1
+      self._total += 1
+      self._cond.notify_all()
+
+  def subscribe(self, symbols: Iterable[str]):
+    """
+    구독 거래쌍 추가 (연결 중이면 즉시 재구독)
+    :param symbols: 거래쌍 목록
+    """
+    added = [symbol for symbol in symbols if symbol not in self.symbols]
+    if not added:
+      return
+    self.symbols.extend(added)
+    if self._ws is not None:
+      asyncio.run_coroutine_threadsafe(self._send_subscription(), self._loop)
+
+  def _stale(self, received: Optional[float]) -> bool:
+    # 연결 중이면 거래가 뜸해도 최신 값, 끊긴 동안에는 max_price_age 까지만 사용
+    return received is None or (self._ws is None and time.monotonic() - received > self.max_price_age)
+
+  def get_price(self, symbol: str) -> float:
+    """
+    최근 체결가 조회 (구독하지 않은 거래쌍이면 구독 후 첫 가격까지 대기)
+    연결이 끊긴 채 마지막 가격이 max_price_age 보다 오래되면 StalePriceError 가 발생한다.
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :return: 최근 체결가
+    """
+    self.subscribe([symbol])
+    with self._cond:
+      if not self._cond.wait_for(lambda: symbol in self.prices, self.first_price_timeout):
+        raise TimeoutError(f"{symbol} 가격 수신 대기 시간 초과")
+      if self._stale(self._received.get(symbol)):
+        raise StalePriceError(f"{symbol} 가격 스트림 연결 끊김: {time.monotonic() - self._received[symbol]:.1f}초 전 가격")
+      return self.prices[symbol]
+
+  def get_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+    """
+    여러 거래쌍의 최근 체결가 조회 (아직 수신 전이거나 연결이 끊겨 오래된 거래쌍은 제외)
+    :param symbols: 거래쌍 목록
+    :return: {심볼: 최근 체결가}
+    """
+    symbols = list(symbols)
+    self.subscribe(symbols)
+    with self._cond:
+      return {
+        symbol: self.prices[symbol]
+        for symbol in symbols if symbol in self.prices and not self._stale(self._received.get(symbol))
+      }
+
+  def get_book(self, symbol: str) -> Optional[OrderBook]:
+    """
+    최근 수신한 호가창 ('orderbook' 구독 시, 아직 수신 전이거나 연결이 끊겨 오래되었으면 None)
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    """
+    self.subscribe([symbol])
+    with self._cond:
+      if self._stale(self._book_received.get(symbol)):
+        return None
+      return self.books.get(symbol)
+
+  def wait(self, symbol: str, timeout: float):
+    """
+    다음 가격 수신까지 대기
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :param timeout: 최대 대기 시간 (초)
+    """
+    with self._cond:
+      seq = self._seq.get(symbol, 0)
+      self._cond.wait_for(lambda: self._closed or self._seq.get(symbol, 0) != seq, timeout)
+
+  def wait_any(self, timeout: float):
+    """
+    구독 중인 거래쌍 중 하나라도 가격을 수신할 때까지 대기
+    :param timeout: 최대 대기 시간 (초)
+    """
+    with self._cond:
+      total = self._total
+      self._cond.wait_for(lambda: self._closed or self._total != total, timeout)
+
+  def close(self):
+    """
+    스트림 종료
+    """
+    self._closed = True
+    with self._cond:
+      self._cond.notify_all()
+    if self._ws is not None:
+      asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+    self._thread.join(timeout=5)
@@ -0,0 +1,206 @@
+import time
+
+_STARTED = time.perf_counter()
+
+import sys
+import json
+import argparse
+import importlib
+
+
+# 서브커맨드별 실행 함수 (무거운 모듈은 실행 시점에만 import)
+
+def cmd_summary(args):
+  from collector.market import UpbitMarket
+  UpbitMarket().print_market_summary()
+
+
+def cmd_signals(args):
+  from collector.market import UpbitMarket
+  UpbitMarket().print_trading_signals(args.count)
+
+
+def cmd_ohlcv(args):
+  from collector.chart import UpbitChart
+  df = UpbitChart().get_ohlcv(args.symbol, args.timeframe, limit=args.limit, use_store=not args.no_store)
+  if df is not None:
+    print(df.to_string(index=False))
+
+
+def cmd_orderbook(args):
+  from collector.chart import UpbitChart
+  book = UpbitChart().get_book(args.symbol, limit=args.limit)
+  if book is None:
+    return
+  print(f"{'매도 호가':>16}{'수량':>16}")
+  for price, amount in book.asks[::-1].tolist():
+    print(f"{price:>16,.2f}{amount:>16,.4f}")
+  print(f"{'매수 호가':>16}{'수량':>16}")
+  for price, amount in book.bids.tolist():
+    print(f"{price:>16,.2f}{amount:>16,.4f}")
+
+
+def cmd_balances(args):
+  from collector.account import UpbitAccount
+  for balance in UpbitAccount().get_balances():
+    print(f"{balance['currency']:<8} 보유: {balance['total']:,.8f} (주문 가능: {balance['free']:,.8f}, 주문 중: {balance['used']:,.8f})")
+
+
+def cmd_orders(args):
+  from collector.account import UpbitAccount
+  account = UpbitAccount()
+  orders = account.get_open_orders(args.symbol) if args.open else account.get_orders(args.symbol, limit=args.limit)
+  for order in orders:
+    print(f"{order['datetime']} {order['symbol']} {order['side']} {order['type']} "
+          f"가격: {order['price']} 수량: {order['amount']} 체결: {order['filled']} 상태: {order['status']}")
+
+
+def _price_source(args):
+  if not args.stream:
+    return None
+  from collector.stream import UpbitPriceStream
+  return UpbitPriceStream([args.symbol])
+
+
+def _atr(args):
+  if args.atr_multiplier is None:
+    return {}
+  from collector.incremental import ATR, TickBars
+  return {'atr': ATR(args.atr_period), 'atr_multiplier': args.atr_multiplier, 'bars': TickBars(args.bar_seconds)}
+
+
+def cmd_trailing_stop(args):
+  from trader.trailing import TrailingStopTrader
+  trader = TrailingStopTrader(price_source=_price_source(args))
+  trader.trailing_stop(args.symbol, args.percent, check_interval=args.interval, quantity=args.quantity, **_atr(args))
+
+
+def cmd_trailing_buy(args):
+  from trader.trailing import TrailingStopTrader
+  trader = TrailingStopTrader(price_source=_price_source(args))
+  trader.trailing_buy(args.symbol, args.percent, args.amount, check_interval=args.interval, **_atr(args))
+
+
+def cmd_dip(args):
+  from trader.dip import DipTrader
+  options = {}
+  if args.rsi_below is not None:
+    from collector.incremental import WilderRSI, TickBars
+    options.update(rsi=WilderRSI(args.rsi_period), rsi_below=args.rsi_below, bars=TickBars(args.bar_seconds))
+  trader = DipTrader(price_source=_price_source(args))
+  if args.trailing is None:
+    trader.trade_simple(args.symbol, args.amount, args.dip, args.profit, args.loss, check_interval=args.interval, **options)
+  else:
+    atr = _atr(args)
+    if atr and 'bars' in options:
+      atr['bars'] = options['bars']
+    options.update(atr)
+    trader.trade_trailing(args.symbol, args.amount, args.dip, args.profit, args.loss, args.trailing,
+                          check_interval=args.interval, **options)
+
+
+def cmd_run(args):
+  from trader.runner import StrategyRunner
+  with open(args.config, encoding='utf-8') as file:
+    configs = json.load(file)
+  runner = StrategyRunner(configs, processes=args.processes)
+  for result in runner.run(timeout=args.timeout):
+    print(f"{result['strategy']} {result['symbol']}: {result['error'] or result['result']}")
+
+
+def _add_trailing_options(parser):
+  parser.add_argument('--interval', type=float, default=1.0, help='가격 체크 간격 (초)')
+  parser.add_argument('--stream', action='store_true', help='WebSocket 실시간 가격 사용 (기본: 폴링)')
+  parser.add_argument('--atr-multiplier', type=float, help='지정 시 ATR 배수만큼 Trailing (ATR 준비 전에는 비율 사용)')
+  parser.add_argument('--atr-period', type=int, default=14)
+  parser.add_argument('--bar-seconds', type=float, default=60.0, help='지표용 틱 봉 길이 (초)')
+
+
+def build_parser() -> argparse.ArgumentParser:
+  parser = argparse.ArgumentParser(prog='main.py', description='jnj-coin 명령행 도구')
+  parser.add_argument('--timing', action='store_true', help='시작/모듈 로드/실행 시간 출력 (stderr)')
+  parser.add_argument('--dry-run', action='store_true', help='서브커맨드 모듈만 로드하고 실행하지 않음 (시작 시간 측정용)')
+  commands = parser.add_subparsers(dest='command', metavar='command', required=True)
+
+  def command(name, func, modules, help):
+    sub = commands.add_parser(name, help=help, description=help)
+    sub.set_defaults(func=func, modules=modules)
+    return sub
+
+  command('summary', cmd_summary, ('collector.market',), '시장 동향 요약')
+
+  sub = command('signals', cmd_signals, ('collector.market',), '매수/매도 추천 코인')
+  sub.add_argument('--count', type=int, default=5)
+
+  sub = command('ohlcv', cmd_ohlcv, ('collector.chart', 'pandas'), 'OHLCV 조회')
+  sub.add_argument('symbol')
+  sub.add_argument('--timeframe', default='1d')
+  sub.add_argument('--limit', type=int, default=100)
+  sub.add_argument('--no-store', action='store_true', help='로컬 캔들 저장소 사용 안 함')
+
+  sub = command('orderbook', cmd_orderbook, ('collector.chart',), '호가 조회')
+  sub.add_argument('symbol')
+  sub.add_argument('--limit', type=int, default=None)
+
+  command('balances', cmd_balances, ('collector.account',), '보유 자산 조회')
+
+  sub = command('orders', cmd_orders, ('collector.account',), '주문 내역 조회')
+  sub.add_argument('symbol', nargs='?')
+  sub.add_argument('--open', action='store_true', help='미체결 주문만')
+  sub.add_argument('--limit', type=int, default=100)
+
+  sub = command('trailing-stop', cmd_trailing_stop, ('trader.trailing',), 'Trailing Stop 매도')
+  sub.add_argument('symbol')
+  sub.add_argument('--percent', type=float, required=True, help='고점 대비 하락 허용 비율 (%%)')
+  sub.add_argument('--quantity', type=float, help='매도 수량 (미지정 시 전량)')
+  _add_trailing_options(sub)
+
+  sub = command('trailing-buy', cmd_trailing_buy, ('trader.trailing',), 'Trailing Buy 매수')
+  sub.add_argument('symbol')
+  sub.add_argument('--percent', type=float, required=True, help='저점 대비 상승 허용 비율 (%%)')
+  sub.add_argument('--amount', type=float, required=True, help='매수 금액 (KRW)')
+  _add_trailing_options(sub)
+
+  sub = command('dip', cmd_dip, ('trader.dip',), '딥 매매 (--trailing 지정 시 Trailing Stop 매도)')
+  sub.add_argument('symbol')
+  sub.add_argument('--amount', type=float, required=True, help='매수 금액 (KRW)')
+  sub.add_argument('--dip', type=float, default=1.0, help='매수 진입 하락률 (%%)')
+  sub.add_argument('--profit', type=float, default=5.0, help='목표 수익률 (%%)')
+  sub.add_argument('--loss', type=float, default=3.0, help='손절 하락률 (%%)')
+  sub.add_argument('--trailing', type=float, help='Trailing Stop 하락률 (%%)')
+  sub.add_argument('--rsi-below', type=float, help='지정 시 RSI 가 이 값 미만일 때만 매수')
+  sub.add_argument('--rsi-period', type=int, default=14)
+  _add_trailing_options(sub)
+
+  sub = command('run', cmd_run, ('trader.runner',), '전략 설정(JSON 목록)을 여러 프로세스로 실행')
+  sub.add_argument('config', help='전략 설정 JSON 파일')
+  sub.add_argument('--processes', type=int)
+  sub.add_argument('--timeout', type=float)
+
+  return parser
+
+
+def main(argv=None) -> int:
+  args = build_parser().parse_args(argv)
+  parsed = time.perf_counter()
+
+  for module in args.modules:
+    importlib.import_module(module)
+  loaded = time.perf_counter()
+
+  if not args.dry_run:
+    try:
+      args.func(args)
+    except KeyboardInterrupt:
+      print("\n중단")
+  finished = time.perf_counter()
+
+  if args.timing:
+    print(f"[{args.command}] 시작: {parsed - _STARTED:.3f}s, 모듈 로드: {loaded - parsed:.3f}s, "
+          f"실행: {finished - loaded:.3f}s", file=sys.stderr)
+  return 0
+
+
+# 실행: python main.py <command> [options] (python 디렉토리에서)
+if __name__ == "__main__":
+  sys.exit(main())
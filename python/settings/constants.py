@@ -2,3 +2,26 @@
 
 UPBIT_SELL_FEE = 0.00025
 UPBIT_BUY_FEE = 0.00025
+
+# https://docs.upbit.com/kr/docs/market-info-trade-price-detail
+
+# 원화 마켓 최소 주문 금액
+UPBIT_MIN_ORDER_KRW = 5000
+
+# 원화 마켓 호가 단위 ((가격 하한, 호가 단위), 가격 내림차순)
+UPBIT_KRW_TICK_SIZES = (
+  (2000000, 1000),
+  (1000000, 500),
+  (500000, 100),
+  (100000, 50),
+  (10000, 10),
+  (1000, 1),
+  (100, 0.1),
+  (10, 0.01),
+  (1, 0.001),
+  (0.1, 0.0001),
+  (0.01, 0.00001),
+  (0.001, 0.000001),
+  (0.0001, 0.0000001),
+  (0, 0.00000001),
+)
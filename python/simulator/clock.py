@@ -0,0 +1,77 @@
+import time
+import threading
+from datetime import datetime
+from typing import Optional
+
+# 기본 배속 (가상 1초 = 실제 1ms)
+DEFAULT_SPEED = 1000.0
+
+
+class SimulationFinished(Exception):
+  """
+  가상 시계가 종료 시각을 지났을 때 발생 (매매 루프의 예외 처리로 루프가 끝난다)
+  """
+
+
+class VirtualClock:
+  """
+  시뮬레이터용 가상 시계
+  sleep 호출 시 가상 시간을 즉시 진행하고, 실제로는 speed 배속으로 환산한 시간만 대기한다.
+  PollingPriceSource(sleep=clock.sleep) 와 FakeUpbit 에 함께 주입하여 사용한다.
+  """
+  def __init__(self,
+               start: Optional[float] = None,
+               speed: Optional[float] = DEFAULT_SPEED,
+               until: Optional[float] = None):
+    """
+    :param start: 시작 시각 (epoch 초, None이면 현재 시각)
+    :param speed: 배속 (None이면 실제 대기 없이 최대 속도로 진행)
+    :param until: 종료 시각 (epoch 초, 지나면 sleep 에서 SimulationFinished 발생)
+    """
+    self.now = time.time() if start is None else float(start)
+    self.start = self.now
+    self.speed = speed
+    self.until = until
+    self.sleeps = 0
+    self._lock = threading.Lock()
+
+  def time(self) -> float:
+    """
+    현재 가상 시각 (epoch 초)
+    """
+    return self.now
+
+  def milliseconds(self) -> int:
+    """
+    현재 가상 시각 (epoch ms, ccxt 와 같은 단위)
+    """
+    return int(self.now * 1000)
+
+  def datetime(self) -> datetime:
+    return datetime.fromtimestamp(self.now)
+
+  def elapsed(self) -> float:
+    """
+    시작 후 경과한 가상 시간 (초)
+    """
+    return self.now - self.start
+
+  def advance(self, seconds: float) -> float:
+    """
+    대기 없이 가상 시간 진행
+    :return: 진행 후 가상 시각
+    """
+    with self._lock:
+      if self.until is not None and self.now >= self.until:
+        raise SimulationFinished(f"시뮬레이션 종료 시각 도달: {datetime.fromtimestamp(self.until)}")
+      self.now += max(0.0, seconds)
+      self.sleeps += 1
+      return self.now
+
+  def sleep(self, seconds: float):
+    """
+    time.sleep 대체 (가상 시간 진행 후 배속 환산 시간만큼 실제 대기)
+    """
+    self.advance(seconds)
+    if self.speed and seconds > 0:
+      time.sleep(seconds / self.speed)
@@ -0,0 +1,446 @@
+import itertools
+import threading
+import ccxt
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+from collector.store import timeframe_ms
+from collector.stream import PollingPriceSource, from_market_code
+from collector.session import register_exchange
+from settings.constants import UPBIT_BUY_FEE, UPBIT_SELL_FEE, UPBIT_MIN_ORDER_KRW
+from simulator.clock import VirtualClock
+
+# 원화 마켓 최소 주문 금액
+MIN_ORDER_KRW = UPBIT_MIN_ORDER_KRW
+
+# 호가창 단계 수 (Upbit 기본 15단계)
+BOOK_LEVELS = 15
+
+# 24시간 (ms)
+DAY_MS = 86400000
+
+
+def ticks_from_messages(messages: Iterable[Dict]) -> Dict[str, np.ndarray]:
+  """
+  녹화된 WebSocket 메시지(ws_replay.record_messages)에서 틱 시계열 추출
+  :param messages: ticker/trade 메시지 목록
+  :return: {심볼: [[timestamp(ms), 가격, 거래량], ...]}
+  """
+  rows: Dict[str, List] = {}
+  for message in messages:
+    if message.get('type') not in ('ticker', 'trade') or 'trade_price' not in message:
+      continue
+    timestamp = message.get('trade_timestamp') or message.get('timestamp')
+    rows.setdefault(from_market_code(message['code']), []).append(
+      (timestamp, message['trade_price'], message.get('trade_volume') or 0.0))
+  return {symbol: np.asarray(values, dtype=np.float64) for symbol, values in rows.items()}
+
+
+def ticks_from_ohlcv(candles) -> np.ndarray:
+  """
+  캔들 종가를 틱 시계열로 사용 (1분봉 히스토리 재생용)
+  :param candles: [[timestamp, open, high, low, close, volume], ...]
+  """
+  candles = np.asarray(candles, dtype=np.float64)
+  return np.column_stack([candles[:, 0], candles[:, 4], candles[:, 5]])
+
+
+def ticks_from_series(prices, start: int, interval: float = 1.0) -> np.ndarray:
+  """
+  시각 정보가 없는 가격 시계열을 일정 간격의 틱으로 변환
+  :param start: 첫 틱 시각 (ms)
+  :param interval: 틱 간격 (초)
+  """
+  prices = np.asarray(prices, dtype=np.float64)
+  timestamps = start + np.arange(len(prices)) * interval * 1000
+  return np.column_stack([timestamps, prices, np.zeros(len(prices))])
+
+
+class _Series:
+  __slots__ = ('timestamps', 'prices', 'volumes', 'quote_volumes')
+
+  def __init__(self, ticks: np.ndarray):
+    ticks = np.asarray(ticks, dtype=np.float64).reshape(-1, 3)
+    ticks = ticks[np.argsort(ticks[:, 0], kind='stable')]
+    self.timestamps = ticks[:, 0].astype(np.int64)
+    self.prices = ticks[:, 1]
+    self.volumes = ticks[:, 2]
+    # 24시간 거래대금을 O(1)로 계산하기 위한 누적합
+    self.quote_volumes = np.concatenate(([0.0], np.cumsum(self.prices * self.volumes)))
+
+  def index(self, now: int) -> int:
+    # now 시점까지 공개된 마지막 틱 (시작 전이면 첫 틱)
+    return max(int(np.searchsorted(self.timestamps, now, 'right')) - 1, 0)
+
+
+class FakeUpbit:
+  """
+  녹화된 틱 시계열을 가상 시계에 맞춰 재생하는 로컬 Upbit 대체 거래소
+  이 프로젝트에서 사용하는 ccxt 메소드만 구현한다 (시세, 캔들, 호가, 잔고, 주문 생성/취소/조회).
+  시장가 주문은 현재 매수/매도 1호가로 즉시 체결되고, 지정가 주문은 가격이 닿은 뒤 조회 시점에 체결된다.
+  """
+  id = 'upbit'
+
+  def __init__(self,
+               ticks: Dict[str, np.ndarray],
+               clock: Optional[VirtualClock] = None,
+               balances: Optional[Dict[str, float]] = None,
+               spread: float = 0.0005,
+               book_depth: float = 10000000,
+               buy_fee: float = UPBIT_BUY_FEE,
+               sell_fee: float = UPBIT_SELL_FEE):
+    """
+    :param ticks: {심볼: [[timestamp(ms), 가격, 거래량], ...]} (ticks_from_* 함수로 생성)
+    :param clock: 가상 시계 (None이면 첫 틱 시각부터 마지막 틱 시각까지 1000배속)
+    :param balances: 초기 잔고 {통화: 수량} (기본 KRW 1천만원)
+    :param spread: 최근 체결가 대비 매수/매도 1호가 간격 (비율)
+    :param book_depth: 호가 단계별 잔량 (KRW 환산)
+    :param buy_fee: 매수 수수료율
+    :param sell_fee: 매도 수수료율
+    """
+    self.series = {symbol: _Series(data) for symbol, data in ticks.items() if len(data)}
+    if not self.series:
+      raise ValueError("재생할 틱이 없습니다.")
+    self.start = min(int(series.timestamps[0]) for series in self.series.values())
+    self.end = max(int(series.timestamps[-1]) for series in self.series.values())
+    self.clock = clock or VirtualClock(start=self.start / 1000, until=self.end / 1000)
+    self.spread = spread
+    self.book_depth = book_depth
+    self.buy_fee = buy_fee
+    self.sell_fee = sell_fee
+    self.markets = {
+      symbol: {'id': f"{symbol.split('/')[1]}-{symbol.split('/')[0]}", 'symbol': symbol,
+               'base': symbol.split('/')[0], 'quote': symbol.split('/')[1], 'active': True}
+      for symbol in self.series
+    }
+    self.balances = {currency: {'free': float(amount), 'used': 0.0}
+                     for currency, amount in (balances or {'KRW': 10000000}).items()}
+    self.orders: Dict[str, Dict] = {}
+    self.requests = 0
+    self._ids = itertools.count(1)
+    self._lock = threading.RLock()
+
+  # 시각/시세
+
+  def milliseconds(self) -> int:
+    return self.clock.milliseconds()
+
+  def iso8601(self, timestamp: Optional[int]) -> Optional[str]:
+    return ccxt.Exchange.iso8601(timestamp)
+
+  def load_markets(self, reload: bool = False) -> Dict:
+    return self.markets
+
+  def _series(self, symbol: str) -> _Series:
+    series = self.series.get(symbol)
+    if series is None:
+      raise ccxt.BadSymbol(f"upbit does not have market symbol {symbol}")
+    return series
+
+  def _last(self, symbol: str) -> float:
+    series = self._series(symbol)
+    return float(series.prices[series.index(self.milliseconds())])
+
+  def _quote(self, symbol: str):
+    # (매수 1호가, 매도 1호가)
+    last = self._last(symbol)
+    return last * (1 - self.spread), last * (1 + self.spread)
+
+  def fetch_ticker(self, symbol: str, params: Optional[Dict] = None) -> Dict:
+    self.requests += 1
+    self._match()
+    return self._ticker(symbol)
+
+  def fetch_tickers(self, symbols: Optional[Iterable[str]] = None, params: Optional[Dict] = None) -> Dict[str, Dict]:
+    self.requests += 1
+    self._match()
+    symbols = list(self.series) if symbols is None else list(symbols)
+    return {symbol: self._ticker(symbol) for symbol in symbols}
+
+  def _ticker(self, symbol: str) -> Dict:
+    series = self._series(symbol)
+    now = self.milliseconds()
+    i = series.index(now)
+    j = series.index(now - DAY_MS)
+    last = float(series.prices[i])
+    open_ = float(series.prices[j])
+    bid, ask = last * (1 - self.spread), last * (1 + self.spread)
+    return {
+      'symbol': symbol,
+      'timestamp': int(series.timestamps[i]),
+      'datetime': self.iso8601(int(series.timestamps[i])),
+      'high': None,
+      'low': None,
+      'bid': bid,
+      'ask': ask,
+      'open': open_,
+      'close': last,
+      'last': last,
+      'change': last - open_,
+      'percentage': (last / open_ - 1) * 100 if open_ else None,
+      'baseVolume': float(series.volumes[j + 1:i + 1].sum()),
+      'quoteVolume': float(series.quote_volumes[i + 1] - series.quote_volumes[j + 1]),
+      'info': {}
+    }
+
+  def fetch_ohlcv(self,
+                  symbol: str,
+                  timeframe: str = '1m',
+                  since: Optional[int] = None,
+                  limit: Optional[int] = None,
+                  params: Optional[Dict] = None) -> List[List]:
+    """
+    현재 가상 시각까지의 틱으로 캔들 생성 (진행 중인 마지막 캔들 포함)
+    """
+    self.requests += 1
+    series = self._series(symbol)
+    step = timeframe_ms(timeframe)
+    limit = limit or 200
+    now = self.milliseconds()
+    end = int(np.searchsorted(series.timestamps, now, 'right'))
+    if since is not None:
+      begin = int(np.searchsorted(series.timestamps, since // step * step))
+    else:
+      begin = int(np.searchsorted(series.timestamps, (now // step - limit + 1) * step))
+    if begin >= end:
+      return []
+
+    timestamps = series.timestamps[begin:end] // step * step
+    prices = series.prices[begin:end]
+    starts = np.flatnonzero(np.concatenate(([True], timestamps[1:] != timestamps[:-1])))
+    ends = np.append(starts[1:], len(prices)) - 1
+    candles = np.column_stack([
+      timestamps[starts],
+      prices[starts],
+      np.maximum.reduceat(prices, starts),
+      np.minimum.reduceat(prices, starts),
+      prices[ends],
+      np.add.reduceat(series.volumes[begin:end], starts)
+    ])
+    candles = candles[:limit] if since is not None else candles[-limit:]
+    return [[int(row[0])] + row[1:].tolist() for row in candles]
+
+  def fetch_order_book(self, symbol: str, limit: Optional[int] = None, params: Optional[Dict] = None) -> Dict:
+    """
+    1호가 기준 spread 간격으로 쌓은 가상 호가창
+    """
+    self.requests += 1
+    bid, ask = self._quote(symbol)
+    step = ask - bid
+    levels = np.arange(min(limit or BOOK_LEVELS, BOOK_LEVELS))
+    bids = bid - levels * step
+    asks = ask + levels * step
+    now = self.milliseconds()
+    return {
+      'symbol': symbol,
+      'bids': [[price, self.book_depth / price] for price in bids.tolist()],
+      'asks': [[price, self.book_depth / price] for price in asks.tolist()],
+      'timestamp': now,
+      'datetime': self.iso8601(now),
+      'nonce': None
+    }
+
+  # 잔고
+
+  def _balance(self, currency: str) -> Dict[str, float]:
+    return self.balances.setdefault(currency, {'free': 0.0, 'used': 0.0})
+
+  def _move(self, currency: str, free: float = 0.0, used: float = 0.0):
+    balance = self._balance(currency)
+    balance['free'] += free
+    balance['used'] += used
+
+  def fetch_balance(self, params: Optional[Dict] = None) -> Dict:
+    self.requests += 1
+    self._match()
+    with self._lock:
+      result = {'info': {}, 'free': {}, 'used': {}, 'total': {}}
+      for currency, balance in self.balances.items():
+        total = balance['free'] + balance['used']
+        result[currency] = {'free': balance['free'], 'used': balance['used'], 'total': total}
+        result['free'][currency] = balance['free']
+        result['used'][currency] = balance['used']
+        result['total'][currency] = total
+      return result
+
+  # 주문
+
+  def create_order(self,
+                   symbol: str,
+                   type: str,
+                   side: str,
+                   amount: float,
+                   price: Optional[float] = None,
+                   params: Optional[Dict] = None) -> Dict:
+    """
+    주문 생성
+    시장가 매수의 amount 는 주문 금액(KRW), 그 외에는 코인 수량 (UpbitTrader 와 동일)
+    """
+    self.requests += 1
+    self._match()
+    self._series(symbol)
+    base, quote = symbol.split('/')
+    if type == 'limit' and not price:
+      raise ccxt.ArgumentsRequired("upbit createOrder() requires a price argument for limit orders")
+    total = amount if (type == 'market' and side == 'buy') else amount * (price or self._quote(symbol)[0])
+    if quote == 'KRW' and total < MIN_ORDER_KRW:
+      raise ccxt.InvalidOrder(f'upbit {{"error":{{"message":"최소주문금액 이상으로 주문해주세요","name":"under_min_total_{"bid" if side == "buy" else "ask"}"}}}}')
+
+    with self._lock:
+      if side == 'buy':
+        reserve = total * (1 + self.buy_fee)
+        if self._balance(quote)['free'] + 1e-9 < reserve:
+          raise ccxt.InsufficientFunds('upbit {"error":{"message":"주문가능한 금액(KRW)이 부족합니다.","name":"insufficient_funds_bid"}}')
+        self._move(quote, free=-reserve, used=reserve)
+      else:
+        reserve = amount
+        if self._balance(base)['free'] + 1e-12 < reserve:
+          raise ccxt.InsufficientFunds(f'upbit {{"error":{{"message":"주문가능한 금액({base})이 부족합니다.","name":"insufficient_funds_ask"}}}}')
+        self._move(base, free=-reserve, used=reserve)
+
+      now = self.milliseconds()
+      order = {
+        'id': f"sim-{next(self._ids)}",
+        'clientOrderId': None,
+        'timestamp': now,
+        'datetime': self.iso8601(now),
+        'lastTradeTimestamp': None,
+        'symbol': symbol,
+        'type': type,
+        'side': side,
+        'price': price,
+        'amount': None if (type == 'market' and side == 'buy') else amount,
+        'cost': total if (type == 'market' and side == 'buy') else 0.0,
+        'filled': 0.0,
+        'remaining': None if (type == 'market' and side == 'buy') else amount,
+        'average': None,
+        'status': 'open',
+        'fee': {'currency': quote, 'cost': 0.0},
+        'trades': [],
+        'reserved': reserve,
+        'info': {}
+      }
+      self.orders[order['id']] = order
+      if type == 'market':
+        bid, ask = self._quote(symbol)
+        self._fill(order, ask if side == 'buy' else bid)
+      return self._public(order)
+
+  def create_market_buy_order(self, symbol: str, amount: float, params: Optional[Dict] = None) -> Dict:
+    return self.create_order(symbol, 'market', 'buy', amount)
+
+  def create_market_sell_order(self, symbol: str, amount: float, params: Optional[Dict] = None) -> Dict:
+    return self.create_order(symbol, 'market', 'sell', amount)
+
+  def create_limit_buy_order(self, symbol: str, amount: float, price: float, params: Optional[Dict] = None) -> Dict:
+    return self.create_order(symbol, 'limit', 'buy', amount, price)
+
+  def create_limit_sell_order(self, symbol: str, amount: float, price: float, params: Optional[Dict] = None) -> Dict:
+    return self.create_order(symbol, 'limit', 'sell', amount, price)
+
+  def _fill(self, order: Dict, price: float):
+    # 전량 체결 처리 (잔고 이동, 남은 예약분 해제)
+    base, quote = order['symbol'].split('/')
+    if order['side'] == 'buy':
+      cost = order['cost'] if order['type'] == 'market' else order['amount'] * price
+      filled = cost / price
+      fee = cost * self.buy_fee
+      self._move(quote, free=order['reserved'] - cost - fee, used=-order['reserved'])
+      self._move(base, free=filled)
+    else:
+      filled = order['amount']
+      cost = filled * price
+      fee = cost * self.sell_fee
+      self._move(base, used=-order['reserved'])
+      self._move(quote, free=cost - fee)
+    now = self.milliseconds()
+    order.update(filled=filled, remaining=0.0, cost=cost, average=price, status='closed', reserved=0.0,
+                 lastTradeTimestamp=now, fee={'currency': quote, 'cost': fee})
+    if order['amount'] is None:
+      order['amount'] = filled
+
+  def _match(self):
+    # 가격이 닿은 지정가 주문 체결
+    with self._lock:
+      for order in self.orders.values():
+        if order['status'] != 'open':
+          continue
+        last = self._last(order['symbol'])
+        if (order['side'] == 'buy' and last <= order['price']) or (order['side'] == 'sell' and last >= order['price']):
+          self._fill(order, order['price'])
+
+  def _public(self, order: Dict) -> Dict:
+    public = dict(order)
+    del public['reserved']
+    return public
+
+  def _get(self, order_id: str) -> Dict:
+    order = self.orders.get(order_id)
+    if order is None:
+      raise ccxt.OrderNotFound(f'upbit {{"error":{{"message":"주문을 찾지 못했습니다.","name":"order_not_found"}}}}')
+    return order
+
+  def cancel_order(self, id: str, symbol: Optional[str] = None, params: Optional[Dict] = None) -> Dict:
+    self.requests += 1
+    self._match()
+    with self._lock:
+      order = self._get(id)
+      if order['status'] != 'open':
+        raise ccxt.OrderNotFound(f'upbit {{"error":{{"message":"주문을 찾지 못했습니다.","name":"order_not_found"}}}}')
+      base, quote = order['symbol'].split('/')
+      currency = quote if order['side'] == 'buy' else base
+      self._move(currency, free=order['reserved'], used=-order['reserved'])
+      order.update(status='canceled', reserved=0.0)
+      return self._public(order)
+
+  def fetch_order(self, id: str, symbol: Optional[str] = None, params: Optional[Dict] = None) -> Dict:
+    self.requests += 1
+    self._match()
+    with self._lock:
+      return self._public(self._get(id))
+
+  def _list(self, open_: bool, symbol: Optional[str], limit: Optional[int]) -> List[Dict]:
+    self.requests += 1
+    self._match()
+    with self._lock:
+      orders = [
+        self._public(order) for order in self.orders.values()
+        if (order['status'] == 'open') == open_ and (symbol is None or order['symbol'] == symbol)
+      ]
+    return orders[-limit:] if limit else orders
+
+  def fetch_open_orders(self, symbol: Optional[str] = None, since: Optional[int] = None,
+                        limit: Optional[int] = None, params: Optional[Dict] = None) -> List[Dict]:
+    return self._list(True, symbol, limit)
+
+  def fetch_closed_orders(self, symbol: Optional[str] = None, since: Optional[int] = None,
+                          limit: Optional[int] = None, params: Optional[Dict] = None) -> List[Dict]:
+    return self._list(False, symbol, limit)
+
+
+def install(exchange: FakeUpbit) -> PollingPriceSource:
+  """
+  가짜 거래소를 공유 클라이언트로 등록하고 가상 시계로 대기하는 가격 소스 반환
+  이후 생성하는 TrailingStopTrader, DipTrader 등은 이 거래소로 주문한다.
+  """
+  register_exchange(exchange)
+  return PollingPriceSource(exchange, sleep=exchange.clock.sleep)
+
+
+# 사용 예시: 생성 데이터 하루치(1초 틱)를 최대 속도로 재생하며 TrailingStopTrader 실행
+# python -m simulator.exchange (python 디렉토리에서, 네트워크 불필요)
+if __name__ == "__main__":
+  import time
+  from trader.trailing import TrailingStopTrader
+
+  rng = np.random.default_rng(0)
+  prices = 100000000 * np.exp(np.cumsum(rng.normal(0, 0.0002, 86400)))
+  exchange = FakeUpbit({'BTC/KRW': ticks_from_series(prices, start=1700000000000)},
+                       balances={'KRW': 10000000, 'BTC': 0.05})
+  exchange.clock.speed = None  # 1000배속: exchange.clock.speed = 1000
+  prices = install(exchange)
+
+  started = time.perf_counter()
+  result = TrailingStopTrader(price_source=prices).trailing_stop('BTC/KRW', trail_percent=3.0, quantity=0.05)
+  print(f"가상 {exchange.clock.elapsed() / 3600:.1f}시간 / 실제 {time.perf_counter() - started:.1f}초, 요청 {exchange.requests}회")
+  print(f"결과: {result and {key: result[key] for key in ('status', 'filled', 'average', 'cost')}}")
+  print(f"잔고: {exchange.fetch_balance()['total']}")
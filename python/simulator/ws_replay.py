@@ -0,0 +1,172 @@
+import json
+import asyncio
+import threading
+import websockets
+from typing import Dict, Iterable, List, Optional
+from collector.stream import UPBIT_WS_URL, to_market_code
+
+
+def load_messages(path: str) -> List[Dict]:
+  """
+  녹화된 WebSocket 메시지 로드 (JSON Lines)
+  :param path: 파일 경로
+  :return: 메시지 목록
+  """
+  with open(path, 'r', encoding='utf-8') as file:
+    return [json.loads(line) for line in file if line.strip()]
+
+
+async def _record(path: str, symbols: Iterable[str], seconds: float, url: str, types: Iterable[str]):
+  codes = [to_market_code(symbol) for symbol in symbols]
+  request = [{'ticket': 'recorder'}] + [{'type': type_, 'codes': codes} for type_ in types]
+  loop = asyncio.get_running_loop()
+  deadline = loop.time() + seconds
+  async with websockets.connect(url) as ws:
+    await ws.send(json.dumps(request))
+    with open(path, 'w', encoding='utf-8') as file:
+      while loop.time() < deadline:
+        try:
+          message = await asyncio.wait_for(ws.recv(), deadline - loop.time())
+        except asyncio.TimeoutError:
+          break
+        file.write(json.dumps(json.loads(message), ensure_ascii=False) + '\n')
+
+
+def record_messages(path: str,
+                    symbols: Iterable[str],
+                    seconds: float = 60,
+                    url: str = UPBIT_WS_URL,
+                    types: Iterable[str] = ('ticker', 'trade')):
+  """
+  실제 Upbit WebSocket 메시지를 파일로 녹화
+  :param path: 저장할 파일 경로 (JSON Lines)
+  :param symbols: 거래쌍 목록
+  :param seconds: 녹화 시간 (초)
+  :param url: WebSocket 주소
+  :param types: 구독할 메시지 종류
+  """
+  asyncio.run(_record(path, list(symbols), seconds, url, list(types)))
+
+
+class ReplayServer:
+  """
+  녹화된 메시지를 재생하는 로컬 Upbit WebSocket 대체 서버
+  구독 요청의 codes 에 해당하는 메시지만 순서대로 전송한다.
+  """
+  def __init__(self,
+               messages: List[Dict],
+               host: str = '127.0.0.1',
+               port: int = 0,
+               interval: float = 0.0,
+               disconnect_after: Optional[int] = None):
+    """
+    :param messages: 재생할 메시지 목록
+    :param host: 바인드 주소
+    :param port: 포트 (0이면 임의 포트)
+    :param interval: 메시지 간 전송 간격 (초)
+    :param disconnect_after: 첫 연결에서 N개 전송 후 강제로 연결 종료 (재연결 확인용)
+    """
+    self.messages = messages
+    self.host = host
+    self.port = port
+    self.interval = interval
+    self.disconnect_after = disconnect_after
+    self.subscriptions: List[List] = []
+    self.connections = 0
+    self.sent = 0
+    self._position = 0
+    self._loop = asyncio.new_event_loop()
+    self._ready = threading.Event()
+    self._stop: Optional[asyncio.Future] = None
+    self._thread = threading.Thread(target=self._run, name='ws-replay', daemon=True)
+
+  @property
+  def url(self) -> str:
+    return f"ws://{self.host}:{self.port}"
+
+  def _subscribe(self, frame) -> set:
+    # 구독 요청의 codes 목록 (요청마다 전체 구독을 교체, Upbit 과 동일)
+    codes = set()
+    for item in json.loads(frame):
+      codes.update(item.get('codes', []))
+    self.subscriptions.append(sorted(codes))
+    return codes
+
+  async def _handler(self, ws):
+    self.connections += 1
+    connection = self.connections
+    codes = self._subscribe(await ws.recv())
+
+    async def receive():
+      # 연결 중 추가 구독 요청 처리
+      nonlocal codes
+      async for frame in ws:
+        codes = self._subscribe(frame)
+
+    receiver = asyncio.ensure_future(receive())
+    sent_here = 0
+    try:
+      # 재연결 시에는 이전 연결이 끊긴 위치부터 이어서 재생
+      while self._position < len(self.messages):
+        message = self.messages[self._position]
+        if message.get('code') in codes:
+          await ws.send(json.dumps(message).encode('utf-8'))
+          self.sent += 1
+          sent_here += 1
+        self._position += 1
+        if connection == 1 and self.disconnect_after is not None and sent_here >= self.disconnect_after:
+          await ws.close()
+          return
+        # 간격이 없어도 구독 요청을 받을 수 있도록 양보
+        await asyncio.sleep(self.interval if self.interval and message.get('code') in codes else 0)
+      await receiver
+    except websockets.ConnectionClosed:
+      pass
+    finally:
+      receiver.cancel()
+
+  async def _serve(self):
+    self._stop = self._loop.create_future()
+    async with websockets.serve(self._handler, self.host, self.port) as server:
+      self.port = server.sockets[0].getsockname()[1]
+      self._ready.set()
+      await self._stop
+
+  def _run(self):
+    asyncio.set_event_loop(self._loop)
+    self._loop.run_until_complete(self._serve())
+
+  def start(self) -> 'ReplayServer':
+    """
+    서버 시작 (포트가 열릴 때까지 대기)
+    """
+    self._thread.start()
+    self._ready.wait(timeout=5)
+    return self
+
+  def stop(self):
+    """
+    서버 종료
+    """
+    if self._stop is not None:
+      self._loop.call_soon_threadsafe(self._stop.set_result, None)
+    self._thread.join(timeout=5)
+
+
+# 사용 예시: 녹화 파일을 재생하며 UpbitPriceStream 확인
+if __name__ == "__main__":
+  import sys
+  from collector.stream import UpbitPriceStream
+
+  messages = load_messages(sys.argv[1]) if len(sys.argv) > 1 else [
+    {'type': 'ticker', 'code': 'KRW-BTC', 'trade_price': 100000000 + i * 1000, 'timestamp': i}
+    for i in range(20)
+  ]
+  server = ReplayServer(messages, interval=0.05, disconnect_after=5).start()
+  stream = UpbitPriceStream(['BTC/KRW'], url=server.url, reconnect_delay=0.1)
+  for _ in range(10):
+    print(f"BTC/KRW: {stream.get_price('BTC/KRW')}")
+    stream.wait('BTC/KRW', 1.0)
+  print(f"연결 횟수: {stream.connects}, 구독 요청: {server.subscriptions}")
+  stream.close()
+  server.stop()
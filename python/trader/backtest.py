@@ -0,0 +1,246 @@
+import os
+import itertools
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+from settings.constants import UPBIT_BUY_FEE, UPBIT_SELL_FEE
+
+# 파라미터 조합 목록의 컬럼 순서
+PARAMS = ('dip_percent', 'profit_percent', 'loss_percent', 'trailing_percent')
+
+
+def replay(prices: Sequence[float],
+           target_amount: float = 100000,
+           dip_percent: float = 1.0,
+           profit_percent: float = 5.0,
+           loss_percent: float = 3.0,
+           trailing_percent: Optional[float] = None,
+           buy_fee: float = UPBIT_BUY_FEE,
+           sell_fee: float = UPBIT_SELL_FEE) -> List[Dict]:
+  """
+  DipTrader 매매 규칙을 가격 시계열에 그대로 적용 (단일 파라미터, 거래 내역 확인용)
+  trailing_percent 가 None 이면 trade_simple, 아니면 trade_trailing 규칙을 따른다.
+  매도 후에는 다음 가격을 새 시작 가격으로 하여 다시 매매를 시작한다.
+  :param prices: 가격 시계열 (체결가 또는 캔들 종가)
+  :param target_amount: 1회 매수 금액 (KRW)
+  :return: 거래 내역 목록
+  """
+  trades = []
+  initial_price = prices[0]
+  buy_target = initial_price * (1 - dip_percent / 100)
+  holding = False
+  for t in range(1, len(prices)):
+    current_price = prices[t]
+    if not holding:
+      if current_price <= buy_target:
+        holding = True
+        buy_price = current_price
+        buy_time = t
+        highest_price = buy_price
+        sell_profit_price = buy_price * (1 + profit_percent / 100)
+        sell_loss_price = buy_price * (1 - loss_percent / 100)
+        if trailing_percent is not None:
+          trailing_stop_price = highest_price * (1 - trailing_percent / 100)
+      continue
+
+    if trailing_percent is None:
+      sell = current_price >= sell_profit_price or current_price <= sell_loss_price
+    else:
+      if current_price > highest_price:
+        highest_price = current_price
+        trailing_stop_price = highest_price * (1 - trailing_percent / 100)
+      sell = (current_price >= sell_profit_price or
+              current_price <= sell_loss_price or
+              (current_price > buy_price and current_price <= trailing_stop_price))
+
+    if sell:
+      quantity = target_amount / buy_price
+      cost = target_amount * (1 + buy_fee)
+      proceeds = quantity * current_price * (1 - sell_fee)
+      trades.append({
+        'buy_time': buy_time,
+        'buy_price': buy_price,
+        'sell_time': t,
+        'sell_price': current_price,
+        'pnl': proceeds - cost
+      })
+      holding = False
+      buy_target = current_price * (1 - dip_percent / 100)
+  return trades
+
+
+def run_vectorized(prices: np.ndarray,
+                   params: np.ndarray,
+                   target_amount: float = 100000,
+                   buy_fee: float = UPBIT_BUY_FEE,
+                   sell_fee: float = UPBIT_SELL_FEE) -> Dict[str, np.ndarray]:
+  """
+  여러 파라미터 조합을 한 번에 백테스트 (시간 축만 순회, 조합 축은 NumPy 벡터 연산)
+  :param prices: 가격 시계열
+  :param params: (조합 수, 4) 배열 [dip, profit, loss, trailing] (trailing 이 NaN 이면 trade_simple)
+  :param target_amount: 1회 매수 금액 (KRW)
+  :return: 조합별 pnl, max_drawdown, trades, wins, holding 배열
+  """
+  prices = np.asarray(prices, dtype=np.float64)
+  params = np.asarray(params, dtype=np.float64).reshape(-1, len(PARAMS))
+  n = len(params)
+  dip, profit, loss, trailing = params.T
+  use_trailing = ~np.isnan(trailing)
+  trailing = np.where(use_trailing, trailing, 0.0)
+
+  holding = np.zeros(n, dtype=bool)
+  buy_target = prices[0] * (1 - dip / 100)
+  dip_factor = 1 - dip / 100
+  profit_factor = 1 + profit / 100
+  loss_factor = 1 - loss / 100
+  trailing_factor = 1 - trailing / 100
+  buy_price = np.ones(n)
+  highest = np.zeros(n)
+  profit_price = np.full(n, np.inf)
+  loss_price = np.full(n, -np.inf)
+  trailing_price = np.full(n, -np.inf)
+  realized = np.zeros(n)
+  peak = np.zeros(n)
+  max_drawdown = np.zeros(n)
+  trades = np.zeros(n, dtype=np.int64)
+  wins = np.zeros(n, dtype=np.int64)
+  cost = target_amount * (1 + buy_fee)
+  sell_factor = target_amount * (1 - sell_fee)
+
+  # 루프 내 임시 배열 재사용
+  new_high = np.empty(n, dtype=bool)
+  sell = np.empty(n, dtype=bool)
+  buy = np.empty(n, dtype=bool)
+  mask = np.empty(n, dtype=bool)
+  pnl = np.empty(n)
+  equity = np.empty(n)
+
+  # 보유하지 않은 조합은 profit/loss/trailing 가격이 ±inf 이므로 매도 조건을 만족하지 않는다
+  for price in prices[1:]:
+    # 보유 중: 고점 갱신 후 매도 조건 확인 (DipTrader 와 같은 순서)
+    np.greater(price, highest, out=new_high)
+    new_high &= holding
+    new_high &= use_trailing
+    np.copyto(highest, price, where=new_high)
+    np.multiply(highest, trailing_factor, out=trailing_price, where=new_high)
+
+    np.greater_equal(price, profit_price, out=sell)
+    sell |= np.less_equal(price, loss_price, out=mask)
+    np.less_equal(price, trailing_price, out=mask)
+    mask &= np.less(buy_price, price)
+    sell |= mask
+
+    # 매도 시(또는 보유 평가) 손익
+    np.divide(sell_factor * price, buy_price, out=pnl)
+    pnl -= cost
+    np.add(realized, pnl, out=realized, where=sell)
+    trades += sell
+    wins += sell & (pnl > 0)
+
+    # 미청산 평가손익 포함 자산 기준 낙폭
+    np.copyto(equity, realized)
+    np.logical_and(holding, ~sell, out=mask)
+    np.add(realized, pnl, out=equity, where=mask)
+    np.maximum(peak, equity, out=peak)
+    np.maximum(max_drawdown, peak - equity, out=max_drawdown)
+
+    # 매도 후 현재가 기준으로 다음 매수 목표가 설정하고 매도 가격 초기화
+    np.multiply(dip_factor, price, out=buy_target, where=sell)
+    np.copyto(profit_price, np.inf, where=sell)
+    np.copyto(loss_price, -np.inf, where=sell)
+    np.copyto(trailing_price, -np.inf, where=sell)
+
+    # 대기 중: 매수 조건 확인 (매도한 틱에서는 매수하지 않음)
+    np.less_equal(price, buy_target, out=buy)
+    buy &= ~holding
+    holding &= ~sell
+    holding |= buy
+    np.copyto(buy_price, price, where=buy)
+    np.copyto(highest, price, where=buy)
+    np.multiply(profit_factor, price, out=profit_price, where=buy)
+    np.multiply(loss_factor, price, out=loss_price, where=buy)
+    np.copyto(trailing_price, np.where(use_trailing, price * trailing_factor, -np.inf), where=buy)
+
+  return {
+    'pnl': realized,
+    'max_drawdown': max_drawdown,
+    'trades': trades,
+    'wins': wins,
+    'holding': holding
+  }
+
+
+def param_grid(dip_percent: Sequence[float],
+               profit_percent: Sequence[float],
+               loss_percent: Sequence[float],
+               trailing_percent: Sequence[Optional[float]] = (None,)) -> np.ndarray:
+  """
+  파라미터 조합 생성 (trailing_percent 의 None 은 trade_simple)
+  :return: (조합 수, 4) 배열
+  """
+  trailing = [np.nan if value is None else value for value in trailing_percent]
+  return np.array(list(itertools.product(dip_percent, profit_percent, loss_percent, trailing)), dtype=np.float64)
+
+
+def _run_chunk(args):
+  prices, params, target_amount, buy_fee, sell_fee = args
+  return run_vectorized(prices, params, target_amount, buy_fee, sell_fee)
+
+
+def sweep(prices: Sequence[float],
+          params: np.ndarray,
+          target_amount: float = 100000,
+          processes: Optional[int] = None,
+          chunk_size: Optional[int] = None,
+          buy_fee: float = UPBIT_BUY_FEE,
+          sell_fee: float = UPBIT_SELL_FEE) -> pd.DataFrame:
+  """
+  파라미터 그리드 전체 백테스트 (조합을 묶음 단위로 나누어 프로세스 풀에서 실행)
+  :param prices: 가격 시계열
+  :param params: param_grid 결과
+  :param target_amount: 1회 매수 금액 (KRW)
+  :param processes: 프로세스 수 (None이면 CPU 코어 수, 1이면 현재 프로세스에서 실행)
+  :param chunk_size: 프로세스 1회 작업당 조합 수 (None이면 프로세스 수로 균등 분할)
+  :return: 조합별 파라미터와 PnL / 낙폭 / 거래 수 (pnl 내림차순)
+  """
+  prices = np.asarray(prices, dtype=np.float64)
+  params = np.asarray(params, dtype=np.float64).reshape(-1, len(PARAMS))
+  processes = processes or os.cpu_count() or 1
+  # 조합 수가 클수록 시간 축 순회 비용이 분산되므로 묶음은 크게 유지
+  chunk_size = chunk_size or max(1, -(-len(params) // processes))
+  chunks = [(prices, params[i:i + chunk_size], target_amount, buy_fee, sell_fee)
+            for i in range(0, len(params), chunk_size)]
+
+  if processes == 1 or len(chunks) == 1:
+    results = [_run_chunk(chunk) for chunk in chunks]
+  else:
+    with ProcessPoolExecutor(max_workers=min(processes, len(chunks))) as executor:
+      results = list(executor.map(_run_chunk, chunks))
+
+  df = pd.DataFrame(params, columns=list(PARAMS))
+  for key in ('pnl', 'max_drawdown', 'trades', 'wins', 'holding'):
+    df[key] = np.concatenate([result[key] for result in results]) if results else []
+  df['pnl_percent'] = df['pnl'] / target_amount * 100
+  df['max_drawdown_percent'] = df['max_drawdown'] / target_amount * 100
+  df['win_rate'] = df['wins'] / df['trades'].clip(lower=1) * 100
+  return df.sort_values('pnl', ascending=False, kind='stable').reset_index(drop=True)
+
+
+# 사용 예시: 저장된 1분봉 종가로 파라미터 탐색
+if __name__ == "__main__":
+  from collector.store import CandleStore
+
+  candles = CandleStore().read('BTC/KRW', '1m')
+  if len(candles) == 0:
+    print("저장된 캔들이 없습니다. python -m collector.backfill --symbols BTC/KRW 로 먼저 받아주세요.")
+  else:
+    grid = param_grid(
+      dip_percent=np.arange(0.5, 5.01, 0.25),
+      profit_percent=np.arange(1.0, 10.01, 0.5),
+      loss_percent=np.arange(1.0, 6.01, 0.5),
+      trailing_percent=[None, 0.5, 1.0, 1.5, 2.0]
+    )
+    result = sweep(candles[:, 4], grid)
+    print(f"조합 수: {len(grid):,}, 캔들 수: {len(candles):,}")
+    print(result.head(20).to_string())
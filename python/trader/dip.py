@@ -2,13 +2,46 @@ import time
 from typing import Optional, Dict
 from datetime import datetime
 from trader.direct import UpbitTrader
-from collector.account import UpbitAccount
+from collector.stream import PollingPriceSource
+from collector.metrics import order_latency
+from trader.orders import FILL_TIMEOUT
+from trader.trailing import ATR_MULTIPLIER, trail_price, update_indicators
+from collector.incremental import ATR, WilderRSI, TickBars
+
+# RSI 매수 진입 기본 기준 (이 값 미만일 때만 매수)
+RSI_BELOW = 30.0
 
 
 class DipTrader:
-  def __init__(self):
-    self.trader = UpbitTrader()
-    self.account = UpbitAccount()
+  def __init__(self, price_source=None, fill_timeout: float = FILL_TIMEOUT, trader: Optional[UpbitTrader] = None):
+    """
+    :param price_source: 가격 소스 (UpbitPriceStream 등, None인 경우 fetch_ticker 폴링)
+    :param fill_timeout: 매수 주문 체결 완료 대기 시간 (초)
+    :param trader: 주문 실행기 (None인 경우 UpbitTrader 생성)
+    """
+    self.trader = trader or UpbitTrader()
+    self.account = self.trader.account
+    self.prices = price_source or PollingPriceSource(self.trader.exchange)
+    # 스트림이 호가창을 수신 중이면 시장가 매도 검증에 사용 (없으면 호가 조회)
+    validator = getattr(self.trader, 'validator', None)
+    if validator is not None and validator.books is None and hasattr(self.prices, 'get_book'):
+      validator.books = self.prices
+    self.fill_timeout = fill_timeout
+
+  def _filled_quantity(self, order: Dict) -> float:
+    """
+    매수 주문의 실제 체결 수량 (체결 완료까지 대기, 시간 초과 시 그때까지 체결된 수량, 확인되지 않으면 0)
+    시장가 매수 주문의 amount 는 주문 금액(KRW)이고 응답 시점에는 체결되지 않은 경우가 많아 매도 수량으로 쓸 수 없다.
+    """
+    tracked = self.trader.orders.wait(order['id'], self.fill_timeout) or self.trader.orders.get(order['id']) or {}
+    return float(tracked.get('filled') or 0)
+
+  @staticmethod
+  def _rsi_allows(rsi: Optional[WilderRSI], rsi_below: float) -> bool:
+    """
+    RSI 매수 조건 (RSI 미지정 시 항상 허용, 지정 시 RSI 가 준비되고 기준 미만일 때만)
+    """
+    return rsi is None or (rsi.ready and rsi.value < rsi_below)
 
   def trade_simple(self,
                   symbol: str,
@@ -16,7 +49,10 @@ class DipTrader:
                   dip_percent: float = 1.0,
                   profit_percent: float = 5.0,
                   loss_percent: float = 3.0,
-                  check_interval: float = 1.0) -> Dict:
+                  check_interval: float = 1.0,
+                  rsi: Optional[WilderRSI] = None,
+                  rsi_below: float = RSI_BELOW,
+                  bars: Optional[TickBars] = None) -> Dict:
     """
     단순 딥 매매: 하락 시 매수 후 목표 수익률 도달 또는 손절 시 매도
     :param symbol: 거래쌍 (예: 'BTC/KRW')
@@ -25,14 +61,19 @@ class DipTrader:
     :param profit_percent: 목표 수익률 (예: 5.0 = 5%)
     :param loss_percent: 손절 기준 하락률 (예: 3.0 = 3%)
     :param check_interval: 가격 체크 간격 (초)
+    :param rsi: 지정 시 RSI 가 rsi_below 미만일 때만 매수 (틱을 봉으로 묶어 갱신)
+    :param rsi_below: RSI 매수 기준
+    :param bars: RSI 에 공급할 틱 봉 (None인 경우 1분봉)
     :return: 매도 결과
     """
     try:
       # 초기 가격 설정
-      ticker = self.trader.exchange.fetch_ticker(symbol)
-      initial_price = ticker['last']
+      initial_price = self.prices.get_price(symbol)
       buy_price = initial_price * (1 - dip_percent / 100)  # 매수 목표가
       
+      if rsi is not None and bars is None:
+        bars = TickBars()
+      
       print(f"\n[{datetime.now()}] 딥 매매 시작")
       print(f"현재 가격: {initial_price}")
       print(f"매수 목표가: {buy_price} ({dip_percent}% 하락 시)")
@@ -40,16 +81,20 @@ class DipTrader:
       # 매수 대기
       while True:
         try:
-          ticker = self.trader.exchange.fetch_ticker(symbol)
-          current_price = ticker['last']
+          current_price = self.prices.get_price(symbol)
+          observed_at = time.perf_counter()
+          
+          if bars is not None:
+            update_indicators(bars, current_price, rsi=rsi)
           
           # 매수 조건 확인
-          if current_price <= buy_price:
+          if current_price <= buy_price and self._rsi_allows(rsi, rsi_below):
             print(f"\n[{datetime.now()}] 매수 목표가 도달! 매수 실행")
             print(f"현재가: {current_price}")
             
             # 매수 실행
-            buy_result = self.trader.buy(symbol, target_amount, price=None)
+            with order_latency('dip_simple', observed_at):
+              buy_result = self.trader.buy(symbol, target_amount, price=None)
             if not buy_result:
               print("매수 실패!")
               return None
@@ -65,19 +110,23 @@ class DipTrader:
             
             # 매도 대기
             while True:
-              ticker = self.trader.exchange.fetch_ticker(symbol)
-              current_price = ticker['last']
+              current_price = self.prices.get_price(symbol)
+              observed_at = time.perf_counter()
               
               # 익절 또는 손절 조건 확인
               if current_price >= sell_profit_price or current_price <= sell_loss_price:
                 print(f"\n[{datetime.now()}] 매도 조건 도달! 매도 실행")
                 print(f"현재가: {current_price}")
                 
-                # 매도 수량 계산 (매수한 수량)
-                quantity = float(buy_result['amount'])
+                # 매도 수량 계산 (실제 체결된 매수 수량)
+                quantity = self._filled_quantity(buy_result)
+                if not quantity:
+                  print(f"매수 주문 {buy_result['id']} 체결 수량 확인 실패: 매도 생략")
+                  return None
                 
                 # 매도 실행
-                sell_result = self.trader.sell(symbol, quantity, price=None)
+                with order_latency('dip_simple', observed_at):
+                  sell_result = self.trader.sell(symbol, quantity, price=None, reference=current_price)
                 if sell_result:
                   profit_percent_actual = ((current_price - buy_price) / buy_price) * 100
                   print("매도 성공!")
@@ -88,11 +137,14 @@ class DipTrader:
                   print("매도 실패!")
                   return None
               
-              time.sleep(check_interval)
+              self.prices.wait(symbol, check_interval)
+          
+          # 매수 조건 미충족: 다음 가격 확인까지 대기
+          self.prices.wait(symbol, check_interval)
               
         except Exception as e:
           print(f"가격 조��� 중 오류 발생: {str(e)}")
-          time.sleep(check_interval)
+          self.prices.wait(symbol, check_interval)
           continue
           
     except Exception as e:
@@ -106,7 +158,12 @@ class DipTrader:
                     profit_percent: float = 5.0,
                     loss_percent: float = 3.0,
                     trailing_percent: float = 1.0,
-                    check_interval: float = 1.0) -> Dict:
+                    check_interval: float = 1.0,
+                    rsi: Optional[WilderRSI] = None,
+                    rsi_below: float = RSI_BELOW,
+                    atr: Optional[ATR] = None,
+                    atr_multiplier: float = ATR_MULTIPLIER,
+                    bars: Optional[TickBars] = None) -> Dict:
     """
     Trailing Stop을 활용한 딥 매매
     :param symbol: 거래쌍 (예: 'BTC/KRW')
@@ -116,14 +173,21 @@ class DipTrader:
     :param loss_percent: 손절 기준 하락률 (예: 3.0 = 3%)
     :param trailing_percent: Trailing Stop 기준 하락률 (예: 1.0 = 1%)
     :param check_interval: 가격 체크 간격 (초)
+    :param rsi: 지정 시 RSI 가 rsi_below 미만일 때만 매수 (틱을 봉으로 묶어 갱신)
+    :param rsi_below: RSI 매수 기준
+    :param atr: 지정 시 ATR 이 준비된 후 고점 대비 atr_multiplier * ATR 하락을 Trailing Stop 으로 사용
+    :param atr_multiplier: ATR 배수
+    :param bars: 지표에 공급할 틱 봉 (None인 경우 1분봉)
     :return: 매도 결과
     """
     try:
       # 초기 가격 설정
-      ticker = self.trader.exchange.fetch_ticker(symbol)
-      initial_price = ticker['last']
+      initial_price = self.prices.get_price(symbol)
       buy_price = initial_price * (1 - dip_percent / 100)  # 매수 목표가
       
+      if (rsi is not None or atr is not None) and bars is None:
+        bars = TickBars()
+      
       print(f"\n[{datetime.now()}] Trailing 딥 매매 시작")
       print(f"현재 가격: {initial_price}")
       print(f"매수 목표가: {buy_price} ({dip_percent}% 하락 시)")
@@ -131,16 +195,20 @@ class DipTrader:
       # 매수 대기
       while True:
         try:
-          ticker = self.trader.exchange.fetch_ticker(symbol)
-          current_price = ticker['last']
+          current_price = self.prices.get_price(symbol)
+          observed_at = time.perf_counter()
+          
+          if bars is not None:
+            update_indicators(bars, current_price, atr=atr, rsi=rsi)
           
           # 매수 조건 확인
-          if current_price <= buy_price:
+          if current_price <= buy_price and self._rsi_allows(rsi, rsi_below):
             print(f"\n[{datetime.now()}] 매수 목표가 도달! 매수 실행")
             print(f"현재가: {current_price}")
             
             # 매수 실행
-            buy_result = self.trader.buy(symbol, target_amount, price=None)
+            with order_latency('dip_trailing', observed_at):
+              buy_result = self.trader.buy(symbol, target_amount, price=None)
             if not buy_result:
               print("매수 실패!")
               return None
@@ -149,7 +217,7 @@ class DipTrader:
             highest_price = buy_price  # Trailing Stop을 위한 고점 가격
             sell_profit_price = buy_price * (1 + profit_percent / 100)  # 초기 익절가
             sell_loss_price = buy_price * (1 - loss_percent / 100)    # 손절가
-            trailing_stop_price = highest_price * (1 - trailing_percent / 100)  # Trailing Stop 가격
+            trailing_stop_price = trail_price(highest_price, trailing_percent, -1, atr, atr_multiplier)  # Trailing Stop 가격
             
             print("매수 성공!")
             print(f"매수 가격: {buy_price}")
@@ -159,13 +227,17 @@ class DipTrader:
             
             # 매도 대기
             while True:
-              ticker = self.trader.exchange.fetch_ticker(symbol)
-              current_price = ticker['last']
+              current_price = self.prices.get_price(symbol)
+              observed_at = time.perf_counter()
+              
+              # 봉 마감 시 지표 갱신 (ATR 변경 반영, Trailing Stop 가격은 올리기만 함)
+              if bars is not None and update_indicators(bars, current_price, atr=atr, rsi=rsi) and atr is not None:
+                trailing_stop_price = max(trailing_stop_price, trail_price(highest_price, trailing_percent, -1, atr, atr_multiplier))
               
               # 고점 갱신 시 Trailing Stop 가격 수정
               if current_price > highest_price:
                 highest_price = current_price
-                trailing_stop_price = highest_price * (1 - trailing_percent / 100)
+                trailing_stop_price = max(trailing_stop_price, trail_price(highest_price, trailing_percent, -1, atr, atr_multiplier))
                 print(f"[{datetime.now()}] 신규 고점: {highest_price}, Trailing Stop 가격: {trailing_stop_price}")
               
               # 익절, 손절, 또는 Trailing Stop 조건 확인
@@ -176,11 +248,15 @@ class DipTrader:
                 print(f"\n[{datetime.now()}] 매도 조건 도달! 매도 실행")
                 print(f"현재가: {current_price}")
                 
-                # 매도 수량 계산 (매수한 수량)
-                quantity = float(buy_result['amount'])
+                # 매도 수량 계산 (실제 체결된 매수 수량)
+                quantity = self._filled_quantity(buy_result)
+                if not quantity:
+                  print(f"매수 주문 {buy_result['id']} 체결 수량 확인 실패: 매도 생략")
+                  return None
                 
                 # 매도 실행
-                sell_result = self.trader.sell(symbol, quantity, price=None)
+                with order_latency('dip_trailing', observed_at):
+                  sell_result = self.trader.sell(symbol, quantity, price=None, reference=current_price)
                 if sell_result:
                   profit_percent_actual = ((current_price - buy_price) / buy_price) * 100
                   print("매도 성공!")
@@ -191,11 +267,14 @@ class DipTrader:
                   print("매도 실패!")
                   return None
               
-              time.sleep(check_interval)
+              self.prices.wait(symbol, check_interval)
+          
+          # 매수 조건 미충족: 다음 가격 확인까지 대기
+          self.prices.wait(symbol, check_interval)
               
         except Exception as e:
           print(f"가격 조회 중 오류 발생: {str(e)}")
-          time.sleep(check_interval)
+          self.prices.wait(symbol, check_interval)
           continue
           
     except Exception as e:
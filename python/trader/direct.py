@@ -1,8 +1,13 @@
 from collector.account import UpbitAccount
-import os
-import ccxt
-from dotenv import load_dotenv
-from typing import Optional, Dict
+from collector.session import get_exchange
+from collector.orderbook import OrderBook, BUY, SELL
+from collector.ledger import get_ledger
+from trader.orders import get_tracker
+from collector.scheduler import ORDER_RATE
+from trader.validator import OrderValidator, OrderValidationError
+from settings.constants import UPBIT_BUY_FEE
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Iterable, List
 import sys
 from pathlib import Path
 
@@ -12,18 +17,42 @@ if project_root not in sys.path:
   sys.path.append(project_root)
 
 
-# .env 파일 로드
-load_dotenv()
-
-
 class UpbitTrader:
   def __init__(self):
-    # Upbit API 인증 정보 설정
-    self.exchange = ccxt.upbit({
-      'apiKey': os.getenv('UPBIT_ACCESS_KEY'),
-      'secret': os.getenv('UPBIT_SECRET_KEY')
-    })
+    # 공유 Upbit 클라이언트 (UpbitAccount 와 동일 인스턴스)
+    self.exchange = get_exchange()
     self.account = UpbitAccount()
+    # 주문 결과를 즉시 반영하는 로컬 잔고 (거래소 잔고와 백그라운드 동기화)
+    self.ledger = get_ledger(self.exchange)
+    # 주문 체결 추적 (체결분은 로컬 잔고에 반영)
+    self.orders = get_tracker(self.exchange, self.ledger)
+    # 주문 전 로컬 검증 (호가 단위, 최소 주문 금액, 주문 가능 잔고)
+    self.validator = OrderValidator(self.ledger, self.exchange)
+
+  def _create_order(self, symbol: str, side: str, amount: float, price: Optional[float] = None, reference: Optional[float] = None) -> Dict:
+    """
+    주문 생성 후 로컬 잔고 반영 및 체결 추적 시작 (실패 시 예외 발생)
+    지정가는 호가 단위로 조정되며, 검증에 실패하면 주문하지 않고 OrderValidationError 가 발생한다.
+    """
+    # 기준 잔고를 주문 전에 로드 (주문 후 처음 로드하면 이미 반영된 주문을 한 번 더 반영함)
+    self.ledger.ensure_loaded()
+    amount, price = self.validator.validate(symbol, side, amount, price, reference)
+    if side == BUY:
+      if price is None:
+        # 시장가 매수 (amount: KRW 금액)
+        order = self.exchange.create_market_buy_order(symbol=symbol, amount=amount)
+      else:
+        order = self.exchange.create_limit_buy_order(symbol=symbol, amount=amount, price=price)
+    elif side == SELL:
+      if price is None:
+        order = self.exchange.create_market_sell_order(symbol=symbol, amount=amount)
+      else:
+        order = self.exchange.create_limit_sell_order(symbol=symbol, amount=amount, price=price)
+    else:
+      raise ValueError(f"알 수 없는 주문 방향: {side}")
+    self.ledger.apply_order(order)
+    self.orders.track(order)
+    return order
 
   def buy(self, symbol: str, amount: float, price: Optional[float] = None):
     """
@@ -34,51 +63,50 @@ class UpbitTrader:
     :return: 주문 정보
     """
     try:
-      if price is None:
-        # 시장가 매수
-        order = self.exchange.create_market_buy_order(
-          symbol=symbol,
-          amount=amount,
-        )
-      else:
-        # 지정가 매수
-        order = self.exchange.create_limit_buy_order(
-          symbol=symbol,
-          amount=amount,
-          price=price,
-        )
-      return order
+      return self._create_order(symbol, BUY, amount, price)
+    except OrderValidationError as e:
+      print(f"매수 주문 검증 실패: {str(e)}")
+      return None
     except Exception as e:
       print(f"매수 주문 실패: {str(e)}")
       return None
 
-  def sell(self, symbol: str, amount: float, price: Optional[float] = None):
+  def sell(self, symbol: str, amount: float, price: Optional[float] = None, reference: Optional[float] = None):
     """
     매도 주문 (시장가/지정가)
     :param symbol: 거래쌍 (예: 'BTC/KRW')
     :param amount: 매도할 코인 수량
     :param price: 매도 희망가격 (None인 경우 시장가 주문)
+    :param reference: 시장가 매도 검증용 현재가 (매매 루프에서 확인한 가격, None이면 호가 확인)
     :return: 주문 정보
     """
     try:
-      if price is None:
-        # 시장가 매도
-        order = self.exchange.create_market_sell_order(
-          symbol=symbol,
-          amount=amount,
-        )
-      else:
-        # 지정가 매도
-        order = self.exchange.create_limit_sell_order(
-          symbol=symbol,
-          amount=amount,
-          price=price,
-        )
-      return order
+      return self._create_order(symbol, SELL, amount, price, reference)
+    except OrderValidationError as e:
+      print(f"매도 주문 검증 실패: {str(e)}")
+      return None
     except Exception as e:
       print(f"매도 주문 실패: {str(e)}")
       return None
 
+  def estimate_market_order(self, symbol: str, side: str, amount: float, book: Optional[OrderBook] = None) -> Optional[Dict]:
+    """
+    시장가 주문의 예상 체결가와 슬리피지 계산 (주문하지 않음)
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :param side: 'buy' / 'sell'
+    :param amount: 매수 금액 (KRW, buy) 또는 매도 수량 (sell) - buy/sell 과 동일
+    :param book: 이미 조회한 호가창 (None이면 조회)
+    :return: 평균 체결가, 체결 수량, 체결 금액, 소진 호가 수, 전량 체결 여부, 슬리피지(%)
+    """
+    try:
+      book = book or OrderBook.from_ccxt(self.exchange.fetch_order_book(symbol))
+      if side == BUY:
+        return book.vwap(BUY, cost=amount)
+      return book.vwap(SELL, amount=amount)
+    except Exception as e:
+      print(f"체결 예상 계산 실패: {str(e)}")
+      return None
+
   def sell_ratio(self, symbol: str, ratio: float, price: Optional[float] = None) -> Dict:
     """
     보유 수량 중 일정 비율만큼 매도
@@ -91,17 +119,11 @@ class UpbitTrader:
       if not 0 <= ratio <= 1:
         raise ValueError("ratio는 0과 1 사이의 값이어야 합니다.")
 
-      # 보유 수량 조회
+      # 보유 수량 조회 (로컬 잔고)
       currency = symbol.split('/')[0]
-      balances = self.account.get_balances()
-      available_amount = None
+      available_amount = self.ledger.free(currency)
 
-      for balance in balances:
-        if balance['currency'] == currency:
-          available_amount = float(balance['free'])
-          break
-
-      if available_amount is None or available_amount == 0:
+      if available_amount <= 0:
         raise ValueError(f"보유한 {currency}가 없습니다.")
 
       # 매도할 수량 계산
@@ -130,20 +152,14 @@ class UpbitTrader:
       if not 0 <= ratio <= 1:
         raise ValueError("ratio는 0과 1 사이의 값이어야 합니다.")
 
-      # 보유 KRW 조회
-      balances = self.account.get_balances()
-      available_krw = None
-
-      for balance in balances:
-        if balance['currency'] == 'KRW':
-          available_krw = float(balance['free'])
-          break
+      # 보유 KRW 조회 (로컬 잔고)
+      available_krw = self.ledger.free('KRW')
 
-      if available_krw is None or available_krw == 0:
+      if available_krw <= 0:
         raise ValueError("보유한 KRW가 없습니다.")
 
-      # 매수할 금액 계산
-      buy_amount = available_krw * ratio
+      # 매수할 금액 계산 (수수료를 포함해 주문 가능 금액을 넘지 않도록)
+      buy_amount = min(available_krw * ratio, available_krw / (1 + UPBIT_BUY_FEE))
 
       print(f"매수 비율: {ratio * 100}%")
       print(f"사용 가능 KRW: {available_krw:,.0f} KRW")
@@ -157,6 +173,70 @@ class UpbitTrader:
       return None
 
 
+  def _run_many(self, func, items: List, max_workers: int) -> List:
+    if not items:
+      return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+      futures = [executor.submit(func, item) for item in items]
+      results = []
+      for item, future in zip(items, futures):
+        try:
+          results.append((item, future.result(), None))
+        except Exception as e:
+          results.append((item, None, str(e)))
+      return results
+
+  def place_orders(self, orders: Iterable[Dict], max_workers: int = ORDER_RATE) -> List[Dict]:
+    """
+    여러 주문 동시 실행 (요청 제한은 공유 스케줄러의 order 버킷에서 처리)
+    :param orders: 주문 목록 [{'symbol', 'side': 'buy'/'sell', 'amount', 'price'(None이면 시장가)}, ...]
+    :param max_workers: 동시 요청 수
+    :return: 주문별 결과 (입력 순서, 'order' 또는 실패 시 'error')
+    """
+    results = []
+    for spec, order, error in self._run_many(
+        lambda spec: self._create_order(spec['symbol'], spec['side'], spec['amount'], spec.get('price')),
+        list(orders), max_workers):
+      if error is not None:
+        print(f"주문 실패 ({spec['symbol']} {spec['side']}): {error}")
+      results.append(dict(spec, order=order, error=error))
+    return results
+
+  def cancel_orders(self, orders: Iterable[Dict], max_workers: int = ORDER_RATE) -> List[Dict]:
+    """
+    여러 주문 동시 취소
+    :param orders: 취소할 주문 목록 [{'id', 'symbol'}, ...] (ccxt 주문 정보 그대로 사용 가능)
+    :param max_workers: 동시 요청 수
+    :return: 주문별 결과 (입력 순서, 'result' 또는 실패 시 'error')
+    """
+    def cancel(order):
+      result = self.exchange.cancel_order(order['id'], order['symbol'])
+      # 취소 응답은 아직 미체결(wait) 상태이므로, 원장이 모르는 주문(시작 전 주문 등)은 거래소 잔고에
+      # 반영된 상태 그대로 등록하고 최종 상태(canceled)를 추적하여 남은 예약분을 해제
+      self.ledger.adopt_order(result)
+      self.orders.track(result)
+      return result
+
+    results = []
+    for order, result, error in self._run_many(cancel, list(orders), max_workers):
+      if error is not None:
+        print(f"주문 취소 실패 ({order['id']}): {error}")
+      results.append({'id': order['id'], 'symbol': order['symbol'], 'result': result, 'error': error})
+    return results
+
+  def cancel_all(self, symbols: Optional[Iterable[str]] = None, max_workers: int = ORDER_RATE) -> List[Dict]:
+    """
+    미체결 주문 전체 취소
+    :param symbols: 거래쌍 목록 (None이면 전체 마켓)
+    :param max_workers: 동시 요청 수
+    :return: 주문별 취소 결과
+    """
+    if symbols is None:
+      open_orders = self.exchange.fetch_open_orders()
+    else:
+      open_orders = [order for symbol in symbols for order in self.exchange.fetch_open_orders(symbol)]
+    return self.cancel_orders(open_orders, max_workers)
+
 # 사용 예시
 if __name__ == "__main__":
   trader = UpbitTrader()
@@ -0,0 +1,270 @@
+import time
+import heapq
+import itertools
+from typing import Optional, Dict, List
+from datetime import datetime
+from trader.direct import UpbitTrader
+from collector.stream import PollingPriceSource
+from collector.metrics import order_latency
+
+STOP = 'stop'  # Trailing Stop (고점 대비 하락 시 매도)
+BUY = 'buy'    # Trailing Buy (저점 대비 상승 시 매수)
+
+
+class TrailingOrder:
+  """
+  엔진이 관리하는 Trailing 주문 1건
+  """
+  __slots__ = ('id', 'symbol', 'side', 'trail_percent', 'amount',
+               'extreme', 'level', 'version', 'active', 'result')
+
+  def __init__(self, id: int, symbol: str, side: str, trail_percent: float, amount: float, price: float):
+    self.id = id
+    self.symbol = symbol
+    self.side = side
+    self.trail_percent = trail_percent
+    self.amount = amount        # 매도 수량(STOP) 또는 매수 금액(BUY)
+    self.version = 0
+    self.active = True
+    self.result = None
+    self.reset(price)
+
+  def reset(self, price: float):
+    """
+    고점(STOP)/저점(BUY)과 발동 가격 갱신
+    """
+    self.extreme = price
+    if self.side == STOP:
+      self.level = price * (1 - self.trail_percent / 100)
+    else:
+      self.level = price * (1 + self.trail_percent / 100)
+    self.version += 1
+
+
+def _valid(entry) -> bool:
+  _, version, _, order = entry
+  return order.active and order.version == version
+
+
+class _SymbolBook:
+  """
+  심볼별 인덱스 (lazy deletion 힙)
+  - stop_extremes: 고점 최소 힙 -> 신고가에 갱신될 주문만 꺼냄
+  - stop_levels: Stop 가격 최대 힙 -> 발동될 주문만 꺼냄
+  - buy_extremes: 저점 최대 힙, buy_levels: Buy 가격 최소 힙
+  """
+  __slots__ = ('stop_extremes', 'stop_levels', 'buy_extremes', 'buy_levels', 'active')
+
+  def __init__(self):
+    self.stop_extremes = []
+    self.stop_levels = []
+    self.buy_extremes = []
+    self.buy_levels = []
+    self.active = 0
+
+  def push(self, order: TrailingOrder):
+    entry = (order.version, order.id, order)
+    if order.side == STOP:
+      heapq.heappush(self.stop_extremes, (order.extreme,) + entry)
+      heapq.heappush(self.stop_levels, (-order.level,) + entry)
+    else:
+      heapq.heappush(self.buy_extremes, (-order.extreme,) + entry)
+      heapq.heappush(self.buy_levels, (order.level,) + entry)
+
+  def compact(self):
+    """
+    무효 항목이 쌓인 힙 재구성 (갱신/취소된 주문 제거)
+    """
+    limit = 4 * self.active + 64
+    for name in self.__slots__[:4]:
+      heap = getattr(self, name)
+      if len(heap) > limit:
+        heap = [entry for entry in heap if _valid(entry)]
+        heapq.heapify(heap)
+        setattr(self, name, heap)
+
+
+class TrailingEngine:
+  """
+  여러 심볼의 Trailing Stop / Trailing Buy 를 하나의 루프에서 관리
+  가격 갱신 시 해당 가격으로 고점/저점이 바뀌거나 발동되는 주문만 힙에서 꺼내 처리한다.
+  """
+  def __init__(self, price_source=None, trader: Optional[UpbitTrader] = None):
+    """
+    :param price_source: 가격 소스 (None인 경우 fetch_tickers 일괄 폴링)
+    :param trader: 주문 실행기 (None인 경우 UpbitTrader 생성)
+    """
+    self.trader = trader or UpbitTrader()
+    self.account = self.trader.account
+    self.prices = price_source or PollingPriceSource(self.trader.exchange)
+    self.orders: Dict[int, TrailingOrder] = {}
+    self.books: Dict[str, _SymbolBook] = {}
+    self._ids = itertools.count(1)
+
+  def _add(self, symbol: str, side: str, trail_percent: float, amount: float, initial_price: Optional[float]) -> int:
+    if initial_price is None:
+      initial_price = self.prices.get_price(symbol)
+    order = TrailingOrder(next(self._ids), symbol, side, trail_percent, amount, initial_price)
+    self.orders[order.id] = order
+    book = self.books.setdefault(symbol, _SymbolBook())
+    book.active += 1
+    book.push(order)
+    self.prices.subscribe([symbol])
+    return order.id
+
+  def add_trailing_stop(self,
+                        symbol: str,
+                        trail_percent: float,
+                        quantity: Optional[float] = None,
+                        initial_price: Optional[float] = None) -> int:
+    """
+    Trailing Stop 등록
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :param trail_percent: 고점 대비 하락 허용 비율 (예: 1.0 = 1%)
+    :param quantity: 매도할 수량 (None인 경우 전량 매도)
+    :param initial_price: 시작 가격 (None인 경우 현재가로 설정)
+    :return: 주문 ID
+    """
+    if quantity is None:
+      balance = self.trader.ledger.get(symbol.split('/')[0])
+      if balance is not None and balance['total'] > 0:
+        quantity = balance['free']
+      if quantity is None:
+        raise ValueError(f"보유한 {symbol.split('/')[0]}가 없습니다.")
+    return self._add(symbol, STOP, trail_percent, quantity, initial_price)
+
+  def add_trailing_buy(self,
+                       symbol: str,
+                       trail_percent: float,
+                       target_amount: float,
+                       initial_price: Optional[float] = None) -> int:
+    """
+    Trailing Buy 등록
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :param trail_percent: 저점 대비 상승 허용 비율 (예: 1.0 = 1%)
+    :param target_amount: 매수할 금액 (KRW)
+    :param initial_price: 시작 가격 (None인 경우 현재가로 설정)
+    :return: 주문 ID
+    """
+    return self._add(symbol, BUY, trail_percent, target_amount, initial_price)
+
+  def cancel(self, order_id: int):
+    """
+    등록된 주문 취소 (힙 항목은 lazy deletion)
+    """
+    order = self.orders.get(order_id)
+    if order is not None and order.active:
+      order.active = False
+      self.books[order.symbol].active -= 1
+
+  @property
+  def active_symbols(self) -> List[str]:
+    return [symbol for symbol, book in self.books.items() if book.active > 0]
+
+  def on_price(self, symbol: str, price: float) -> List[TrailingOrder]:
+    """
+    가격 갱신 처리
+    :param symbol: 거래쌍
+    :param price: 현재가
+    :return: 발동된 주문 목록 (비활성화됨)
+    """
+    book = self.books.get(symbol)
+    if book is None or book.active == 0:
+      return []
+    triggered = []
+
+    # 신규 고점: 고점이 현재가보다 낮은 Stop 주문만 갱신
+    while book.stop_extremes and book.stop_extremes[0][0] < price:
+      entry = heapq.heappop(book.stop_extremes)
+      if _valid(entry):
+        order = entry[3]
+        order.reset(price)
+        book.push(order)
+
+    # Stop 발동: Stop 가격이 현재가 이상인 주문만 꺼냄
+    while book.stop_levels and -book.stop_levels[0][0] >= price:
+      entry = heapq.heappop(book.stop_levels)
+      if _valid(entry):
+        triggered.append(entry[3])
+
+    # 신규 저점: 저점이 현재가보다 높은 Buy 주문만 갱신
+    while book.buy_extremes and -book.buy_extremes[0][0] > price:
+      entry = heapq.heappop(book.buy_extremes)
+      if _valid(entry):
+        order = entry[3]
+        order.reset(price)
+        book.push(order)
+
+    # Buy 발동: Buy 가격이 현재가 이하인 주문만 꺼냄
+    while book.buy_levels and book.buy_levels[0][0] <= price:
+      entry = heapq.heappop(book.buy_levels)
+      if _valid(entry):
+        triggered.append(entry[3])
+
+    for order in triggered:
+      order.active = False
+      book.active -= 1
+    book.compact()
+    return triggered
+
+  def execute(self, order: TrailingOrder, price: float, observed_at: Optional[float] = None):
+    """
+    발동된 주문을 시장가로 실행
+    :param observed_at: 가격을 받은 시각 (time.perf_counter, 지연 시간 기록용)
+    """
+    if order.side == STOP:
+      print(f"\n[{datetime.now()}] {order.symbol} Stop 가격 도달! 매도 실행")
+      print(f"현재가: {price} / Stop 가격: {order.level}")
+      with order_latency('engine_stop', observed_at):
+        order.result = self.trader.sell(order.symbol, order.amount, price=None, reference=price)
+    else:
+      print(f"\n[{datetime.now()}] {order.symbol} Buy 가격 도달! 매수 실행")
+      print(f"현재가: {price} / Buy 가격: {order.level}")
+      with order_latency('engine_buy', observed_at):
+        order.result = self.trader.buy(order.symbol, order.amount, price=None)
+    print("주문 성공!" if order.result else "주문 실패!")
+
+  def tick(self) -> List[TrailingOrder]:
+    """
+    활성 심볼 전체 가격을 한 번에 조회하여 처리
+    :return: 이번 틱에 발동된 주문 목록
+    """
+    symbols = self.active_symbols
+    if not symbols:
+      return []
+    prices = self.prices.get_prices(symbols)
+    observed_at = time.perf_counter()
+    triggered = []
+    for symbol, price in prices.items():
+      if price is None:
+        continue
+      for order in self.on_price(symbol, price):
+        self.execute(order, price, observed_at)
+        triggered.append(order)
+    return triggered
+
+  def run(self, check_interval: float = 1.0) -> Dict[int, Dict]:
+    """
+    활성 주문이 모두 발동되거나 취소될 때까지 실행
+    :param check_interval: 가격 체크 간격 (초)
+    :return: {주문 ID: 주문 결과}
+    """
+    print(f"\n[{datetime.now()}] Trailing 엔진 시작 (주문 {len(self.orders)}개)")
+    while self.active_symbols:
+      try:
+        self.tick()
+      except Exception as e:
+        print(f"가격 조회 중 오류 발생: {str(e)}")
+      self.prices.wait_any(check_interval)
+    return {order_id: order.result for order_id, order in self.orders.items()}
+
+
+# 사용 예시
+if __name__ == "__main__":
+  engine = TrailingEngine()
+
+  # 여러 코인의 Trailing Stop 을 하나의 루프에서 실행
+  # for symbol in ['BTC/KRW', 'ETH/KRW', 'XRP/KRW']:
+  #   engine.add_trailing_stop(symbol, trail_percent=1.0)
+  # engine.add_trailing_buy('CTC/KRW', trail_percent=1.0, target_amount=100000)
+  # results = engine.run(check_interval=1.0)
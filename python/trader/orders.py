@@ -0,0 +1,184 @@
+import time
+import threading
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional
+from collector.session import get_exchange
+from collector.ledger import FINAL_STATUSES
+from collector.scheduler import PRIORITY_ACCOUNT
+
+# 미체결 주문 조회 주기 (초)
+POLL_INTERVAL = 1.0
+
+# 체결 완료 기본 대기 시간 (초)
+FILL_TIMEOUT = 10.0
+
+
+class OrderTracker:
+  """
+  주문 체결 추적기
+  추적 중인 주문을 fetch_open_orders 한 번으로 일괄 확인하고, 미체결 목록에서 사라진 주문만
+  fetch_order 로 최종 상태를 조회한다. 체결 수량이 늘어날 때마다 체결 이벤트를 전달한다.
+  """
+  def __init__(self,
+               exchange=None,
+               ledger=None,
+               poll_interval: float = POLL_INTERVAL,
+               on_fill: Optional[Callable[[Dict], None]] = None):
+    """
+    :param exchange: ccxt 거래소 인스턴스 (None이면 공유 클라이언트)
+    :param ledger: 체결을 반영할 잔고 원장 (BalanceLedger, None이면 반영하지 않음)
+    :param poll_interval: 미체결 주문 조회 주기 (초)
+    :param on_fill: 체결 이벤트 콜백
+    """
+    self.exchange = exchange or get_exchange()
+    self.ledger = ledger
+    self.poll_interval = poll_interval
+    self.listeners: List[Callable[[Dict], None]] = [on_fill] if on_fill else []
+    self.orders: Dict[str, Dict] = {}
+    self.completed: Dict[str, Dict] = {}
+    self._cond = threading.Condition()
+    self._closed = False
+    self._thread: Optional[threading.Thread] = None
+
+  def add_listener(self, listener: Callable[[Dict], None]):
+    """
+    체결 이벤트 콜백 추가
+    이벤트: order_id, symbol, side, filled(누적), delta(이번 체결), average, status, order
+    """
+    self.listeners.append(listener)
+
+  def track(self, order: Dict):
+    """
+    주문 추적 시작 (이미 종료된 주문이면 즉시 완료 처리)
+    :param order: 주문 생성 결과 (ccxt 주문 정보)
+    """
+    if not order or not order.get('id'):
+      return
+    with self._cond:
+      if order['id'] in self.orders or order['id'] in self.completed:
+        return
+      self.orders[order['id']] = dict(order, filled=0.0)
+    self._update(order)
+    with self._cond:
+      if self.orders and (self._thread is None or not self._thread.is_alive()):
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='order-tracker', daemon=True)
+        self._thread.start()
+      self._cond.notify_all()
+
+  def get(self, order_id: str) -> Optional[Dict]:
+    """
+    마지막으로 확인한 주문 정보
+    """
+    with self._cond:
+      return self.orders.get(order_id) or self.completed.get(order_id)
+
+  def wait(self, order_id: str, timeout: float = FILL_TIMEOUT) -> Optional[Dict]:
+    """
+    주문이 종료(체결 완료/취소)될 때까지 대기
+    :param order_id: 주문 ID
+    :param timeout: 최대 대기 시간 (초)
+    :return: 최종 주문 정보 (시간 초과 시 None)
+    """
+    with self._cond:
+      self._cond.wait_for(lambda: order_id in self.completed or order_id not in self.orders, timeout)
+      return self.completed.get(order_id)
+
+  def poll(self):
+    """
+    추적 중인 주문 상태 일괄 확인 (백그라운드 스레드에서 주기적으로 호출)
+    """
+    with self._cond:
+      tracked = list(self.orders.values())
+    if not tracked:
+      return
+
+    symbols = {order['symbol'] for order in tracked}
+    scheduler = getattr(self.exchange, 'scheduler', None)
+    with scheduler.priority(PRIORITY_ACCOUNT) if scheduler else nullcontext():
+      # 심볼이 하나면 해당 마켓만, 여러 개면 전체 미체결 주문을 한 번에 조회
+      symbol = next(iter(symbols)) if len(symbols) == 1 else None
+      open_orders = {order['id']: order for order in self.exchange.fetch_open_orders(symbol)}
+      for order in tracked:
+        current = open_orders.get(order['id'])
+        if current is None:
+          # 미체결 목록에 없으면 종료된 주문: 최종 체결 내역 조회
+          current = self.exchange.fetch_order(order['id'], order['symbol'])
+        self._update(current)
+
+  def _update(self, order: Dict):
+    with self._cond:
+      previous = self.orders.get(order['id'])
+      if previous is None:
+        return
+      filled = float(order.get('filled') or 0)
+      delta = filled - float(previous.get('filled') or 0)
+      finished = order.get('status') in FINAL_STATUSES
+      if finished:
+        del self.orders[order['id']]
+        self.completed[order['id']] = order
+      else:
+        self.orders[order['id']] = order
+      self._cond.notify_all()
+
+    if self.ledger is not None:
+      self.ledger.apply_order(order)
+    if delta > 0:
+      event = {
+        'order_id': order['id'],
+        'symbol': order['symbol'],
+        'side': order.get('side'),
+        'filled': filled,
+        'delta': delta,
+        'average': order.get('average'),
+        'status': order.get('status'),
+        'order': order
+      }
+      for listener in self.listeners:
+        try:
+          listener(event)
+        except Exception as e:
+          print(f"체결 이벤트 처리 실패: {str(e)}")
+
+  def _run(self):
+    while True:
+      with self._cond:
+        self._cond.wait_for(lambda: self._closed or self.orders)
+        if self._closed:
+          return
+      started = time.monotonic()
+      try:
+        self.poll()
+      except Exception as e:
+        print(f"주문 상태 조회 실패: {str(e)}")
+      with self._cond:
+        self._cond.wait_for(lambda: self._closed, max(0.0, self.poll_interval - (time.monotonic() - started)))
+
+  def close(self):
+    """
+    추적 종료
+    """
+    with self._cond:
+      self._closed = True
+      self._cond.notify_all()
+    if self._thread is not None:
+      self._thread.join(timeout=5)
+
+
+_trackers: Dict[int, OrderTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_tracker(exchange=None, ledger=None) -> OrderTracker:
+  """
+  거래소 클라이언트별 공유 주문 추적기
+  :param exchange: ccxt 거래소 인스턴스 (None이면 공유 클라이언트)
+  :param ledger: 체결을 반영할 잔고 원장 (최초 생성 시에만 사용)
+  :return: OrderTracker
+  """
+  exchange = exchange or get_exchange()
+  with _trackers_lock:
+    tracker = _trackers.get(id(exchange))
+    if tracker is None:
+      tracker = _trackers[id(exchange)] = OrderTracker(exchange, ledger)
+    return tracker
@@ -0,0 +1,448 @@
+import os
+import time
+import queue
+import threading
+import multiprocessing
+from typing import Callable, Dict, Iterable, List, Optional
+from collector.metrics import MetricsRegistry, get_metrics
+from collector.scheduler import RequestScheduler, share_limits, set_scheduler, get_scheduler
+
+# 전략 이름 -> (트레이더 클래스 이름, 메소드 이름)
+STRATEGIES = {
+  'trailing_stop': ('TrailingStopTrader', 'trailing_stop'),
+  'trailing_buy': ('TrailingStopTrader', 'trailing_buy'),
+  'dip_simple': ('DipTrader', 'trade_simple'),
+  'dip_trailing': ('DipTrader', 'trade_trailing'),
+}
+
+# 시세 전달 주기 (초)
+FETCH_INTERVAL = 1.0
+
+# 워커 지표 전송 주기 (초)
+METRICS_INTERVAL = 5.0
+
+# 워커별 최대 재시작 횟수
+MAX_RESTARTS = 3
+
+# 워커 시세 큐 크기 (가득 차면 해당 시세는 버림, 전략은 최신 가격만 사용)
+QUEUE_SIZE = 64
+
+
+class RunnerStopped(Exception):
+  """
+  실행기 종료로 시세 공급이 끊겼을 때 발생 (매매 루프의 예외 처리로 루프가 끝난다)
+  """
+
+
+class QueuePriceSource:
+  """
+  상위 프로세스가 보내는 시세 스냅샷을 받는 워커용 가격 소스 (UpbitPriceStream 과 같은 인터페이스)
+  """
+  def __init__(self, prices: multiprocessing.Queue, first_price_timeout: float = 10.0):
+    """
+    :param prices: {심볼: 가격} 스냅샷 큐 (None 수신 시 종료)
+    :param first_price_timeout: 첫 가격 수신 대기 시간 (초)
+    """
+    self.queue = prices
+    self.first_price_timeout = first_price_timeout
+    self.prices: Dict[str, float] = {}
+    self._seq: Dict[str, int] = {}
+    self._total = 0
+    self._closed = False
+    self._cond = threading.Condition()
+    self._thread = threading.Thread(target=self._run, name='runner-prices', daemon=True)
+    self._thread.start()
+
+  def _run(self):
+    while True:
+      try:
+        snapshot = self.queue.get()
+      except (EOFError, OSError):
+        snapshot = None
+      with self._cond:
+        if snapshot is None:
+          self._closed = True
+          self._cond.notify_all()
+          return
+        for symbol, price in snapshot.items():
+          self.prices[symbol] = price
+          self._seq[symbol] = self._seq.get(symbol, 0) + 1
+        self._total += 1
+        self._cond.notify_all()
+
+  def _check(self):
+    if self._closed:
+      raise RunnerStopped("시세 공급 종료")
+
+  def subscribe(self, symbols: Iterable[str]):
+    pass
+
+  def get_price(self, symbol: str) -> float:
+    with self._cond:
+      if not self._cond.wait_for(lambda: self._closed or symbol in self.prices, self.first_price_timeout):
+        raise TimeoutError(f"{symbol} 가격 수신 대기 시간 초과")
+      self._check()
+      return self.prices[symbol]
+
+  def get_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+    with self._cond:
+      self._check()
+      return {symbol: self.prices[symbol] for symbol in symbols if symbol in self.prices}
+
+  def wait(self, symbol: str, timeout: float):
+    with self._cond:
+      seq = self._seq.get(symbol, 0)
+      self._cond.wait_for(lambda: self._closed or self._seq.get(symbol, 0) != seq, timeout)
+      self._check()
+
+  def wait_any(self, timeout: float):
+    with self._cond:
+      total = self._total
+      self._cond.wait_for(lambda: self._closed or self._total != total, timeout)
+      self._check()
+
+  def close(self):
+    with self._cond:
+      self._closed = True
+      self._cond.notify_all()
+
+
+def shard(configs: List[Dict], processes: int) -> List[List[int]]:
+  """
+  전략 설정을 심볼 단위로 워커에 분배 (같은 심볼은 같은 워커, 전략 수가 많은 심볼부터 가장 한가한 워커로)
+  :param configs: 전략 설정 목록
+  :param processes: 워커 수
+  :return: 워커별 설정 인덱스 목록
+  """
+  by_symbol: Dict[str, List[int]] = {}
+  for index, config in enumerate(configs):
+    by_symbol.setdefault(config['symbol'], []).append(index)
+  shards: List[List[int]] = [[] for _ in range(max(1, min(processes, len(by_symbol))))]
+  for indexes in sorted(by_symbol.values(), key=len, reverse=True):
+    min(shards, key=len).extend(indexes)
+  return [sorted(indexes) for indexes in shards if indexes]
+
+
+# 매수 후 매도 대기로 넘어가는 전략 (매수 후 워커가 종료되면 재시작하지 않음)
+BUYING_STRATEGIES = {'dip_simple', 'dip_trailing'}
+
+
+class _BuyReporter:
+  """
+  주문 실행기 래퍼 (매수 주문이 접수되면 report(order) 호출, 나머지는 원래 실행기로 위임)
+  """
+  def __init__(self, trader, report: Callable[[Dict], None]):
+    self.trader = trader
+    self.report = report
+
+  def __getattr__(self, name):
+    return getattr(self.trader, name)
+
+  def buy(self, *args, **kwargs):
+    order = self.trader.buy(*args, **kwargs)
+    if order:
+      self.report(order)
+    return order
+
+
+def _run_strategy(traders: Dict, config: Dict):
+  class_name, method = STRATEGIES[config['strategy']]
+  params = {key: value for key, value in config.items() if key != 'strategy'}
+  return getattr(traders[class_name], method)(**params)
+
+
+def _worker(worker_id: int,
+            configs: Dict[int, Dict],
+            prices: multiprocessing.Queue,
+            events: multiprocessing.Queue,
+            processes: int,
+            metrics_interval: float,
+            exchange_factory: Optional[Callable] = None):
+  # 워커 프로세스: 할당된 전략을 스레드로 실행하고 결과/지표를 상위 프로세스로 전송
+  from collector.session import register_exchange
+  from trader.direct import UpbitTrader
+  from trader.trailing import TrailingStopTrader
+  from trader.dip import DipTrader
+
+  # 같은 계정/IP 를 나눠 쓰므로 요청 제한도 프로세스 수(워커 + 시세를 조회하는 상위 프로세스)로 분할
+  set_scheduler(RequestScheduler(share_limits(processes)))
+  if exchange_factory is not None:
+    register_exchange(exchange_factory())
+
+  source = QueuePriceSource(prices)
+  trader = UpbitTrader()
+  traders = {
+    'TrailingStopTrader': TrailingStopTrader(price_source=source, trader=trader),
+    'DipTrader': DipTrader(price_source=source, trader=trader),
+  }
+  done = threading.Event()
+
+  def report_metrics():
+    while not done.wait(metrics_interval):
+      events.put(('metrics', worker_id, os.getpid(), get_metrics().snapshot()))
+
+  def run(index: int, config: Dict):
+    strategy_traders = traders
+    if config['strategy'] in BUYING_STRATEGIES:
+      # 매수 주문 ID 를 상위 프로세스에 알려 워커 종료 시 재시작(재매수)하지 않도록 함
+      reporter = _BuyReporter(trader, lambda order: events.put(('bought', worker_id, index, order['id'])))
+      strategy_traders = dict(traders, DipTrader=DipTrader(price_source=source, trader=reporter))
+    try:
+      events.put(('result', worker_id, index, {'result': _run_strategy(strategy_traders, config), 'error': None}))
+    except Exception as e:
+      events.put(('result', worker_id, index, {'result': None, 'error': str(e)}))
+
+  threading.Thread(target=report_metrics, name='runner-metrics', daemon=True).start()
+  threads = [threading.Thread(target=run, args=item, name=f"strategy-{item[0]}", daemon=True) for item in configs.items()]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+  done.set()
+  source.close()
+  trader.ledger.stop()
+  trader.orders.close()
+  events.put(('metrics', worker_id, os.getpid(), get_metrics().snapshot()))
+
+
+class StrategyRunner:
+  """
+  여러 전략을 심볼 단위로 나누어 워커 프로세스에서 실행하는 관리자
+  시세는 상위 프로세스에서 한 번에 조회(fetch_tickers 1회 또는 WebSocket)하여 워커별 큐로 전달하고,
+  비정상 종료된 워커는 끝나지 않은 전략만 다시 실행한다.
+  재시작된 전략은 처음부터 다시 시작하므로, 이미 매수한 딥 매매 전략(dip_simple, dip_trailing)은 다시 매수하지 않도록
+  재시작하지 않고 매수 주문 ID 와 함께 실패 처리한다 (보유 수량은 그대로 남음).
+  """
+  def __init__(self,
+               configs: List[Dict],
+               processes: Optional[int] = None,
+               price_source=None,
+               interval: float = FETCH_INTERVAL,
+               max_restarts: int = MAX_RESTARTS,
+               metrics_interval: float = METRICS_INTERVAL,
+               exchange_factory: Optional[Callable] = None):
+    """
+    :param configs: 전략 설정 목록 [{'strategy': 'trailing_stop', 'symbol': 'BTC/KRW', 'trail_percent': 1.0, ...}]
+                    strategy 외의 값은 해당 메소드(trailing_stop, trailing_buy, trade_simple, trade_trailing)의 인자
+    :param processes: 워커 수 (None이면 CPU 코어 수, 심볼 수보다 많지 않음)
+    :param price_source: 상위 시세 소스 (get_prices/wait_any, None이면 공유 클라이언트 fetch_tickers 폴링)
+    :param interval: 시세 전달 주기 (초)
+    :param max_restarts: 워커별 최대 재시작 횟수
+    :param metrics_interval: 워커 지표 전송 주기 (초)
+    :param exchange_factory: 워커에서 사용할 거래소 생성 함수 (시뮬레이터 등, pickle 가능해야 함)
+    """
+    for config in configs:
+      if config.get('strategy') not in STRATEGIES:
+        raise ValueError(f"알 수 없는 전략: {config.get('strategy')}")
+      if not config.get('symbol'):
+        raise ValueError(f"symbol 이 없는 설정: {config}")
+    self.configs = list(configs)
+    self.processes = processes or os.cpu_count() or 1
+    self.price_source = price_source
+    self.interval = interval
+    self.max_restarts = max_restarts
+    self.metrics_interval = metrics_interval
+    self.exchange_factory = exchange_factory
+    self.results: Dict[int, Dict] = {}
+    # 매수를 마친 전략의 매수 주문 ID
+    self.bought: Dict[int, str] = {}
+    self.workers: Dict[int, Dict] = {}
+    self._snapshots: Dict[int, Dict] = {}
+    self._shares = 1
+    self._owner: Dict[int, int] = {}
+    self._context = multiprocessing.get_context('spawn')
+    self._events = self._context.Queue()
+    self._lock = threading.Lock()
+    self._stop = threading.Event()
+
+  # 워커 관리
+
+  def _start_worker(self, worker_id: int, indexes: List[int]):
+    prices = self._context.Queue(QUEUE_SIZE)
+    process = self._context.Process(
+      target=_worker,
+      args=(worker_id, {index: self.configs[index] for index in indexes}, prices, self._events,
+            self._shares, self.metrics_interval, self.exchange_factory),
+      name=f"strategy-worker-{worker_id}",
+      daemon=True)
+    process.start()
+    with self._lock:
+      worker = self.workers.setdefault(worker_id, {'restarts': -1})
+      worker.update(process=process, prices=prices, indexes=indexes,
+                    symbols={self.configs[index]['symbol'] for index in indexes})
+      worker['restarts'] += 1
+
+  def _pending(self, worker: Dict) -> List[int]:
+    return [index for index in worker['indexes'] if index not in self.results]
+
+  def _supervise(self):
+    # 비정상 종료된 워커 재시작 (남은 전략만)
+    for worker_id, worker in list(self.workers.items()):
+      process = worker['process']
+      if process.is_alive() or process.exitcode is None:
+        continue
+      pending = self._pending(worker)
+      if not pending or process.exitcode == 0:
+        continue
+      # 매수 후 매도 대기 중이던 전략은 재시작하면 다시 매수하므로 실패 처리
+      for index in [index for index in pending if index in self.bought]:
+        print(f"워커 {worker_id} 비정상 종료, 매수 완료 전략 {index} 실패 처리 (매수 주문 {self.bought[index]})")
+        self.results[index] = {
+          'result': None,
+          'error': f"워커 비정상 종료 (exitcode={process.exitcode}), 매수 주문 {self.bought[index]} 보유 중",
+          'buy_order': self.bought[index]
+        }
+      pending = self._pending(worker)
+      if not pending:
+        continue
+      if worker['restarts'] < self.max_restarts:
+        print(f"워커 {worker_id} 비정상 종료 (exitcode={process.exitcode}), 재시작: 전략 {len(pending)}개")
+        self._start_worker(worker_id, pending)
+      else:
+        print(f"워커 {worker_id} 재시작 횟수 초과, 전략 {len(pending)}개 실패 처리")
+        for index in pending:
+          self.results[index] = {'result': None, 'error': f"워커 비정상 종료 (exitcode={process.exitcode})"}
+
+  def _handle(self, event):
+    kind, worker_id = event[0], event[1]
+    if kind == 'result':
+      _, _, index, payload = event
+      self.results[index] = payload
+    elif kind == 'bought':
+      _, _, index, order_id = event
+      self.bought[index] = order_id
+    elif kind == 'metrics':
+      _, _, pid, snapshot = event
+      # 프로세스별 누적 스냅샷 (재시작 전 프로세스의 지표도 유지)
+      self._snapshots[pid] = snapshot
+
+  # 시세 공급
+
+  def _feed(self):
+    from collector.session import get_exchange
+    from collector.stream import PollingPriceSource
+
+    source = self.price_source or PollingPriceSource(get_exchange())
+    while not self._stop.is_set():
+      with self._lock:
+        workers = [(worker['prices'], worker['symbols'])
+                   for worker in self.workers.values() if worker['process'].is_alive()]
+      symbols = set().union(*(symbols for _, symbols in workers)) if workers else set()
+      if symbols:
+        try:
+          prices = source.get_prices(sorted(symbols))
+          for queue_, worker_symbols in workers:
+            snapshot = {symbol: prices[symbol] for symbol in worker_symbols if symbol in prices}
+            try:
+              queue_.put_nowait(snapshot)
+            except queue.Full:
+              pass
+        except Exception as e:
+          print(f"시세 조회 실패: {str(e)}")
+      source.wait_any(self.interval)
+
+  # 실행
+
+  def run(self, timeout: Optional[float] = None) -> List[Dict]:
+    """
+    전체 전략 실행 (모든 전략이 끝나거나 시간 초과/stop() 호출 시 반환)
+    :param timeout: 최대 실행 시간 (초, 초과 시 남은 전략 종료)
+    :return: 설정 순서대로 설정 + 'result' / 'error' / 'worker'
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    shards = shard(self.configs, self.processes)
+    # 요청 제한은 워커와 상위 프로세스(시세 조회)가 나눠 씀
+    self._shares = len(shards) + 1
+    scheduler = get_scheduler()
+    limits = scheduler.limits()
+    scheduler.set_limits(share_limits(self._shares, limits))
+    for worker_id, indexes in enumerate(shards):
+      self._owner.update(dict.fromkeys(indexes, worker_id))
+      self._start_worker(worker_id, indexes)
+    feeder = threading.Thread(target=self._feed, name='runner-feed', daemon=True)
+    feeder.start()
+
+    try:
+      while len(self.results) < len(self.configs) and not self._stop.is_set():
+        if deadline is not None and time.monotonic() >= deadline:
+          print("실행 시간 초과, 남은 전략 종료")
+          break
+        try:
+          self._handle(self._events.get(timeout=0.5))
+          continue
+        except queue.Empty:
+          pass
+        self._supervise()
+    finally:
+      self._shutdown()
+      feeder.join(timeout=5)
+      scheduler.set_limits(limits)
+
+    return [
+      dict(config, worker=self._owner.get(index), **self.results.get(index, {'result': None, 'error': '종료되지 않음'}))
+      for index, config in enumerate(self.configs)
+    ]
+
+  def _shutdown(self):
+    self._stop.set()
+    for worker in self.workers.values():
+      try:
+        worker['prices'].put(None, timeout=1)
+      except Exception:
+        pass
+    deadline = time.monotonic() + 10
+    for worker in self.workers.values():
+      worker['process'].join(timeout=max(0.0, deadline - time.monotonic()))
+      if worker['process'].is_alive():
+        worker['process'].terminate()
+    # 종료 중 전송된 결과/지표 수집
+    while True:
+      try:
+        self._handle(self._events.get(timeout=0.2))
+      except queue.Empty:
+        break
+
+  def stop(self):
+    """
+    실행 중지 (워커의 전략 루프는 시세 공급 종료로 끝난다)
+    """
+    self._stop.set()
+
+  def metrics(self) -> MetricsRegistry:
+    """
+    워커 전체와 상위 프로세스(시세 조회)의 지표 합산
+    """
+    registry = MetricsRegistry()
+    registry.merge(get_metrics().snapshot())
+    for snapshot in list(self._snapshots.values()):
+      registry.merge(snapshot)
+    return registry
+
+  def status(self) -> List[Dict]:
+    """
+    워커별 상태 (심볼, 재시작 횟수, 남은 전략 수)
+    """
+    with self._lock:
+      return [
+        {
+          'worker': worker_id,
+          'pid': worker['process'].pid,
+          'alive': worker['process'].is_alive(),
+          'symbols': sorted(worker['symbols']),
+          'restarts': worker['restarts'],
+          'pending': len(self._pending(worker))
+        }
+        for worker_id, worker in self.workers.items()
+      ]
+
+
+# 사용 예시 (python 디렉토리에서 실행: python -m trader.runner)
+if __name__ == "__main__":
+  runner = StrategyRunner([
+    {'strategy': 'trailing_stop', 'symbol': 'BTC/KRW', 'trail_percent': 1.0, 'quantity': 0.001},
+    {'strategy': 'trailing_buy', 'symbol': 'ETH/KRW', 'trail_percent': 1.0, 'target_amount': 10000},
+    {'strategy': 'dip_trailing', 'symbol': 'XRP/KRW', 'target_amount': 10000, 'dip_percent': 1.0},
+  ])
+  # for result in runner.run(timeout=3600):
+  #   print(result['strategy'], result['symbol'], result['error'] or result['result'])
+  # print(runner.metrics().to_prometheus())
@@ -2,20 +2,66 @@ import time
 from typing import Optional, Dict
 from datetime import datetime
 from trader.direct import UpbitTrader
-from collector.account import UpbitAccount
+from collector.stream import PollingPriceSource
+from collector.metrics import order_latency
+from collector.incremental import ATR, WilderRSI, TickBars
+
+# ATR 기반 Trailing 폭 기본 배수
+ATR_MULTIPLIER = 3.0
+
+
+def trail_price(reference: float,
+                percent: float,
+                direction: int = -1,
+                atr: Optional[ATR] = None,
+                multiplier: float = ATR_MULTIPLIER) -> float:
+  """
+  기준가(고점/저점) 대비 Trailing 가격 (ATR 이 준비되면 multiplier * ATR, 아니면 percent % 만큼 이동)
+  :param direction: -1 이면 기준가 아래 (Stop), 1 이면 위 (Buy)
+  """
+  if atr is not None and atr.ready:
+    return reference + direction * multiplier * atr.value
+  return reference * (1 + direction * percent / 100)
+
+
+def update_indicators(bars: TickBars, price: float, atr: Optional[ATR] = None, rsi: Optional[WilderRSI] = None) -> bool:
+  """
+  틱 가격을 봉에 반영하고, 봉이 마감되면 지표 갱신
+  :return: 봉 마감 여부
+  """
+  bar = bars.update(price)
+  if bar is None:
+    return False
+  if atr is not None:
+    atr.update(*bar)
+  if rsi is not None:
+    rsi.update(bar[2])
+  return True
 
 
 class TrailingStopTrader:
-  def __init__(self):
-    self.trader = UpbitTrader()
-    self.account = UpbitAccount()
+  def __init__(self, price_source=None, trader: Optional[UpbitTrader] = None):
+    """
+    :param price_source: 가격 소스 (UpbitPriceStream 등, None인 경우 fetch_ticker 폴링)
+    :param trader: 주문 실행기 (None인 경우 UpbitTrader 생성)
+    """
+    self.trader = trader or UpbitTrader()
+    self.account = self.trader.account
+    self.prices = price_source or PollingPriceSource(self.trader.exchange)
+    # 스트림이 호가창을 수신 중이면 시장가 매도 검증에 사용 (없으면 호가 조회)
+    validator = getattr(self.trader, 'validator', None)
+    if validator is not None and validator.books is None and hasattr(self.prices, 'get_book'):
+      validator.books = self.prices
 
   def trailing_stop(self,
                    symbol: str,
                    trail_percent: float,
                    check_interval: float = 1.0,
                    quantity: Optional[float] = None,
-                   initial_price: Optional[float] = None) -> Dict:
+                   initial_price: Optional[float] = None,
+                   atr: Optional[ATR] = None,
+                   atr_multiplier: float = ATR_MULTIPLIER,
+                   bars: Optional[TickBars] = None) -> Dict:
     """
     Trailing Stop 매매 실행
     :param symbol: 거래쌍 (예: 'BTC/KRW')
@@ -23,26 +69,29 @@ class TrailingStopTrader:
     :param check_interval: 가격 체크 간격 (초)
     :param quantity: 매도할 수량 (None인 경우 전량 매도)
     :param initial_price: 시작 가격 (None인 경우 현재가로 설정)
+    :param atr: 지정 시 ATR 이 준비된 후 고점 대비 atr_multiplier * ATR 하락에서 매도 (그 전에는 trail_percent)
+    :param atr_multiplier: ATR 배수
+    :param bars: ATR 에 공급할 틱 봉 (None인 경우 1분봉)
     :return: 매도 결과
     """
     try:
       # 초기 설정
       if initial_price is None:
-        ticker = self.trader.exchange.fetch_ticker(symbol)
-        initial_price = ticker['last']
+        initial_price = self.prices.get_price(symbol)
 
       if quantity is None:
-        balances = self.account.get_balances()
-        for balance in balances:
-          if balance['currency'] == symbol.split('/')[0]:
-            quantity = balance['free']
-            break
+        # 로컬 잔고에서 조회 (거래소 요청 없음)
+        balance = self.trader.ledger.get(symbol.split('/')[0])
+        if balance is not None and balance['total'] > 0:
+          quantity = balance['free']
         if quantity is None:
           raise ValueError(f"보유한 {symbol.split('/')[0]}가 없습니다.")
 
       # Trailing Stop 로직 시작
       highest_price = initial_price
-      stop_price = initial_price * (1 - trail_percent / 100)
+      stop_price = trail_price(initial_price, trail_percent, -1, atr, atr_multiplier)
+      if atr is not None and bars is None:
+        bars = TickBars()
 
       print(f"\n[{datetime.now()}] Trailing Stop 시작")
       print(f"초기 가격: {initial_price}")
@@ -52,13 +101,17 @@ class TrailingStopTrader:
       while True:
         try:
           # 현재가 조회
-          ticker = self.trader.exchange.fetch_ticker(symbol)
-          current_price = ticker['last']
+          current_price = self.prices.get_price(symbol)
+          observed_at = time.perf_counter()
+
+          # 봉 마감 시 ATR 갱신 (Stop 가격은 올리기만 함)
+          if atr is not None and update_indicators(bars, current_price, atr=atr):
+            stop_price = max(stop_price, trail_price(highest_price, trail_percent, -1, atr, atr_multiplier))
 
           # 신규 고점 갱신
           if current_price > highest_price:
             highest_price = current_price
-            stop_price = highest_price * (1 - trail_percent / 100)
+            stop_price = max(stop_price, trail_price(highest_price, trail_percent, -1, atr, atr_multiplier))
             print(f"[{datetime.now()}] 신규 고점: {highest_price}, 새로운 Stop 가격: {stop_price}")
 
           # Stop 조건 확인
@@ -67,7 +120,8 @@ class TrailingStopTrader:
             print(f"현재가: {current_price} / Stop 가격: {stop_price}")
 
             # 매도 주문 실행
-            result = self.trader.sell(symbol, quantity, price=None)  # 시장가 매도
+            with order_latency('trailing_stop', observed_at):
+              result = self.trader.sell(symbol, quantity, price=None, reference=current_price)  # 시장가 매도
 
             if result:
               print("매도 성공!")
@@ -78,11 +132,11 @@ class TrailingStopTrader:
               print("매도 실패!")
               return None
 
-          time.sleep(check_interval)
+          self.prices.wait(symbol, check_interval)
 
         except Exception as e:
           print(f"가격 조회 중 오류 발생: {str(e)}")
-          time.sleep(check_interval)
+          self.prices.wait(symbol, check_interval)
           continue
 
     except Exception as e:
@@ -94,7 +148,10 @@ class TrailingStopTrader:
                   trail_percent: float,
                   target_amount: float,
                   check_interval: float = 1.0,
-                  initial_price: Optional[float] = None) -> Dict:
+                  initial_price: Optional[float] = None,
+                  atr: Optional[ATR] = None,
+                  atr_multiplier: float = ATR_MULTIPLIER,
+                  bars: Optional[TickBars] = None) -> Dict:
     """
     Trailing Buy 매매 실행 (하락 추세에서 매수)
     :param symbol: 거래쌍 (예: 'BTC/KRW')
@@ -102,17 +159,21 @@ class TrailingStopTrader:
     :param target_amount: 매수할 금액 (KRW)
     :param check_interval: 가격 체크 간격 (초)
     :param initial_price: 시작 가격 (None인 경우 현재가로 설정)
+    :param atr: 지정 시 ATR 이 준비된 후 저점 대비 atr_multiplier * ATR 상승에서 매수 (그 전에는 trail_percent)
+    :param atr_multiplier: ATR 배수
+    :param bars: ATR 에 공급할 틱 봉 (None인 경우 1분봉)
     :return: 매수 결과
     """
     try:
       # 초기 설정
       if initial_price is None:
-        ticker = self.trader.exchange.fetch_ticker(symbol)
-        initial_price = ticker['last']
+        initial_price = self.prices.get_price(symbol)
 
       # Trailing Buy 로직 시작
       lowest_price = initial_price
-      buy_price = initial_price * (1 + trail_percent / 100)
+      buy_price = trail_price(initial_price, trail_percent, 1, atr, atr_multiplier)
+      if atr is not None and bars is None:
+        bars = TickBars()
 
       print(f"\n[{datetime.now()}] Trailing Buy 시작")
       print(f"초기 가격: {initial_price}")
@@ -122,13 +183,17 @@ class TrailingStopTrader:
       while True:
         try:
           # 현재가 조회
-          ticker = self.trader.exchange.fetch_ticker(symbol)
-          current_price = ticker['last']
+          current_price = self.prices.get_price(symbol)
+          observed_at = time.perf_counter()
+
+          # 봉 마감 시 ATR 갱신 (Buy 가격은 내리기만 함)
+          if atr is not None and update_indicators(bars, current_price, atr=atr):
+            buy_price = min(buy_price, trail_price(lowest_price, trail_percent, 1, atr, atr_multiplier))
 
           # 신규 저점 갱신
           if current_price < lowest_price:
             lowest_price = current_price
-            buy_price = lowest_price * (1 + trail_percent / 100)
+            buy_price = min(buy_price, trail_price(lowest_price, trail_percent, 1, atr, atr_multiplier))
             print(f"[{datetime.now()}] 신규 저점: {lowest_price}, 새로운 Buy 가격: {buy_price}")
 
           # Buy 조건 확인
@@ -137,7 +202,8 @@ class TrailingStopTrader:
             print(f"현재가: {current_price} / Buy 가격: {buy_price}")
 
             # 매수 주문 실행
-            result = self.trader.buy(symbol, target_amount, price=None)  # 시장가 매수
+            with order_latency('trailing_buy', observed_at):
+              result = self.trader.buy(symbol, target_amount, price=None)  # 시장가 매수
 
             if result:
               print("매수 성공!")
@@ -148,11 +214,11 @@ class TrailingStopTrader:
               print("매수 실패!")
               return None
 
-          time.sleep(check_interval)
+          self.prices.wait(symbol, check_interval)
 
         except Exception as e:
           print(f"가격 조회 중 오류 발생: {str(e)}")
-          time.sleep(check_interval)
+          self.prices.wait(symbol, check_interval)
           continue
 
     except Exception as e:
@@ -164,6 +230,10 @@ class TrailingStopTrader:
 if __name__ == "__main__":
   trader = TrailingStopTrader()
 
+  # WebSocket 실시간 가격으로 실행 (폴링 대신)
+  # from collector.stream import UpbitPriceStream
+  # trader = TrailingStopTrader(price_source=UpbitPriceStream(['CTC/KRW']))
+
   # Trailing Stop 예시 (1% 하락 시 매도)
   # result = trader.trailing_stop(
   #   symbol='CTC/KRW',
@@ -0,0 +1,140 @@
+import math
+from contextlib import nullcontext
+from typing import Optional, Tuple
+from collector.orderbook import OrderBook, BUY, SELL
+from collector.scheduler import PRIORITY_ORDER
+from settings.constants import UPBIT_BUY_FEE, UPBIT_MIN_ORDER_KRW, UPBIT_KRW_TICK_SIZES
+
+# 검증 실패 사유 (Upbit 주문 오류 이름과 동일)
+INVALID_VOLUME = 'invalid_volume'
+INVALID_PRICE = 'invalid_price'
+UNDER_MIN_TOTAL_BID = 'under_min_total_bid'
+UNDER_MIN_TOTAL_ASK = 'under_min_total_ask'
+UNDER_MIN_TOTAL_MARKET_ASK = 'under_min_total_market_ask'
+INSUFFICIENT_FUNDS_BID = 'insufficient_funds_bid'
+INSUFFICIENT_FUNDS_ASK = 'insufficient_funds_ask'
+
+
+class OrderValidationError(ValueError):
+  """
+  주문 전 로컬 검증 실패 (reason: 실패 사유 코드)
+  """
+  def __init__(self, reason: str, message: str):
+    super().__init__(f"{message} ({reason})")
+    self.reason = reason
+
+
+def tick_size(price: float) -> float:
+  """
+  원화 마켓 호가 단위
+  """
+  for floor, tick in UPBIT_KRW_TICK_SIZES:
+    if price >= floor:
+      return tick
+  return UPBIT_KRW_TICK_SIZES[-1][1]
+
+
+def round_price(price: float, side: str) -> float:
+  """
+  원화 마켓 호가 단위로 가격 조정 (매수는 내림, 매도는 올림)
+  """
+  tick = tick_size(price)
+  steps = price / tick
+  steps = math.floor(steps + 1e-9) if side == BUY else math.ceil(steps - 1e-9)
+  return round(steps * tick, 8)
+
+
+class OrderValidator:
+  """
+  주문 전 로컬 검증 (거래소 요청 없이 거부될 주문을 걸러냄)
+  수량/가격, 원화 마켓 호가 단위와 최소 주문 금액, 로컬 잔고 기준 주문 가능 수량을 확인한다.
+  """
+  def __init__(self,
+               ledger,
+               exchange=None,
+               books=None,
+               min_total: float = UPBIT_MIN_ORDER_KRW,
+               buy_fee: float = UPBIT_BUY_FEE):
+    """
+    :param ledger: 로컬 잔고 (BalanceLedger)
+    :param exchange: 시장가 매도 기준가(매수 1호가) 조회용 ccxt 거래소 인스턴스 (None이면 기준가 확인 생략)
+    :param books: 수신 중인 호가창 소스 (get_book(symbol) 제공, 예: UpbitPriceStream), 있으면 조회보다 우선
+    :param min_total: 원화 마켓 최소 주문 금액
+    :param buy_fee: 매수 수수료율 (매수 가능 금액 확인용)
+    """
+    self.ledger = ledger
+    self.exchange = exchange
+    self.books = books
+    self.min_total = min_total
+    self.buy_fee = buy_fee
+
+  def best_bid(self, symbol: str, reference: Optional[float] = None) -> Optional[float]:
+    """
+    시장가 매도 기준가 (조회 실패 시 None)
+    수신 중인 호가창의 매수 1호가, 호출자가 이미 확인한 가격(reference) 순으로 사용하여 요청 없이 확인하고,
+    둘 다 없을 때만 주문 우선순위로 호가를 조회한다 (Upbit 티커에는 매수 1호가가 없음).
+    :param reference: 호출자가 확인한 현재가 (매매 루프의 current_price 등)
+    """
+    book = self.books.get_book(symbol) if self.books is not None else None
+    if book is not None and book.best_bid is not None:
+      return book.best_bid
+    if reference is not None:
+      return reference
+    if self.exchange is None:
+      return None
+    scheduler = getattr(self.exchange, 'scheduler', None)
+    try:
+      # 분석용 시세 조회보다 먼저 처리되도록 주문 우선순위로 조회
+      with scheduler.priority(PRIORITY_ORDER) if scheduler else nullcontext():
+        book = OrderBook.from_ccxt(self.exchange.fetch_order_book(symbol))
+    except Exception:
+      return None
+    return book.best_bid
+
+  def validate(self,
+               symbol: str,
+               side: str,
+               amount: float,
+               price: Optional[float] = None,
+               reference: Optional[float] = None) -> Tuple[float, Optional[float]]:
+    """
+    주문 검증 (실패 시 OrderValidationError 발생)
+    :param symbol: 거래쌍 (예: 'BTC/KRW')
+    :param side: 'buy' / 'sell'
+    :param amount: 매수 금액 (KRW, 시장가 매수) 또는 수량
+    :param price: 지정가 (None이면 시장가)
+    :param reference: 시장가 매도 최소 금액 확인용 현재가 (호출자가 이미 확인한 가격, None이면 호가 확인)
+    :return: (amount, 호가 단위로 조정한 price)
+    """
+    if not amount or not amount > 0:
+      raise OrderValidationError(INVALID_VOLUME, f"주문 수량이 올바르지 않습니다: {amount}")
+    if price is not None and not price > 0:
+      raise OrderValidationError(INVALID_PRICE, f"주문 가격이 올바르지 않습니다: {price}")
+
+    base, quote = symbol.split('/')
+    krw = quote == 'KRW'
+    if price is not None and krw:
+      price = round_price(price, side)
+
+    if side == BUY:
+      total = amount if price is None else amount * price
+      if krw and total < self.min_total:
+        raise OrderValidationError(UNDER_MIN_TOTAL_BID, f"최소 주문 금액 미만: {total:,.0f} < {self.min_total:,.0f}원")
+      required = total * (1 + self.buy_fee)
+      available = self.ledger.free(quote)
+      if required - available > 1e-9 * max(1.0, required):
+        raise OrderValidationError(INSUFFICIENT_FUNDS_BID, f"주문 가능 {quote} 부족: {available:,.8g} < {required:,.8g} (수수료 포함)")
+      return amount, price
+
+    if side != SELL:
+      raise ValueError(f"알 수 없는 주문 방향: {side}")
+    if krw and price is not None and amount * price < self.min_total:
+      raise OrderValidationError(UNDER_MIN_TOTAL_ASK, f"최소 주문 금액 미만: {amount * price:,.0f} < {self.min_total:,.0f}원")
+    available = self.ledger.free(base)
+    if amount - available > 1e-12 * max(1.0, amount):
+      raise OrderValidationError(INSUFFICIENT_FUNDS_ASK, f"주문 가능 {base} 부족: {available:,.8g} < {amount:,.8g}")
+    if krw and price is None:
+      bid = self.best_bid(symbol, reference)
+      if bid is not None and amount * bid < self.min_total:
+        raise OrderValidationError(UNDER_MIN_TOTAL_MARKET_ASK, f"최소 주문 금액 미만: {amount * bid:,.0f} < {self.min_total:,.0f}원 (기준가 {bid:,})")
+    return amount, price